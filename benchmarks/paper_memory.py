@@ -0,0 +1,93 @@
+"""Paper 内存占用基准：普通 dataclass（每个实例带 __dict__、期刊名不去重）对比当前的 slots + intern
+
+用 tracemalloc 统计 N 篇合成文献构造完成后仍占用的内存，换算成每篇字节数；
+同时给出 JSON 与 archive（.lbp）两种序列化的每篇字节数。
+
+    python benchmarks/paper_memory.py [--papers 50000]
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import tracemalloc
+from dataclasses import asdict, fields, make_dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from literature_briefing import archive
+from literature_briefing.sources.base import Paper
+
+# 优化前的 Paper：字段相同，但没有 __slots__，也不做字符串驻留
+LegacyPaper = make_dataclass("LegacyPaper", [(f.name, f.type, f) for f in fields(Paper)])
+
+JOURNALS = [("Nature Neuroscience", "Nat Neurosci"), ("Neuron", "Neuron"),
+            ("The Journal of Neuroscience", "J Neurosci"), ("eLife", "Elife"),
+            ("Cell Reports", "Cell Rep"), ("PLoS Biology", "PLoS Biol")]
+WORDS = ("neuron cortex synaptic plasticity receptor signaling pathway expression mouse model "
+         "hippocampal memory circuit activity dopamine inhibition network glial response").split()
+
+
+def _fresh(s: str) -> str:
+    """返回内容相同的新字符串对象，模拟每篇文献从 XML 解析出的独立副本"""
+    return "".join(list(s))
+
+
+def records(n: int, seed: int = 0) -> list:
+    """固定种子生成 n 篇文献的字段（字符串都是独立对象）"""
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        journal, abbr = rng.choice(JOURNALS)
+        out.append(dict(
+            source=_fresh("pubmed"), source_id=str(40000000 + i),
+            title=" ".join(rng.choice(WORDS) for _ in range(12)),
+            abstract=" ".join(rng.choice(WORDS) for _ in range(200)),
+            authors=[f"Author{j} A{j}" for j in range(rng.randint(3, 12))],
+            journal=_fresh(journal), journal_abbr=_fresh(abbr), date="2026 Oct 13",
+            doi=f"10.1000/bench.{i}", url=f"https://doi.org/10.1000/bench.{i}",
+            mesh=[rng.choice(WORDS).title() for _ in range(10)],
+            pub_types=[_fresh("Journal Article")],
+        ))
+    return out
+
+
+def bytes_per_paper(cls, n: int) -> float:
+    """构造 n 篇文献后仍存活的分配量 / n（含字段字符串；解析用的原始记录已释放）
+
+    tracemalloc 只追踪开始之后的分配，所以从生成原始记录之前开始计量，
+    否则驻留后被丢弃的期刊名副本不会计入释放
+    """
+    tracemalloc.start()
+    data = records(n)
+    papers = [cls(**d) for d in data]
+    del data
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del papers
+    return used / n
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--papers", type=int, default=50000)
+    args = ap.parse_args()
+    n = args.papers
+
+    legacy = bytes_per_paper(LegacyPaper, n)
+    slotted = bytes_per_paper(Paper, n)
+    print(f"{n} 篇合成文献，内存（每篇）:")
+    print(f"  普通 dataclass   {legacy:>8.0f} B")
+    print(f"  slots + intern   {slotted:>8.0f} B   节省 {legacy - slotted:.0f} B（{1 - slotted / legacy:.0%}）")
+
+    papers = [Paper(**d) for d in records(min(n, 20000))]
+    as_json = json.dumps([asdict(p) for p in papers], ensure_ascii=False).encode("utf-8")
+    as_lbp = archive.dumps(papers)
+    codec = "msgpack" if archive.msgpack is not None else "json"
+    print(f"序列化（每篇，{len(papers)} 篇）:")
+    print(f"  JSON             {len(as_json) / len(papers):>8.0f} B")
+    print(f"  .lbp（{codec}+zlib） {len(as_lbp) / len(papers):>6.0f} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""PubMed efetch XML 解析微基准：旧解析器（.// 全树扫描 + ET.tostring）对比当前解析器
+
+语料是固定随机种子生成的 PubmedArticleSet，按 EFETCH_BATCH 分批，结构与真实 efetch
+结果一致（带标签的分段摘要、作者、MeSH、关键词、行内 <i>/<sup> 标记）。
+
+    python benchmarks/parse_pubmed.py [--articles 5000] [--processes 4] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from literature_briefing.sources.base import Paper
+from literature_briefing.sources.pubmed import EFETCH_BATCH, XML_BACKEND, parse_efetch_xml
+
+WORDS = ("neuron cortex synaptic plasticity receptor signaling pathway expression mouse model "
+         "hippocampal memory circuit activity dopamine inhibition network glial response").split()
+LABELS = ("BACKGROUND", "METHODS", "RESULTS", "CONCLUSIONS")
+JOURNALS = [("Nature Neuroscience", "Nat Neurosci"), ("Neuron", "Neuron"),
+            ("The Journal of Neuroscience", "J Neurosci"), ("eLife", "Elife")]
+
+
+def _sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def make_article(rng, pmid: int) -> str:
+    journal, abbr = rng.choice(JOURNALS)
+    abstract = "".join(
+        f'<AbstractText Label="{label}">{_sentence(rng, 30)} <i>in vivo</i> Ca<sup>2+</sup> '
+        f"{_sentence(rng, 25)}</AbstractText>" for label in LABELS)
+    authors = "".join(f"<Author><LastName>Author{i}</LastName><ForeName>A{i}</ForeName>"
+                      f"<AffiliationInfo><Affiliation>{_sentence(rng, 8)}</Affiliation>"
+                      f"</AffiliationInfo></Author>" for i in range(rng.randint(3, 12)))
+    mesh = "".join(f"<MeshHeading><DescriptorName>{rng.choice(WORDS).title()}</DescriptorName>"
+                   f"</MeshHeading>" for _ in range(10))
+    keywords = "".join(f"<Keyword>{rng.choice(WORDS)}</Keyword>" for _ in range(5))
+    return (
+        f"<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>"
+        f"<Journal><JournalIssue><PubDate><Year>2026</Year><Month>Oct</Month>"
+        f"<Day>{rng.randint(1, 28)}</Day></PubDate></JournalIssue>"
+        f"<Title>{journal}</Title><ISOAbbreviation>{abbr}</ISOAbbreviation></Journal>"
+        f"<ArticleTitle>{_sentence(rng, 12)} <i>Drosophila</i></ArticleTitle>"
+        f"<Abstract>{abstract}</Abstract><AuthorList>{authors}</AuthorList>"
+        f"<PublicationTypeList><PublicationType>Journal Article</PublicationType>"
+        f"</PublicationTypeList></Article>"
+        f"<MeshHeadingList>{mesh}</MeshHeadingList><KeywordList>{keywords}</KeywordList>"
+        f"</MedlineCitation><PubmedData><ArticleIdList>"
+        f'<ArticleId IdType="pubmed">{pmid}</ArticleId>'
+        f'<ArticleId IdType="doi">10.1000/bench.{pmid}</ArticleId>'
+        f"</ArticleIdList></PubmedData></PubmedArticle>"
+    )
+
+
+def make_corpus(n: int, seed: int = 0) -> list:
+    """固定种子生成 n 篇文献，按 EFETCH_BATCH 分成多个 efetch 响应"""
+    rng = random.Random(seed)
+    articles = [make_article(rng, 40000000 + i) for i in range(n)]
+    return [("<PubmedArticleSet>" + "".join(articles[i:i + EFETCH_BATCH])
+             + "</PubmedArticleSet>").encode("utf-8")
+            for i in range(0, n, EFETCH_BATCH)]
+
+
+def legacy_parse_article(article):
+    """优化前的解析器（.// 全树扫描，摘要分段用 ET.tostring 取文本），仅作对照"""
+    medline = article.find(".//MedlineCitation")
+    pmid = medline.findtext(".//PMID")
+    art = medline.find(".//Article")
+    title = art.findtext(".//ArticleTitle", "")
+    abstract_parts = []
+    for at in art.findall(".//Abstract/AbstractText"):
+        label = at.get("Label", "")
+        txt = ET.tostring(at, encoding="unicode", method="text").strip()
+        abstract_parts.append(f"**{label}**: {txt}" if label else txt)
+    journal = art.findtext(".//Journal/Title", "")
+    journal_abbr = art.findtext(".//Journal/ISOAbbreviation", "")
+    pub_date = art.find(".//Journal/JournalIssue/PubDate")
+    date_str = ""
+    if pub_date is not None:
+        date_str = " ".join(pub_date.findtext(t, "") for t in ("Year", "Month", "Day")).strip()
+    doi = ""
+    for eid in article.findall(".//ArticleIdList/ArticleId"):
+        if eid.get("IdType") == "doi":
+            doi = eid.text or ""
+            break
+    authors = [f"{au.findtext('LastName', '')} {au.findtext('ForeName', '')}".strip()
+               for au in art.findall(".//AuthorList/Author") if au.findtext("LastName", "")]
+    return Paper(source="pubmed", source_id=pmid, title=title, abstract=" ".join(abstract_parts),
+                 authors=authors, journal=journal, journal_abbr=journal_abbr, date=date_str,
+                 doi=doi, url=f"https://doi.org/{doi}")
+
+
+def legacy_parse(payload: bytes) -> list:
+    root = ET.fromstring(payload)
+    return [legacy_parse_article(a) for a in root.findall(".//PubmedArticle")]
+
+
+def _time(fn, corpus, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(corpus)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--articles", type=int, default=5000)
+    ap.add_argument("--processes", type=int, default=4, help="多进程解析的进程数，0 为不测")
+    ap.add_argument("--repeat", type=int, default=3, help="每项重复次数，取最快一次")
+    args = ap.parse_args()
+
+    corpus = make_corpus(args.articles)
+    n = args.articles
+    print(f"语料: {n} 篇，{len(corpus)} 批，{sum(map(len, corpus)) / 1e6:.1f} MB；解析后端: {XML_BACKEND}")
+
+    # 两个解析器的共有字段必须一致，基准才有意义（标题除外：旧解析器丢掉 <i> 等行内标记后的文字）
+    old, new = legacy_parse(corpus[0]), parse_efetch_xml(corpus[0])
+    fields = ("source_id", "abstract", "authors", "journal", "date", "doi")
+    assert [[getattr(p, f) for f in fields] for p in old] == \
+           [[getattr(p, f) for f in fields] for p in new], "新旧解析结果不一致"
+
+    def run_serial(parse):
+        return lambda c: [parse(x) for x in c]
+
+    results = [("旧解析器", _time(run_serial(legacy_parse), corpus, args.repeat)),
+               ("当前解析器", _time(run_serial(parse_efetch_xml), corpus, args.repeat))]
+    if args.processes > 0:
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            list(pool.map(parse_efetch_xml, corpus[:args.processes]))  # 预热子进程
+            results.append((f"当前解析器 × {args.processes} 进程",
+                            _time(lambda c: list(pool.map(parse_efetch_xml, c)), corpus, args.repeat)))
+
+    base = results[0][1]
+    for name, seconds in results:
+        print(f"  {name:<20} {n / seconds:>9.0f} 篇/秒  {seconds:.3f}s  ×{base / seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 import os
 import sys
+import copy
 import json
 import tkinter as tk
 from tkinter import ttk, messagebox
@@ -10,7 +11,7 @@ from tkinter import ttk, messagebox
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from literature_briefing.config import load_config, save_config
-from gui.tabs import GeneralTab, SourcesTab, AITab, ScheduleTab, AboutTab
+from gui.tabs import GeneralTab, SourcesTab, AITab, ScheduleTab, RunTab, AboutTab
 
 
 class SettingsApp:
@@ -30,12 +31,14 @@ class SettingsApp:
         self.sources = SourcesTab(notebook)
         self.ai = AITab(notebook)
         self.schedule = ScheduleTab(notebook)
+        self.runner = RunTab(notebook, self._collect)
         self.about = AboutTab(notebook)
 
         notebook.add(self.general, text="通用")
         notebook.add(self.sources, text="文献源")
         notebook.add(self.ai, text="AI 设置")
         notebook.add(self.schedule, text="定时任务")
+        notebook.add(self.runner, text="立即运行")
         notebook.add(self.about, text="关于")
 
         # 底部按钮
@@ -53,6 +56,13 @@ class SettingsApp:
         self.ai.load(self.cfg)
         self.schedule.load(self.cfg)
 
+    def _collect(self) -> dict:
+        """当前界面上的设置（含未保存的修改），不写入配置文件"""
+        cfg = copy.deepcopy(self.cfg)
+        for tab in (self.general, self.sources, self.ai, self.schedule):
+            tab.save(cfg)
+        return cfg
+
     def _save(self):
         try:
             self.general.save(self.cfg)
@@ -5,6 +5,7 @@ import sys
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from .widgets import ListEditor
+from .worker import BackgroundTask
 
 
 class GeneralTab(ttk.Frame):
@@ -137,10 +138,11 @@ class SourcesTab(ttk.Frame):
 class AITab(ttk.Frame):
     """AI 设置标签页"""
 
-    PROVIDERS = ["openrouter", "openai", "gemini", "claude"]
+    PROVIDERS = ["openrouter", "openai", "gemini", "claude", "openai_compatible"]
 
     def __init__(self, parent):
         super().__init__(parent, padding=10)
+        self.compat_options = {}
         row = 0
 
         ttk.Label(self, text="提供商:").grid(row=row, column=0, sticky="w", pady=4)
@@ -159,6 +161,12 @@ class AITab(ttk.Frame):
         self.model.grid(row=row, column=1, sticky="ew", padx=4)
         row += 1
 
+        ttk.Label(self, text="服务地址:").grid(row=row, column=0, sticky="w", pady=4)
+        self.base_url = ttk.Entry(self, width=40)
+        self.base_url.grid(row=row, column=1, sticky="ew", padx=4)
+        ttk.Label(self, text="（仅 openai_compatible）").grid(row=row, column=2, sticky="w")
+        row += 1
+
         ttk.Label(self, text="温度:").grid(row=row, column=0, sticky="w", pady=4)
         self.temperature = ttk.Scale(self, from_=0.0, to=1.0, orient="horizontal")
         self.temperature.grid(row=row, column=1, sticky="ew", padx=4)
@@ -179,30 +187,62 @@ class AITab(ttk.Frame):
                         ).grid(row=row, column=0, columnspan=2, sticky="w", pady=4)
         row += 1
 
-        ttk.Button(self, text="测试连接", command=self._test_connection
-                   ).grid(row=row, column=0, columnspan=2, sticky="w", pady=8)
+        self.test_btn = ttk.Button(self, text="测试连接", command=self._test_connection)
+        self.test_btn.grid(row=row, column=0, sticky="w", pady=8)
+        self.test_status = ttk.Label(self, text="")
+        self.test_status.grid(row=row, column=1, sticky="w", padx=4)
 
         self.columnconfigure(1, weight=1)
 
     def _update_temp_label(self, val):
         self.temp_label.config(text=f"{float(val):.2f}")
 
+    def _compat_options(self, options: dict) -> dict:
+        """合并界面上的服务地址；留空时去掉 base_url，使用默认地址"""
+        options = dict(options)
+        base_url = self.base_url.get().strip()
+        if base_url:
+            options["base_url"] = base_url
+        else:
+            options.pop("base_url", None)
+        return options
+
     def _test_connection(self):
-        try:
+        # 控件只在主线程读取；网络请求放到后台线程，窗口不会卡住
+        cfg_llm = {
+            "provider": self.provider.get(),
+            "api_key": self.api_key.get().strip(),
+            "model": self.model.get().strip(),
+            "temperature": self.temperature.get(),
+            "openai_compatible": self._compat_options(self.compat_options),
+        }
+
+        def work(task):
             sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
             from literature_briefing.llm import get_provider
-            cfg_llm = {
-                "provider": self.provider.get(),
-                "api_key": self.api_key.get().strip(),
-                "model": self.model.get().strip(),
-                "temperature": self.temperature.get(),
-            }
             llm = get_provider(cfg_llm)
             result = llm.call("Say 'OK' in one word.", max_tokens=10)
+            if hasattr(llm, "probe"):
+                probe = llm.probe()
+                result += f"\n延迟 {probe['latency'] * 1000:.0f} ms，模型: {', '.join(probe['models']) or '-'}"
+            return result
+
+        def finish():
+            self.test_btn.config(state="normal")
+            self.test_status.config(text="")
+
+        def on_done(result):
+            finish()
             messagebox.showinfo("测试成功", f"连接正常！回复: {result}")
-        except Exception as e:
+
+        def on_error(e):
+            finish()
             messagebox.showerror("测试失败", str(e))
 
+        self.test_btn.config(state="disabled")
+        self.test_status.config(text="正在连接...")
+        BackgroundTask(self, work, on_done=on_done, on_error=on_error).start()
+
     def load(self, cfg):
         llm = cfg.get("llm", {})
         self.provider.set(llm.get("provider", "openrouter"))
@@ -210,6 +250,9 @@ class AITab(ttk.Frame):
         self.api_key.insert(0, llm.get("api_key", ""))
         self.model.delete(0, "end")
         self.model.insert(0, llm.get("model", ""))
+        self.compat_options = dict(llm.get("openai_compatible", {}))
+        self.base_url.delete(0, "end")
+        self.base_url.insert(0, self.compat_options.get("base_url", ""))
         self.temperature.set(llm.get("temperature", 0.1))
         self._update_temp_label(llm.get("temperature", 0.1))
         self.enable_translation.set(llm.get("enable_translation", True))
@@ -219,6 +262,7 @@ class AITab(ttk.Frame):
         cfg["llm"]["provider"] = self.provider.get()
         cfg["llm"]["api_key"] = self.api_key.get().strip()
         cfg["llm"]["model"] = self.model.get().strip()
+        cfg["llm"]["openai_compatible"] = self._compat_options(cfg["llm"].get("openai_compatible", {}))
         cfg["llm"]["temperature"] = round(self.temperature.get(), 2)
         cfg["llm"]["enable_translation"] = self.enable_translation.get()
         cfg["llm"]["enable_highlights"] = self.enable_highlights.get()
@@ -247,6 +291,12 @@ class ScheduleTab(ttk.Frame):
         self.timeout.grid(row=row, column=1, sticky="w", padx=4)
         row += 1
 
+        self.prefetch = tk.BooleanVar(value=True)
+        ttk.Checkbutton(self, text="弹窗等待期间预先检索",
+                        variable=self.prefetch
+                        ).grid(row=row, column=0, columnspan=2, sticky="w", pady=4)
+        row += 1
+
         btn_frame = ttk.Frame(self)
         btn_frame.grid(row=row, column=0, columnspan=2, sticky="w", pady=12)
         ttk.Button(btn_frame, text="安装定时任务",
@@ -282,11 +332,123 @@ class ScheduleTab(ttk.Frame):
         self.show_popup.set(sch.get("show_popup", True))
         self.timeout.delete(0, "end")
         self.timeout.insert(0, str(sch.get("popup_timeout_sec", 30)))
+        self.prefetch.set(sch.get("prefetch", True))
 
     def save(self, cfg):
         cfg["schedule"]["delay_minutes"] = int(self.delay.get() or 20)
         cfg["schedule"]["show_popup"] = self.show_popup.get()
         cfg["schedule"]["popup_timeout_sec"] = int(self.timeout.get() or 30)
+        cfg["schedule"]["prefetch"] = self.prefetch.get()
+
+
+class RunTab(ttk.Frame):
+    """立即运行标签页：按当前界面设置运行一次并显示进度"""
+
+    def __init__(self, parent, get_config):
+        super().__init__(parent, padding=10)
+        self.get_config = get_config
+        self.task = None
+        self._stage = ""
+
+        btn_frame = ttk.Frame(self)
+        btn_frame.pack(fill="x")
+        self.start_btn = ttk.Button(btn_frame, text="立即运行", command=self._start)
+        self.start_btn.pack(side="left", padx=(0, 8))
+        self.cancel_btn = ttk.Button(btn_frame, text="取消运行", command=self._cancel,
+                                     state="disabled")
+        self.cancel_btn.pack(side="left")
+
+        self.stage_label = ttk.Label(self, text="未运行")
+        self.stage_label.pack(anchor="w", pady=(12, 4))
+        self.bar = ttk.Progressbar(self, mode="determinate")
+        self.bar.pack(fill="x")
+        self.stats_label = ttk.Label(self, text="")
+        self.stats_label.pack(anchor="w", pady=4)
+
+        log_frame = ttk.Frame(self)
+        log_frame.pack(fill="both", expand=True, pady=(4, 0))
+        self.log_list = tk.Listbox(log_frame, height=10)
+        scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_list.yview)
+        self.log_list.configure(yscrollcommand=scrollbar.set)
+        self.log_list.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+    def _log(self, text):
+        self.log_list.insert("end", text)
+        self.log_list.see("end")
+
+    def _start(self):
+        try:
+            cfg = self.get_config()
+        except Exception as e:
+            messagebox.showerror("设置有误", str(e))
+            return
+
+        def work(task):
+            from literature_briefing.config import get_env_fallback
+            from literature_briefing.main import run_profile, configure_http_cache
+            from literature_briefing.progress import Progress
+            from literature_briefing.sources.base import FetchCache
+            run_cfg = get_env_fallback(cfg)
+            configure_http_cache(run_cfg)
+            progress = Progress(callback=task.post, cancel_event=task.cancel_event)
+            return run_profile(run_cfg, FetchCache(), {}, progress=progress)
+
+        self.log_list.delete(0, "end")
+        self._stage = ""
+        self.bar.config(value=0, maximum=1)
+        self.stats_label.config(text="")
+        self.stage_label.config(text="准备中...")
+        self.start_btn.config(state="disabled")
+        self.cancel_btn.config(state="normal")
+        self.task = BackgroundTask(self, work, on_done=self._on_done,
+                                   on_error=self._on_error, on_event=self._on_event).start()
+
+    def _cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.cancel_btn.config(state="disabled")
+            self.stage_label.config(text="正在取消（当前请求结束后停止）...")
+
+    def _on_event(self, event):
+        from literature_briefing.progress import STAGES
+        stage, done, total = event["stage"], event["done"], event["total"]
+        if stage != self._stage:
+            self._stage = stage
+            self._log(f"[{STAGES.get(stage, stage)}] 开始" + (f"，共 {total} 项" if total else ""))
+        if "source" in event:
+            self._log(f"  {event['source']}: {event['papers']} 篇")
+        if self.task.cancel_event.is_set():
+            return
+        self.stage_label.config(text=STAGES.get(stage, stage))
+        self.bar.config(maximum=max(total, 1), value=done)
+        stats = f"{done}/{total}" if total else ""
+        if event["rate"]:
+            stats += f"    {event['rate']:.1f} 项/秒"
+        if event["eta"] is not None:
+            stats += f"    预计剩余 {event['eta']:.0f} 秒"
+        self.stats_label.config(text=stats)
+
+    def _finish(self, text):
+        self.task = None
+        self.stage_label.config(text=text)
+        self.start_btn.config(state="normal")
+        self.cancel_btn.config(state="disabled")
+
+    def _on_done(self, result):
+        total, filepath = result
+        self._finish(f"完成，共 {total} 篇")
+        self._log(f"简报已保存: {filepath}")
+
+    def _on_error(self, e):
+        from literature_briefing.progress import RunCancelled
+        if isinstance(e, RunCancelled):
+            self._finish("已取消")
+            self._log("运行已取消，未写出简报")
+            return
+        self._finish("运行失败")
+        self._log(f"运行失败: {e}")
+        messagebox.showerror("运行失败", str(e))
 
 
 class AboutTab(ttk.Frame):
@@ -0,0 +1,66 @@
+"""后台任务：耗时操作放到线程里跑，结果与事件经 after() 回到 Tk 主线程"""
+
+import queue
+import threading
+
+
+class BackgroundTask:
+    """在后台线程执行 fn(task)，回调都在 Tk 主线程中调用
+
+    fn 可通过 task.post(event) 发送中间事件（on_event 接收），
+    通过 task.cancel_event 感知取消；返回值交给 on_done，异常交给 on_error。
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, widget, fn, on_done=None, on_error=None, on_event=None):
+        self.widget = widget
+        self.fn = fn
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_event = on_event
+        self.cancel_event = threading.Event()
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.widget.after(self.POLL_MS, self._poll)
+        return self
+
+    def post(self, event):
+        """后台线程调用：把事件排队交给主线程"""
+        self._queue.put(("event", event))
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        try:
+            self._queue.put(("done", self.fn(self)))
+        except Exception as e:
+            self._queue.put(("error", e))
+
+    def _poll(self):
+        try:
+            while True:
+                kind, payload = self._queue.get_nowait()
+                if kind == "event":
+                    if self.on_event:
+                        self.on_event(payload)
+                    continue
+                callback = self.on_done if kind == "done" else self.on_error
+                if callback:
+                    callback(payload)
+                return
+        except queue.Empty:
+            pass
+        try:
+            self.widget.after(self.POLL_MS, self._poll)
+        except Exception:
+            pass  # 窗口已关闭
@@ -0,0 +1,216 @@
+"""本地只读 HTTP/JSON 接口：简报、论文记录与搜索
+
+python -m literature_briefing api
+
+GET /briefings                  简报列表
+GET /briefings/latest           最新简报（?format=md 返回 Markdown 原文）
+GET /briefings/<id>             指定简报
+GET /papers/<source>/<id>       单篇论文记录（含翻译）
+GET /search?q=...&limit=20      在标题/摘要（含译文）中搜索
+
+响应带 ETag，支持 If-None-Match；渲染结果缓存在内存 LRU 中，
+目录最多每 REFRESH_INTERVAL 秒扫描一次，轮询请求不会反复读盘。
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from . import archive
+
+log = logging.getLogger(__name__)
+
+REFRESH_INTERVAL = 5  # 秒
+LRU_SIZE = 256
+BRIEFING_PREFIX = "文献简报_"
+
+
+class BriefingStore:
+    """输出目录中的简报（.md + 同名 .lbp 存档）"""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.version = 0
+        self._files = {}  # id -> (mtime, md_path, archive_path)
+        self._records = {}  # id -> (mtime, record)
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """按间隔扫描目录；有变化时递增 version 使响应缓存失效"""
+        now = time.monotonic()
+        if now - self._checked < REFRESH_INTERVAL:
+            return
+        with self._lock:
+            self._checked = now
+            files = {}
+            if os.path.isdir(self.output_dir):
+                for entry in os.scandir(self.output_dir):
+                    stem, ext = os.path.splitext(entry.name)
+                    if ext != ".lbp" or not stem.startswith(BRIEFING_PREFIX):
+                        continue
+                    md_path = os.path.join(self.output_dir, stem + ".md")
+                    files[stem] = (entry.stat().st_mtime, md_path, entry.path)
+            if files != self._files:
+                self._files = files
+                self.version += 1
+
+    def ids(self) -> list:
+        return sorted(self._files, reverse=True)
+
+    def record(self, briefing_id: str):
+        info = self._files.get(briefing_id)
+        if info is None:
+            return None
+        cached = self._records.get(briefing_id)
+        if cached and cached[0] == info[0]:
+            return cached[1]
+        meta, papers = archive.load(info[2])
+        rec = dict(meta, papers=[asdict(p) for p in papers])
+        self._records[briefing_id] = (info[0], rec)
+        return rec
+
+    def markdown(self, briefing_id: str) -> str:
+        info = self._files.get(briefing_id)
+        if info is None or not os.path.exists(info[1]):
+            return ""
+        with open(info[1], "r", encoding="utf-8") as f:
+            return f.read()
+
+
+class BriefingApi:
+    def __init__(self, store: BriefingStore, lru_size: int = LRU_SIZE):
+        self.store = store
+        self.lru_size = lru_size
+        self._cache = OrderedDict()  # (version, path) -> (etag, content_type, body)
+        self._lock = threading.Lock()
+
+    def handle(self, raw_path: str, if_none_match: str = ""):
+        """返回 (状态码, 响应头, 响应体)"""
+        self.store.refresh()
+        key = (self.store.version, raw_path)
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+        if hit is None:
+            try:
+                code, content_type, body = self._render(raw_path)
+            except Exception as e:
+                log.warning(f"API 请求失败 {raw_path}: {e}")
+                code, content_type, body = self._json(500, {"error": str(e)})
+            if code != 200:
+                return code, {"Content-Type": content_type}, body
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            hit = (etag, content_type, body)
+            with self._lock:
+                self._cache[key] = hit
+                while len(self._cache) > self.lru_size:
+                    self._cache.popitem(last=False)
+
+        etag, content_type, body = hit
+        headers = {"Content-Type": content_type, "ETag": etag}
+        if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+            return 304, headers, b""
+        return 200, headers, body
+
+    @staticmethod
+    def _json(code: int, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        return code, "application/json; charset=utf-8", body
+
+    def _render(self, raw_path: str):
+        url = urlsplit(raw_path)
+        parts = [unquote(p) for p in url.path.split("/") if p]
+        query = parse_qs(url.query)
+
+        if parts == ["briefings"]:
+            items = []
+            for bid in self.store.ids():
+                rec = self.store.record(bid)
+                items.append({"id": bid, "generated": rec.get("generated"),
+                              "date_from": rec.get("date_from"), "date_to": rec.get("date_to"),
+                              "total": len(rec.get("papers", []))})
+            return self._json(200, items)
+
+        if len(parts) == 2 and parts[0] == "briefings":
+            ids = self.store.ids()
+            bid = ids[0] if parts[1] == "latest" and ids else parts[1]
+            rec = self.store.record(bid)
+            if rec is None:
+                return self._json(404, {"error": "briefing not found"})
+            if query.get("format", [""])[0] == "md":
+                return 200, "text/markdown; charset=utf-8", self.store.markdown(bid).encode("utf-8")
+            return self._json(200, dict(rec, id=bid))
+
+        if len(parts) == 3 and parts[0] == "papers":
+            for bid in self.store.ids():
+                for p in self.store.record(bid).get("papers", []):
+                    if p["source"] == parts[1] and p["source_id"] == parts[2]:
+                        return self._json(200, dict(p, briefing=bid))
+            return self._json(404, {"error": "paper not found"})
+
+        if parts == ["search"]:
+            q = query.get("q", [""])[0].strip().lower()
+            limit = int(query.get("limit", ["20"])[0])
+            if not q:
+                return self._json(400, {"error": "missing q"})
+            results, seen = [], set()
+            for bid in self.store.ids():
+                for p in self.store.record(bid).get("papers", []):
+                    key = (p["source"], p["source_id"])
+                    if key in seen:
+                        continue
+                    text = " ".join((p["title"], p["title_zh"], p["abstract"], p["abstract_zh"],
+                                     *(t for pair in (p.get("translations") or {}).values() for t in pair)))
+                    if q in text.lower():
+                        seen.add(key)
+                        results.append(dict(p, briefing=bid))
+                        if len(results) >= limit:
+                            return self._json(200, results)
+            return self._json(200, results)
+
+        return self._json(404, {"error": "not found"})
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    api: BriefingApi = None
+
+    def _send(self, code: int, headers: dict, body: bytes):
+        self.send_response(code)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send(*self.api.handle(self.path, self.headers.get("If-None-Match", "")))
+
+    def log_message(self, format, *args):
+        log.debug(format % args)
+
+
+def make_handler(api: BriefingApi):
+    return type("BoundApiHandler", (ApiHandler,), {"api": api})
+
+
+def serve_api(cfg: dict, port: int = None):
+    output_dir = os.path.join(cfg["output_path"], cfg["output_folder"])
+    port = port or cfg["schedule"].get("serve_port", 8765)
+    api = BriefingApi(BriefingStore(output_dir))
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(api))
+    log.info(f"简报接口: http://127.0.0.1:{port}/briefings  ({output_dir})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("简报接口退出")
+    finally:
+        server.server_close()
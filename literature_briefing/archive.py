@@ -0,0 +1,90 @@
+"""Paper 列表的紧凑二进制序列化（简报存档、缓存文件）
+
+文件格式: b"LBP" + 版本号(1B) + 编码(1B) + zlib 压缩的负载
+负载记录字段名列表、字符串表（来源/期刊名去重）和按位置排列的行，
+读取时按字段名映射，Paper 增删字段后旧文件仍可读取。
+安装了 msgpack 时使用 msgpack 编码，否则退回紧凑 JSON。
+"""
+
+import json
+import zlib
+from dataclasses import fields
+from typing import List, Tuple
+
+from .sources.base import Paper
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MAGIC = b"LBP"
+SCHEMA_VERSION = 1
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+# 这些字段取值高度重复，存为字符串表下标
+INTERNED_FIELDS = ("source", "journal", "journal_abbr")
+
+
+def dumps(papers: List[Paper], meta: dict = None) -> bytes:
+    names = [f.name for f in fields(Paper)]
+    interned = [i for i, n in enumerate(names) if n in INTERNED_FIELDS]
+    strings, index = [], {}
+    rows = []
+    for p in papers:
+        row = [getattr(p, n) for n in names]
+        for i in interned:
+            s = row[i]
+            if s not in index:
+                index[s] = len(strings)
+                strings.append(s)
+            row[i] = index[s]
+        rows.append(row)
+    payload = {"fields": names, "interned": [names[i] for i in interned],
+               "strings": strings, "meta": meta or {}, "rows": rows}
+    if msgpack is not None:
+        codec, body = CODEC_MSGPACK, msgpack.packb(payload, use_bin_type=True)
+    else:
+        codec = CODEC_JSON
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return MAGIC + bytes([SCHEMA_VERSION, codec]) + zlib.compress(body, 6)
+
+
+def loads(data: bytes) -> Tuple[dict, List[Paper]]:
+    """返回 (meta, papers)"""
+    if data[:3] != MAGIC:
+        raise ValueError("不是有效的 LBP 存档")
+    version, codec = data[3], data[4]
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"存档版本 {version} 高于当前支持的 {SCHEMA_VERSION}")
+    body = zlib.decompress(data[5:])
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("该存档使用 msgpack 编码，请先安装 msgpack")
+        payload = msgpack.unpackb(body, raw=False)
+    else:
+        payload = json.loads(body.decode("utf-8"))
+
+    names = payload["fields"]
+    known = {f.name for f in fields(Paper)}
+    interned = {names.index(n) for n in payload.get("interned", [])}
+    strings = payload["strings"]
+    papers = []
+    for row in payload["rows"]:
+        kwargs = {}
+        for i, (name, value) in enumerate(zip(names, row)):
+            if name not in known:
+                continue
+            kwargs[name] = strings[value] if i in interned else value
+        papers.append(Paper(**kwargs))
+    return payload.get("meta", {}), papers
+
+
+def dump(path: str, papers: List[Paper], meta: dict = None):
+    with open(path, "wb") as f:
+        f.write(dumps(papers, meta))
+
+
+def load(path: str) -> Tuple[dict, List[Paper]]:
+    with open(path, "rb") as f:
+        return loads(f.read())
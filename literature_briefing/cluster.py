@@ -0,0 +1,220 @@
+"""主题聚类：按标题+摘要的向量把文献分成若干主题章节
+
+向量通过 LLM 提供商的 embedding 接口批量获取（embedder="llm"，提供商取
+llm.tasks.embedding 覆盖后的配置），或用本地词袋特征哈希（embedder="local"，
+离线、无费用，也用于测试）。向量按内容哈希缓存，同一篇文献只付费一次。
+聚类是归一化矩阵上的球面 k-means（余弦相似度），几千篇在一秒内完成。
+需要 numpy；未安装时跳过聚类，简报仍按期刊分组。
+"""
+
+import os
+import re
+import math
+import time
+import zlib
+import hashlib
+import logging
+from typing import List
+
+from .sources.base import Paper
+from .llm import get_provider, task_config
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+log = logging.getLogger(__name__)
+
+MAX_TEXT_CHARS = 2000  # 送去计算向量的标题+摘要长度上限
+MAX_CACHE = 50000
+MAX_CLUSTERS = 40
+LOCAL_DIM = 512
+_WORD_RE = re.compile(r"[a-z][a-z0-9\-]{2,}")
+STOPWORDS = frozenset("""
+the and for with from that this these those into onto over under between among
+are was were been being has have had not but can may might will would than then
+also via using use used based study studies analysis results result method methods
+new novel its their our we here show shows shown during after before within without
+patients patient human humans role effect effects associated association data model
+""".split())
+
+
+def paper_text(paper: Paper) -> str:
+    return f"{paper.title}\n{paper.abstract}"[:MAX_TEXT_CHARS]
+
+
+def _words(text: str) -> list:
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS]
+
+
+class EmbeddingCache:
+    """内容哈希 -> 向量的持久缓存（.npz）；换了向量模型则重新建立"""
+
+    def __init__(self, path: str, model: str):
+        self.path = path
+        self.model = model
+        self._data = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            try:
+                with np.load(path, allow_pickle=False) as f:
+                    if str(f["model"]) == model:
+                        self._data = dict(zip(f["keys"].tolist(), f["vectors"]))
+                    else:
+                        log.info(f"向量模型已从 {f['model']} 改为 {model}，重新建立向量缓存")
+            except (OSError, ValueError, KeyError) as e:
+                log.warning(f"向量缓存读取失败，重新建立: {e}")
+
+    def key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        return self._data.get(key)
+
+    def put(self, key: str, vector):
+        self._data[key] = vector
+        self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty or not self._data:
+            return
+        keys = list(self._data)[-MAX_CACHE:]
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, model=np.array(self.model), keys=np.array(keys),
+                     vectors=np.stack([self._data[k] for k in keys]).astype(np.float32))
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+class LocalEmbedder:
+    """离线替代：词袋特征哈希 + 对数词频，不需要网络与费用"""
+
+    model = f"local-hash-{LOCAL_DIM}"
+    batch_size = 1000
+
+    def embed(self, texts: List[str]):
+        m = np.zeros((len(texts), LOCAL_DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for w in _words(text):
+                m[i, zlib.crc32(w.encode()) % LOCAL_DIM] += 1
+        return np.log1p(m)
+
+
+class ProviderEmbedder:
+    """通过 LLM 提供商的 embedding 接口批量获取向量"""
+
+    def __init__(self, cfg_llm: dict, model: str, batch_size: int = 64):
+        self.provider = get_provider(task_config(cfg_llm, "embedding"))
+        self.model = model
+        self.batch_size = batch_size
+
+    def embed(self, texts: List[str]):
+        return np.asarray(self.provider.embed(texts, self.model), dtype=np.float32)
+
+
+def embed_papers(papers: List[Paper], embedder, cache: EmbeddingCache):
+    """返回行归一化的向量矩阵；只为缓存中没有的文献发请求"""
+    texts = [paper_text(p) for p in papers]
+    keys = [cache.key(t) for t in texts]
+    missing = [i for i, k in enumerate(keys) if cache.get(k) is None]
+    requests = 0
+    for start in range(0, len(missing), embedder.batch_size):
+        batch = missing[start:start + embedder.batch_size]
+        vectors = embedder.embed([texts[i] for i in batch])
+        requests += 1
+        for i, v in zip(batch, vectors):
+            cache.put(keys[i], v)
+    cache.save()
+    log.info(f"  向量: {len(papers) - len(missing)}/{len(papers)} 篇命中缓存，请求 {requests} 次")
+
+    x = np.stack([cache.get(k) for k in keys]).astype(np.float32)
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.where(norms == 0, 1, norms)
+
+
+def kmeans(x, k: int, max_iter: int = 50, seed: int = 0):
+    """球面 k-means（k-means++ 初始化），x 须已行归一化；返回 (标签, 中心)"""
+    rng = np.random.default_rng(seed)
+    n = len(x)
+    first = int(rng.integers(n))
+    chosen = [first]
+    dist = 1 - x @ x[first]
+    for _ in range(1, k):
+        weights = np.clip(dist, 0, None)
+        total = weights.sum()
+        idx = int(rng.choice(n, p=weights / total)) if total > 0 else int(rng.integers(n))
+        chosen.append(idx)
+        dist = np.minimum(dist, 1 - x @ x[idx])
+    centers = x[chosen].copy()
+
+    labels = None
+    for _ in range(max_iter):
+        new_labels = (x @ centers.T).argmax(axis=1)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        onehot = np.zeros((k, n), dtype=x.dtype)
+        onehot[labels, np.arange(n)] = 1
+        sums = onehot @ x
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0  # 空簇保留原中心
+        centers = np.where(empty[:, None], centers, sums / np.where(norms == 0, 1, norms))
+    return labels, centers
+
+
+def _label(members: List[Paper], df: dict, n: int) -> str:
+    """簇内出现多、全局出现少的词（MeSH/关键词/标题词）作为主题名"""
+    counts = {}
+    for p in members:
+        for term in _terms(p):
+            counts[term] = counts.get(term, 0) + 1
+    min_count = 2 if len(members) > 2 else 1
+    scored = sorted(((c * math.log(n / df[t]), t) for t, c in counts.items() if c >= min_count),
+                    reverse=True)
+    return " · ".join(t for _, t in scored[:3]) or "其他"
+
+
+def _terms(paper: Paper) -> set:
+    return set(paper.mesh) | set(paper.keywords) | set(_words(paper.title))
+
+
+def cluster_papers(papers: List[Paper], cfg_cluster: dict, cfg_llm: dict,
+                   cache_path: str = None) -> list:
+    """返回 [(主题名, [Paper])]，按篇数从多到少；篇数不足 min_papers 时返回 None"""
+    if np is None:
+        log.warning("未安装 numpy，跳过主题聚类（pip install numpy）")
+        return None
+    if len(papers) < cfg_cluster.get("min_papers", 30):
+        return None
+
+    if cfg_cluster.get("embedder", "llm") == "local":
+        embedder = LocalEmbedder()
+    else:
+        embedder = ProviderEmbedder(cfg_llm, cfg_cluster.get("model", ""),
+                                    cfg_cluster.get("batch_size", 64))
+    x = embed_papers(papers, embedder, EmbeddingCache(cache_path, embedder.model))
+
+    start = time.perf_counter()
+    n = len(papers)
+    k = cfg_cluster.get("clusters") or round(math.sqrt(n / 2))
+    k = max(2, min(k, MAX_CLUSTERS, n))
+    labels, centers = kmeans(x, k)
+    # 簇内按与中心的相似度排序，最有代表性的在前
+    sims = (x * centers[labels]).sum(axis=1)
+
+    df = {}
+    for p in papers:
+        for term in _terms(p):
+            df[term] = df.get(term, 0) + 1
+    topics = []
+    for c in range(k):
+        idx = np.flatnonzero(labels == c)
+        if not len(idx):
+            continue
+        members = [papers[i] for i in idx[np.argsort(-sims[idx])]]
+        topics.append((_label(members, df, n), members))
+    topics.sort(key=lambda t: -len(t[1]))
+    log.info(f"  主题聚类: {n} 篇 → {len(topics)} 个主题，用时 {time.perf_counter() - start:.2f}s")
+    return topics
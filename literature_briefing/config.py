@@ -21,7 +21,23 @@ DEFAULT_CONFIG = {
         "model": "google/gemini-2.0-flash-001",
         "temperature": 0.1,
         "enable_translation": True,
+        "target_languages": ["zh"],
         "enable_highlights": True,
+        "abstract_chunk_chars": 1000,
+        "translation_workers": 4,
+        "tasks": {
+            "title": {},
+            "abstract": {},
+            "highlights": {},
+        },
+        "openai_compatible": {
+            "base_url": "http://127.0.0.1:8000/v1",
+            "auth_header": "Authorization",
+            "auth_scheme": "Bearer",
+            "models": [],
+            "concurrency": 16,
+            "timeout": 300,
+        },
     },
     "sources": {
         "pubmed": {
@@ -31,17 +47,53 @@ DEFAULT_CONFIG = {
             "extended_journals": [],
             "keywords": [],
             "species_filter": [],
+            "parse_processes": 0,
+            "date_type": "edat",
+            "filter_mode": "server",
+            "exclude_types": ["Published Erratum", "Retraction of Publication", "Editorial", "Comment"],
         },
         "arxiv": {
             "enabled": False,
             "categories": [],
             "keywords": [],
+            "harvest_mode": "search",
         },
     },
+    "enrich": {
+        "enabled": False,
+        "icite": True,
+        "crossref": True,
+        "ttl_hours": 24,
+        "max_requests": 5,
+        "sort_by_impact": False,
+    },
+    "cluster": {
+        "enabled": False,
+        "embedder": "llm",
+        "model": "text-embedding-3-small",
+        "batch_size": 64,
+        "clusters": 0,
+        "min_papers": 30,
+    },
+    "http_cache": {
+        "mode": "normal",
+        "dir": "",
+        "ttl": {},
+    },
     "schedule": {
         "delay_minutes": 20,
         "show_popup": True,
         "popup_timeout_sec": 30,
+        "prefetch": True,
+        "cron": "0 8 * * *",
+        "serve_port": 8765,
+    },
+    "logging": {
+        "format": "text",
+        "max_bytes": 5242880,
+        "rotate_when": "",
+        "backup_count": 5,
+        "level": "INFO",
     },
 }
 
@@ -106,20 +158,29 @@ def save_config(cfg: dict, path: str = None):
     log.info(f"配置已保存: {path}")
 
 
+# 各 LLM 提供商对应的 API key 环境变量
+LLM_ENV_KEYS = {
+    "openrouter": "OPENROUTER_API_KEY",
+    "openai": "OPENAI_API_KEY",
+    "gemini": "GEMINI_API_KEY",
+    "claude": "ANTHROPIC_API_KEY",
+}
+
+
 def get_env_fallback(cfg: dict) -> dict:
     """环境变量回退：如果配置中 API key 为空，尝试从环境变量读取"""
     cfg = json.loads(json.dumps(cfg))  # deep copy
     if not cfg["llm"]["api_key"]:
-        provider = cfg["llm"]["provider"]
-        env_map = {
-            "openrouter": "OPENROUTER_API_KEY",
-            "openai": "OPENAI_API_KEY",
-            "gemini": "GEMINI_API_KEY",
-            "claude": "ANTHROPIC_API_KEY",
-        }
-        env_key = env_map.get(provider, "")
+        env_key = LLM_ENV_KEYS.get(cfg["llm"]["provider"], "")
         if env_key:
             cfg["llm"]["api_key"] = os.environ.get(env_key, "")
+    # 按任务路由到其他提供商时，该任务的 key 也可来自环境变量
+    for task in (cfg["llm"].get("tasks") or {}).values():
+        provider = task.get("provider")
+        if provider and provider != cfg["llm"]["provider"] and not task.get("api_key"):
+            env_key = LLM_ENV_KEYS.get(provider, "")
+            if env_key and os.environ.get(env_key):
+                task["api_key"] = os.environ[env_key]
     if not cfg["sources"]["pubmed"]["api_key"]:
         cfg["sources"]["pubmed"]["api_key"] = os.environ.get("PUBMED_API_KEY", "")
     return cfg
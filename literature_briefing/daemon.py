@@ -0,0 +1,248 @@
+"""常驻模式：内置 cron 调度、配置热加载、本地触发接口
+
+python -m literature_briefing serve
+
+进程常驻期间 HTTP 连接池、已下载文献、翻译结果和 seen 状态都保留在内存中，
+定时或手动触发的重复运行几乎没有启动开销。每次运行后丢弃已进入 seen 状态的
+文献与译文，其余按上限保留，常驻内存不会随运行次数增长。
+"""
+
+import os
+import sys
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer
+
+from .api import ApiHandler, BriefingApi, BriefingStore
+from .config import load_config, get_env_fallback, CONFIG_PATH
+from .logs import setup_logging
+from .sources.base import FetchCache
+
+log = logging.getLogger(__name__)
+
+RELOAD_INTERVAL = 30  # 秒，检查配置文件变化的间隔
+# 运行之间保留在内存中的文献与译文上限（按加入顺序丢弃最早的）
+MAX_CACHED_PAPERS = 20000
+MAX_CACHED_TRANSLATIONS = 5000
+
+
+def _parse_field(field: str, lo: int, hi: int) -> set:
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+        if part == "*":
+            start, end = lo, hi
+        elif "-" in part:
+            a, b = part.split("-", 1)
+            start, end = int(a), int(b)
+        else:
+            start = int(part)
+            end = hi if step > 1 else start
+        if start < lo or end > hi or start > end:
+            raise ValueError(f"cron 字段超出范围: {field}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """五段 cron 表达式：分 时 日 月 周，支持 * , - /（周日为 0 或 7）"""
+
+    def __init__(self, expr: str):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 表达式需要 5 段: {expr}")
+        self.expr = expr
+        self.minutes = _parse_field(fields[0], 0, 59)
+        self.hours = _parse_field(fields[1], 0, 23)
+        self.days = _parse_field(fields[2], 1, 31)
+        self.months = _parse_field(fields[3], 1, 12)
+        self.weekdays = {d % 7 for d in _parse_field(fields[4], 0, 7)}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def matches(self, dt: datetime) -> bool:
+        if dt.minute not in self.minutes or dt.hour not in self.hours:
+            return False
+        if dt.month not in self.months:
+            return False
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        # 与标准 cron 一致：日和周都有限定时满足其一即可
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, dt: datetime) -> datetime:
+        t = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        end = t + timedelta(days=366)
+        while t < end:
+            if self.matches(t):
+                return t
+            t += timedelta(minutes=1)
+        raise ValueError(f"cron 表达式在一年内没有匹配时间: {self.expr}")
+
+
+class BriefingDaemon:
+    def __init__(self, config_paths: list):
+        self.config_paths = config_paths or [None]
+        self.cache = FetchCache()
+        self.translations = {}
+        self.cfgs = []
+        self.schedule = None
+        self.next_run = None
+        self.last_run = None
+        self.running = False
+        self._mtimes = {}
+        self._trigger = threading.Event()
+        self._run_lock = threading.Lock()
+        self._reload()
+
+    def _reload(self) -> bool:
+        """配置文件有变化时重新加载，返回是否重新加载"""
+        mtimes = {}
+        for p in self.config_paths:
+            path = p or CONFIG_PATH
+            mtimes[path] = os.path.getmtime(path) if os.path.exists(path) else None
+        if mtimes == self._mtimes:
+            return False
+        try:
+            cfgs = [get_env_fallback(load_config(p)) for p in self.config_paths]
+            schedule = CronSchedule(cfgs[0]["schedule"].get("cron", "0 8 * * *"))
+        except Exception as e:
+            if not self.cfgs:
+                # 首次加载没有旧配置可用
+                raise
+            log.error(f"配置加载失败，继续使用旧配置: {e}")
+            self._mtimes = mtimes
+            return False
+        if self._mtimes:
+            log.info("检测到配置变化，已重新加载")
+        from .main import configure_http_cache, LOG_FILE
+        configure_http_cache(cfgs[0])
+        setup_logging(LOG_FILE, cfgs[0].get("logging"))
+        self._mtimes = mtimes
+        self.cfgs = cfgs
+        self.schedule = schedule
+        self.next_run = schedule.next_after(datetime.now())
+        return True
+
+    def trigger(self):
+        self._trigger.set()
+
+    def run_once(self):
+        from . import net
+        from .main import run_profile
+
+        with self._run_lock:
+            self.running = True
+            # 检索结果随日期变化，每次运行清空；已下载的文献与翻译保留（见 _evict）
+            self.cache.searches.clear()
+            try:
+                for cfg in self.cfgs:
+                    try:
+                        run_profile(cfg, self.cache, self.translations)
+                    except Exception:
+                        log.exception("本次运行失败")
+            finally:
+                self._evict()
+                net.prune_cache()
+                self.running = False
+                self.last_run = datetime.now()
+
+    def _evict(self):
+        """丢弃已写入所有配置 seen 状态的文献与译文（之后的运行不会再用到），其余按上限保留"""
+        from .main import _load_state
+
+        seen = None
+        for cfg in self.cfgs:
+            try:
+                state = _load_state(cfg)
+            except (OSError, ValueError) as e:
+                log.warning(f"读取 seen 状态失败，只按上限清理内存缓存: {e}")
+                seen = set()
+                break
+            ids = set(state.get("seen_ids", []) + state.get("seen_pmids", []))
+            seen = ids if seen is None else seen & ids
+        seen = seen or set()
+        for store, limit in ((self.cache.papers, MAX_CACHED_PAPERS),
+                             (self.translations, MAX_CACHED_TRANSLATIONS)):
+            # 键为 (source, source_id)
+            for key in [k for k in store if k[1] in seen]:
+                del store[key]
+            for key in list(store)[:max(0, len(store) - limit)]:
+                del store[key]
+
+    def status(self) -> dict:
+        fmt = "%Y-%m-%d %H:%M"
+        return {
+            "running": self.running,
+            "cron": self.schedule.expr if self.schedule else "",
+            "next_run": self.next_run.strftime(fmt) if self.next_run else None,
+            "last_run": self.last_run.strftime(fmt) if self.last_run else None,
+            "cached_papers": len(self.cache.papers),
+            "cached_translations": len(self.translations),
+        }
+
+    def loop(self):
+        log.info(f"常驻模式启动，计划: {self.schedule.expr}，下次运行: {self.next_run}")
+        while True:
+            wait = (self.next_run - datetime.now()).total_seconds()
+            triggered = self._trigger.wait(max(0, min(RELOAD_INTERVAL, wait)))
+            self._reload()
+            if triggered or datetime.now() >= self.next_run:
+                self._trigger.clear()
+                log.info("手动触发运行" if triggered else "按计划运行")
+                self.run_once()
+                self.next_run = self.schedule.next_after(datetime.now())
+                log.info(f"下次运行: {self.next_run}")
+
+
+def _make_handler(daemon: BriefingDaemon):
+    """触发接口 + 简报只读接口（见 api.py，使用第一个配置的输出目录）"""
+    cfg = daemon.cfgs[0]
+    store = BriefingStore(os.path.join(cfg["output_path"], cfg["output_folder"]))
+
+    class TriggerHandler(ApiHandler):
+        api = BriefingApi(store)
+
+        def _send_json(self, code: int, data: dict):
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            self._send(code, {"Content-Type": "application/json; charset=utf-8"}, body)
+
+        def do_GET(self):
+            if self.path == "/status":
+                self._send_json(200, daemon.status())
+            else:
+                super().do_GET()
+
+        def do_POST(self):
+            if self.path == "/run":
+                daemon.trigger()
+                self._send_json(202, {"triggered": True})
+            else:
+                self._send_json(404, {"error": "not found"})
+
+    return TriggerHandler
+
+
+def serve(config_paths: list = None):
+    try:
+        daemon = BriefingDaemon(config_paths)
+    except Exception as e:
+        log.error(f"配置加载失败，无法启动常驻模式: {e}")
+        sys.exit(1)
+    port = daemon.cfgs[0]["schedule"].get("serve_port", 8765)
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(daemon))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    log.info(f"本地接口: http://127.0.0.1:{port}  (POST /run, GET /status, GET /briefings)")
+    try:
+        daemon.loop()
+    except KeyboardInterrupt:
+        log.info("常驻模式退出")
+    finally:
+        server.shutdown()
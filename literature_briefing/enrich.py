@@ -0,0 +1,151 @@
+"""引用/影响力补充：批量查询 NIH iCite 与 Crossref，结果按篇缓存
+
+iCite 一次最多查询 1000 个 PMID；没有 PMID 的文献（如 arXiv）按 DOI
+成批查询 Crossref。每篇文献的结果带时间戳写入缓存文件，TTL 内重复出现
+（多配置、常驻模式、重跑）不再请求。单次运行的请求数不超过 max_requests。
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import List
+
+from .sources.base import Paper
+
+log = logging.getLogger(__name__)
+
+ICITE_URL = "https://icite.od.nih.gov/api/pubs"
+CROSSREF_URL = "https://api.crossref.org/works"
+ICITE_BATCH = 1000
+CROSSREF_BATCH = 50
+
+
+class EnrichCache:
+    """(来源键) -> [写入时间, 被引次数, RCR] 的持久缓存"""
+
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError) as e:
+                log.warning(f"引用缓存读取失败，重新建立: {e}")
+
+    def get(self, key: str):
+        entry = self._data.get(key)
+        if entry is None or time.time() - entry[0] > self.ttl:
+            return None
+        return entry[1], entry[2]
+
+    def put(self, key: str, citations, rcr):
+        with self._lock:
+            self._data[key] = [time.time(), citations, rcr]
+            self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            now = time.time()
+            self._data = {k: v for k, v in self._data.items() if now - v[0] <= self.ttl}
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+
+
+def _key(paper: Paper) -> str:
+    if paper.source == "pubmed":
+        return f"pmid:{paper.source_id}"
+    return f"doi:{paper.doi.lower()}" if paper.doi else ""
+
+
+def _fetch_icite(pmids: List[str]) -> dict:
+    from . import net  # 延迟导入 requests，不拖慢启动
+
+    resp = net.request("GET", ICITE_URL, {
+        "pmids": ",".join(pmids),
+        "fl": "pmid,citation_count,relative_citation_ratio",
+    }, kind="icite")
+    return {
+        f"pmid:{d['pmid']}": (d.get("citation_count"), d.get("relative_citation_ratio"))
+        for d in resp.json().get("data", [])
+    }
+
+
+def _fetch_crossref(dois: List[str]) -> dict:
+    from . import net
+
+    resp = net.request("GET", CROSSREF_URL, {
+        "filter": ",".join(f"doi:{d}" for d in dois),
+        "rows": len(dois),
+        "select": "DOI,is-referenced-by-count",
+    }, kind="crossref")
+    return {
+        f"doi:{item['DOI'].lower()}": (item.get("is-referenced-by-count"), None)
+        for item in resp.json().get("message", {}).get("items", [])
+    }
+
+
+def enrich_papers(papers: List[Paper], cfg_enrich: dict, cache: EnrichCache) -> int:
+    """为文献填充 citations / rcr，返回本次发出的请求数"""
+    pending_pmids, pending_dois = [], []
+    for p in papers:
+        key = _key(p)
+        if not key or cache.get(key) is not None:
+            continue
+        if p.source == "pubmed":
+            pending_pmids.append(p.source_id)
+        else:
+            pending_dois.append(p.doi)
+
+    batches = []
+    if cfg_enrich.get("icite", True):
+        batches += [("iCite", _fetch_icite, pending_pmids[i:i + ICITE_BATCH])
+                    for i in range(0, len(pending_pmids), ICITE_BATCH)]
+    if cfg_enrich.get("crossref", True):
+        batches += [("Crossref", _fetch_crossref, pending_dois[i:i + CROSSREF_BATCH])
+                    for i in range(0, len(pending_dois), CROSSREF_BATCH)]
+    max_requests = cfg_enrich.get("max_requests", 5)
+    if len(batches) > max_requests:
+        log.info(f"  引用查询需 {len(batches)} 次请求，超过上限 {max_requests}，其余跳过")
+        batches = batches[:max_requests]
+
+    for name, fetch, ids in batches:
+        try:
+            found = fetch(ids)
+        except Exception as e:
+            log.warning(f"  引用查询失败（{name}）: {e}")
+            continue
+        for key, (citations, rcr) in found.items():
+            cache.put(key, citations, rcr)
+        # 尚未收录的新文献也记一条空结果，TTL 内不再重复查询
+        prefix = "pmid:" if fetch is _fetch_icite else "doi:"
+        for i in ids:
+            key = prefix + i.lower()
+            if key not in found:
+                cache.put(key, None, None)
+
+    hits = 0
+    for p in papers:
+        key = _key(p)
+        entry = cache.get(key) if key else None
+        if entry is not None:
+            p.citations, p.rcr = entry
+            hits += entry[0] is not None
+    cache.save()
+    log.info(f"  引用数据: {hits}/{len(papers)} 篇，请求 {len(batches)} 次")
+    return len(batches)
+
+
+def sort_key(paper: Paper):
+    """按 RCR、被引次数从高到低；没有数据的排在最后"""
+    return (paper.rcr is None, -(paper.rcr or 0), paper.citations is None, -(paper.citations or 0))
@@ -24,7 +24,7 @@ def generate_highlights(llm: LLMProvider, papers: List[Paper]) -> str:
 请以Markdown列表格式输出，每篇用 - 开头，包含论文序号。"""
     try:
         log.info("生成本期亮点...")
-        return llm.call(prompt, max_tokens=1500)
+        return llm.call(prompt)
     except Exception as e:
         log.warning(f"生成亮点失败: {e}")
         return ""
@@ -1 +1,2 @@
-from .base import LLMProvider, get_provider
+from .base import LLMProvider, get_provider, provider_endpoint, llm_enabled, service_key, worker_pools
+from .router import LLMRouter, get_router, task_config
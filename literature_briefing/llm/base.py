@@ -1,6 +1,8 @@
 """LLM 提供商抽象基类 + 注册表"""
 
+import time
 import logging
+import threading
 from abc import ABC, abstractmethod
 
 log = logging.getLogger(__name__)
@@ -15,28 +17,128 @@ def register(name):
     return decorator
 
 
+class CallStats:
+    """调用计数、耗时与 token 用量（线程安全）"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float, tokens_in: int = 0, tokens_out: int = 0, error: bool = False):
+        with self._lock:
+            self.calls += 1
+            self.errors += error
+            self.seconds += seconds
+            self.tokens_in += tokens_in
+            self.tokens_out += tokens_out
+
+    def cost(self, price_in: float, price_out: float) -> float:
+        """按每百万 token 单价估算费用"""
+        return (self.tokens_in * price_in + self.tokens_out * price_out) / 1e6
+
+
 class LLMProvider(ABC):
-    def __init__(self, api_key: str, model: str, temperature: float = 0.1):
+    REQUIRES_KEY = True
+    concurrency = 0  # 建议的并发请求数，0 表示沿用 translation_workers
+
+    def __init__(self, api_key: str, model: str, temperature: float = 0.1,
+                 max_tokens: int = 2000):
         self.api_key = api_key
         self.model = model
         self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.stats = CallStats()
+
+    @classmethod
+    def from_config(cls, cfg_llm: dict) -> "LLMProvider":
+        return cls(
+            api_key=cfg_llm["api_key"],
+            model=cfg_llm["model"],
+            temperature=cfg_llm.get("temperature", 0.1),
+            max_tokens=cfg_llm.get("max_tokens", 2000),
+        )
+
+    @classmethod
+    def endpoint(cls, cfg_llm: dict) -> str:
+        return getattr(cls, "URL", "") or getattr(cls, "BASE_URL", "")
+
+    def call(self, prompt: str, system: str = "", max_tokens: int = None) -> str:
+        """调用模型并记录耗时与用量；max_tokens 为空时使用实例默认值"""
+        start = time.perf_counter()
+        try:
+            text, usage = self._call(prompt, system, max_tokens or self.max_tokens)
+        except Exception:
+            self.stats.add(time.perf_counter() - start, error=True)
+            raise
+        self.stats.add(time.perf_counter() - start, *usage)
+        return text
 
     @abstractmethod
-    def call(self, prompt: str, system: str = "", max_tokens: int = 2000) -> str:
+    def _call(self, prompt: str, system: str, max_tokens: int) -> tuple:
+        """返回 (回复文本, (输入 token 数, 输出 token 数))"""
         ...
 
+    def embed(self, texts: list, model: str) -> list:
+        """批量计算文本向量，返回与 texts 等长的向量列表；用量计入 stats"""
+        start = time.perf_counter()
+        try:
+            vectors, tokens_in = self._embed(texts, model)
+        except Exception:
+            self.stats.add(time.perf_counter() - start, error=True)
+            raise
+        self.stats.add(time.perf_counter() - start, tokens_in)
+        return vectors
 
-def get_provider(cfg_llm: dict) -> LLMProvider:
-    """根据配置实例化对应的 LLM 提供商"""
+    def _embed(self, texts: list, model: str) -> tuple:
+        """返回 (向量列表, 输入 token 数)；不支持 embedding 的提供商不覆盖"""
+        raise NotImplementedError(f"{type(self).__name__} 不支持 embedding")
+
+
+def _get_class(name: str):
     # 触发注册
-    from . import openrouter, openai_provider, gemini, claude  # noqa: F401
+    from . import openrouter, openai_provider, gemini, claude, openai_compatible  # noqa: F401
 
-    name = cfg_llm["provider"]
     if name not in _REGISTRY:
         raise ValueError(f"未知的 LLM 提供商: {name}，可选: {list(_REGISTRY.keys())}")
-    cls = _REGISTRY[name]
-    return cls(
-        api_key=cfg_llm["api_key"],
-        model=cfg_llm["model"],
-        temperature=cfg_llm.get("temperature", 0.1),
-    )
+    return _REGISTRY[name]
+
+
+def service_key(llm: LLMProvider) -> tuple:
+    """并发上限的归属：同一服务的多个实例（如标题、摘要各一个）共用一个上限"""
+    return type(llm).__name__, getattr(llm, "base_url", "")
+
+
+def worker_pools(providers, default: int) -> dict:
+    """按服务划分并发：{service_key: 线程数}
+
+    设置了 concurrency 的提供商（本地服务）按自身上限，其余沿用 default（translation_workers），
+    公共 API 不会因为另一个任务路由到本地服务而放大并发。
+    """
+    pools = {}
+    for llm in providers:
+        key = service_key(llm)
+        pools[key] = max(pools.get(key, 1), llm.concurrency or default)
+    return pools
+
+
+def provider_endpoint(cfg_llm: dict) -> str:
+    """返回提供商的 API 地址，用于启动前的连通性检查"""
+    return _get_class(cfg_llm["provider"]).endpoint(cfg_llm)
+
+
+def llm_enabled(cfg_llm: dict) -> bool:
+    """配置是否足以启用 LLM（本地服务可以不需要 API key）"""
+    try:
+        cls = _get_class(cfg_llm["provider"])
+    except ValueError:
+        return bool(cfg_llm.get("api_key"))
+    return bool(cfg_llm.get("api_key")) or not cls.REQUIRES_KEY
+
+
+def get_provider(cfg_llm: dict) -> LLMProvider:
+    """根据配置实例化对应的 LLM 提供商"""
+    return _get_class(cfg_llm["provider"]).from_config(cfg_llm)
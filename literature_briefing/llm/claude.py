@@ -1,6 +1,6 @@
 """Anthropic Claude 原生 API 提供商"""
 
-import requests
+from .. import net
 from .base import LLMProvider, register
 
 
@@ -8,7 +8,7 @@ from .base import LLMProvider, register
 class ClaudeProvider(LLMProvider):
     URL = "https://api.anthropic.com/v1/messages"
 
-    def call(self, prompt: str, system: str = "", max_tokens: int = 2000) -> str:
+    def _call(self, prompt: str, system: str, max_tokens: int) -> tuple:
         body = {
             "model": self.model,
             "max_tokens": max_tokens,
@@ -17,7 +17,7 @@ class ClaudeProvider(LLMProvider):
         if system:
             body["system"] = system
 
-        resp = requests.post(
+        resp = net.session().post(
             self.URL,
             headers={
                 "x-api-key": self.api_key,
@@ -28,4 +28,7 @@ class ClaudeProvider(LLMProvider):
             timeout=90,
         )
         resp.raise_for_status()
-        return resp.json()["content"][0]["text"].strip()
+        data = resp.json()
+        usage = data.get("usage") or {}
+        return (data["content"][0]["text"].strip(),
+                (usage.get("input_tokens", 0), usage.get("output_tokens", 0)))
@@ -1,6 +1,6 @@
 """Google Gemini 原生 API 提供商"""
 
-import requests
+from .. import net
 from .base import LLMProvider, register
 
 
@@ -8,7 +8,7 @@ from .base import LLMProvider, register
 class GeminiProvider(LLMProvider):
     BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
 
-    def call(self, prompt: str, system: str = "", max_tokens: int = 2000) -> str:
+    def _call(self, prompt: str, system: str, max_tokens: int) -> tuple:
         url = f"{self.BASE_URL}/{self.model}:generateContent?key={self.api_key}"
 
         contents = []
@@ -17,7 +17,7 @@ class GeminiProvider(LLMProvider):
             contents.append({"role": "model", "parts": [{"text": "好的，我会按照要求执行。"}]})
         contents.append({"role": "user", "parts": [{"text": prompt}]})
 
-        resp = requests.post(
+        resp = net.session().post(
             url,
             headers={"Content-Type": "application/json"},
             json={
@@ -31,4 +31,17 @@ class GeminiProvider(LLMProvider):
         )
         resp.raise_for_status()
         data = resp.json()
-        return data["candidates"][0]["content"]["parts"][0]["text"].strip()
+        usage = data.get("usageMetadata") or {}
+        return (data["candidates"][0]["content"]["parts"][0]["text"].strip(),
+                (usage.get("promptTokenCount", 0), usage.get("candidatesTokenCount", 0)))
+
+    def _embed(self, texts: list, model: str) -> tuple:
+        resp = net.session().post(
+            f"{self.BASE_URL}/{model}:batchEmbedContents?key={self.api_key}",
+            headers={"Content-Type": "application/json"},
+            json={"requests": [{"model": f"models/{model}", "content": {"parts": [{"text": t}]}}
+                               for t in texts]},
+            timeout=90,
+        )
+        resp.raise_for_status()
+        return [e["values"] for e in resp.json()["embeddings"]], 0
@@ -0,0 +1,127 @@
+"""OpenAI 兼容接口提供商：自建 vLLM / llama.cpp / Ollama 等本地服务
+
+配置（cfg["llm"]["openai_compatible"]）：
+    base_url      服务地址，如 http://127.0.0.1:8000/v1
+    auth_header   鉴权头名称，默认 Authorization；api_key 为空时不发送
+    auth_scheme   鉴权前缀，默认 Bearer；为空时直接发送 api_key
+    models        可选的模型列表，请求在其间轮流分配；为空时使用 model，
+                  model 也为空则取服务 /models 返回的第一个
+    concurrency   并发请求数；本地服务没有按次计费与限速，
+                  由服务端连续批处理，可以远高于公网 API
+    timeout       单次请求超时（秒）
+"""
+
+import time
+import itertools
+import threading
+
+from .. import net
+from .base import LLMProvider, register
+
+DEFAULTS = {
+    "base_url": "http://127.0.0.1:8000/v1",
+    "auth_header": "Authorization",
+    "auth_scheme": "Bearer",
+    "models": [],
+    "concurrency": 16,
+    "timeout": 300,
+}
+
+
+@register("openai_compatible")
+class OpenAICompatibleProvider(LLMProvider):
+    REQUIRES_KEY = False
+
+    def __init__(self, api_key: str, model: str, temperature: float = 0.1,
+                 max_tokens: int = 2000, options: dict = None):
+        super().__init__(api_key, model, temperature, max_tokens)
+        opts = dict(DEFAULTS, **(options or {}))
+        self.base_url = opts["base_url"].rstrip("/")
+        self.auth_header = opts["auth_header"]
+        self.auth_scheme = opts["auth_scheme"]
+        self.timeout = opts["timeout"]
+        self.concurrency = opts["concurrency"]
+        self.models = list(opts["models"])
+        self._models_cycle = None
+        self._lock = threading.Lock()
+        net.mount_pool(self.base_url, self.concurrency)
+
+    @classmethod
+    def from_config(cls, cfg_llm: dict) -> LLMProvider:
+        return cls(
+            api_key=cfg_llm.get("api_key", ""),
+            model=cfg_llm.get("model", ""),
+            temperature=cfg_llm.get("temperature", 0.1),
+            max_tokens=cfg_llm.get("max_tokens", 2000),
+            options=cfg_llm.get("openai_compatible"),
+        )
+
+    @classmethod
+    def endpoint(cls, cfg_llm: dict) -> str:
+        opts = dict(DEFAULTS, **(cfg_llm.get("openai_compatible") or {}))
+        return opts["base_url"].rstrip("/") + "/models"
+
+    def _headers(self) -> dict:
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            value = f"{self.auth_scheme} {self.api_key}" if self.auth_scheme else self.api_key
+            headers[self.auth_header] = value
+        return headers
+
+    def list_models(self, timeout: float = 10) -> list:
+        resp = net.session().get(f"{self.base_url}/models", headers=self._headers(), timeout=timeout)
+        resp.raise_for_status()
+        return [m["id"] for m in resp.json().get("data", [])]
+
+    def probe(self, timeout: float = 5) -> dict:
+        """健康检查：返回 {"ok", "latency", "models", "error"}"""
+        start = time.perf_counter()
+        try:
+            models = self.list_models(timeout)
+        except Exception as e:
+            return {"ok": False, "latency": time.perf_counter() - start, "models": [], "error": str(e)}
+        return {"ok": True, "latency": time.perf_counter() - start, "models": models, "error": ""}
+
+    def _next_model(self) -> str:
+        with self._lock:
+            if self._models_cycle is None:
+                models = self.models or ([self.model] if self.model else self.list_models()[:1])
+                if not models:
+                    raise RuntimeError(f"{self.base_url} 没有可用的模型")
+                self._models_cycle = itertools.cycle(models)
+            return next(self._models_cycle)
+
+    def _call(self, prompt: str, system: str, max_tokens: int) -> tuple:
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+
+        resp = net.session().post(
+            f"{self.base_url}/chat/completions",
+            headers=self._headers(),
+            json={
+                "model": self._next_model(),
+                "messages": messages,
+                "temperature": self.temperature,
+                "max_tokens": max_tokens,
+            },
+            timeout=self.timeout,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        usage = data.get("usage") or {}
+        return (data["choices"][0]["message"]["content"].strip(),
+                (usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)))
+
+    def _embed(self, texts: list, model: str) -> tuple:
+        resp = net.session().post(
+            f"{self.base_url}/embeddings",
+            headers=self._headers(),
+            json={"model": model or self._next_model(), "input": texts},
+            timeout=self.timeout,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        vectors = [d["embedding"] for d in sorted(data["data"], key=lambda d: d.get("index", 0))]
+        return vectors, (data.get("usage") or {}).get("prompt_tokens", 0)
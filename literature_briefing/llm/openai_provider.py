@@ -1,20 +1,21 @@
 """OpenAI 直连提供商"""
 
-import requests
+from .. import net
 from .base import LLMProvider, register
 
 
 @register("openai")
 class OpenAIProvider(LLMProvider):
     URL = "https://api.openai.com/v1/chat/completions"
+    EMBED_URL = "https://api.openai.com/v1/embeddings"
 
-    def call(self, prompt: str, system: str = "", max_tokens: int = 2000) -> str:
+    def _call(self, prompt: str, system: str, max_tokens: int) -> tuple:
         messages = []
         if system:
             messages.append({"role": "system", "content": system})
         messages.append({"role": "user", "content": prompt})
 
-        resp = requests.post(
+        resp = net.session().post(
             self.URL,
             headers={
                 "Authorization": f"Bearer {self.api_key}",
@@ -29,4 +30,19 @@ class OpenAIProvider(LLMProvider):
             timeout=90,
         )
         resp.raise_for_status()
-        return resp.json()["choices"][0]["message"]["content"].strip()
+        data = resp.json()
+        usage = data.get("usage") or {}
+        return (data["choices"][0]["message"]["content"].strip(),
+                (usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)))
+
+    def _embed(self, texts: list, model: str) -> tuple:
+        resp = net.session().post(
+            self.EMBED_URL,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={"model": model, "input": texts},
+            timeout=90,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        vectors = [d["embedding"] for d in sorted(data["data"], key=lambda d: d["index"])]
+        return vectors, (data.get("usage") or {}).get("prompt_tokens", 0)
@@ -1,6 +1,6 @@
 """OpenRouter 提供商（OpenAI 兼容格式）"""
 
-import requests
+from .. import net
 from .base import LLMProvider, register
 
 
@@ -8,13 +8,13 @@ from .base import LLMProvider, register
 class OpenRouterProvider(LLMProvider):
     URL = "https://openrouter.ai/api/v1/chat/completions"
 
-    def call(self, prompt: str, system: str = "", max_tokens: int = 2000) -> str:
+    def _call(self, prompt: str, system: str, max_tokens: int) -> tuple:
         messages = []
         if system:
             messages.append({"role": "system", "content": system})
         messages.append({"role": "user", "content": prompt})
 
-        resp = requests.post(
+        resp = net.session().post(
             self.URL,
             headers={
                 "Authorization": f"Bearer {self.api_key}",
@@ -29,4 +29,7 @@ class OpenRouterProvider(LLMProvider):
             timeout=90,
         )
         resp.raise_for_status()
-        return resp.json()["choices"][0]["message"]["content"].strip()
+        data = resp.json()
+        usage = data.get("usage") or {}
+        return (data["choices"][0]["message"]["content"].strip(),
+                (usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)))
@@ -0,0 +1,99 @@
+"""按任务路由模型：标题翻译、摘要翻译、亮点生成可分别使用不同的提供商/模型
+
+cfg["llm"]["tasks"] 中每个任务可覆盖 provider / api_key / model / temperature /
+max_tokens，以及估算费用用的 price_in / price_out（美元/百万 token）；
+未覆盖的字段沿用 cfg["llm"] 本身。例如：
+
+    "tasks": {
+        "title": {"model": "google/gemini-2.0-flash-lite-001", "max_tokens": 200},
+        "highlights": {"provider": "claude", "model": "claude-sonnet-4-5"}
+    }
+"""
+
+import logging
+
+from .base import LLMProvider, get_provider
+
+log = logging.getLogger(__name__)
+
+TASKS = ("title", "abstract", "highlights")
+
+# 各任务的默认输出上限；标题很短，不需要 2000 token 的额度
+TASK_DEFAULTS = {
+    "title": {"max_tokens": 300},
+    "abstract": {"max_tokens": 2000},
+    "highlights": {"max_tokens": 1500},
+}
+
+
+def task_config(cfg_llm: dict, task: str) -> dict:
+    """合并基础 LLM 配置与任务覆盖项"""
+    merged = {k: v for k, v in cfg_llm.items() if k != "tasks"}
+    merged.update(TASK_DEFAULTS.get(task, {}))
+    override = (cfg_llm.get("tasks") or {}).get(task) or {}
+    if override.get("provider", merged["provider"]) != merged["provider"]:
+        merged["api_key"] = ""  # 换了提供商就不能沿用基础配置的 key
+    merged.update(override)
+    return merged
+
+
+class LLMRouter:
+    """每个任务一个提供商实例，各自统计耗时、token 与费用"""
+
+    def __init__(self, cfg_llm: dict):
+        self.cfgs = {task: task_config(cfg_llm, task) for task in TASKS}
+        self.providers = {}
+        by_model = {}
+        for task, cfg in self.cfgs.items():
+            # 即使配置相同也各建一个实例，统计才能按任务分开
+            self.providers[task] = get_provider(cfg)
+            by_model.setdefault((cfg["provider"], cfg["model"]), []).append(task)
+        for (provider, model), tasks in by_model.items():
+            log.info(f"LLM {provider}/{model}: {', '.join(tasks)}")
+
+    def for_task(self, task: str) -> LLMProvider:
+        return self.providers[task]
+
+    def probe(self):
+        """对支持健康检查的提供商（本地服务）探测延迟与可用模型并写入日志"""
+        probed = set()
+        for llm in self.providers.values():
+            url = getattr(llm, "base_url", "")
+            if not hasattr(llm, "probe") or url in probed:
+                continue
+            probed.add(url)
+            r = llm.probe()
+            if r["ok"]:
+                log.info(f"模型服务 {url} 正常，延迟 {r['latency'] * 1000:.0f} ms，"
+                         f"模型: {', '.join(r['models']) or '-'}")
+            else:
+                log.warning(f"模型服务 {url} 不可用: {r['error']}")
+
+    def report(self) -> dict:
+        """各任务的调用次数、平均延迟、token 用量与估算费用"""
+        result = {}
+        for task, llm in self.providers.items():
+            st, cfg = llm.stats, self.cfgs[task]
+            priced = "price_in" in cfg or "price_out" in cfg
+            result[task] = {
+                "model": f"{cfg['provider']}/{cfg['model']}",
+                "calls": st.calls,
+                "errors": st.errors,
+                "avg_latency": st.seconds / st.calls if st.calls else 0.0,
+                "tokens_in": st.tokens_in,
+                "tokens_out": st.tokens_out,
+                "cost": st.cost(cfg.get("price_in", 0), cfg.get("price_out", 0)) if priced else None,
+            }
+        return result
+
+    def log_report(self):
+        for task, r in self.report().items():
+            if not r["calls"]:
+                continue
+            cost = f"，约 ${r['cost']:.4f}" if r["cost"] is not None else ""
+            log.info(f"  [{task}] {r['model']}: {r['calls']} 次（失败 {r['errors']}），"
+                     f"平均 {r['avg_latency']:.2f}s，token {r['tokens_in']}→{r['tokens_out']}{cost}")
+
+
+def get_router(cfg_llm: dict) -> LLMRouter:
+    return LLMRouter(cfg_llm)
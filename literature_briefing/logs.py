@@ -0,0 +1,122 @@
+"""日志：队列异步写盘、按大小/时间轮转、可选 JSON Lines 与运行 ID
+
+所有线程只把记录放进内存队列（QueueHandler），由单独的 QueueListener
+线程写文件和控制台，翻译等并发任务不会阻塞在磁盘 I/O 上。
+每次 run_profile 分配一个运行 ID，写入每条日志的 run_id 字段，
+常驻模式下多次运行的日志可以据此拆分。
+"""
+
+import sys
+import json
+import uuid
+import queue
+import atexit
+import logging
+import logging.handlers
+from datetime import datetime
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] [%(run_id)s] %(message)s"
+
+_run_id = "-"
+_listener = None
+
+
+def new_run_id() -> str:
+    """开始新的运行并返回其 ID；同一进程内的简报运行是串行的，工作线程共享该 ID"""
+    global _run_id
+    _run_id = uuid.uuid4().hex[:8]
+    return _run_id
+
+
+def end_run():
+    global _run_id
+    _run_id = "-"
+
+
+class RunIdFilter(logging.Filter):
+    def filter(self, record):
+        if not hasattr(record, "run_id"):
+            record.run_id = _run_id
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """每条记录一行 JSON（异常堆栈已由 QueueHandler 并入 msg）"""
+
+    def format(self, record):
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "run_id": getattr(record, "run_id", "-"),
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        return json.dumps(data, ensure_ascii=False)
+
+
+def _file_handler(path: str, log_cfg: dict) -> logging.Handler:
+    backups = log_cfg.get("backup_count", 5)
+    when = log_cfg.get("rotate_when", "")
+    if when:
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=when, backupCount=backups, encoding="utf-8")
+    return logging.handlers.RotatingFileHandler(
+        path, maxBytes=log_cfg.get("max_bytes", 5 * 1024 * 1024),
+        backupCount=backups, encoding="utf-8")
+
+
+def setup_logging(path: str = None, log_cfg: dict = None):
+    """配置根日志；可重复调用（读到配置后按配置重建处理器）
+
+    path 为空时只输出到控制台，用于读取配置之前，避免日志文件里混入两种格式。
+
+    log_cfg: 配置中的 "logging" 段
+        format        "text" 或 "json"（仅影响日志文件，控制台始终为文本）
+        max_bytes     单个日志文件上限，超出后轮转
+        rotate_when   非空时改为按时间轮转，取值同 TimedRotatingFileHandler（如 "midnight"）
+        backup_count  保留的旧日志个数
+        level         日志级别
+    """
+    global _listener
+    log_cfg = log_cfg or {}
+    shutdown_logging()
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    handlers = [stream_handler]
+    if path:
+        file_handler = _file_handler(path, log_cfg)
+        if log_cfg.get("format", "text") == "json":
+            file_handler.setFormatter(JsonFormatter())
+        else:
+            file_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(file_handler)
+
+    q = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(q)
+    # run_id 必须在产生记录的线程里取值，过滤器挂在 QueueHandler 上
+    queue_handler.addFilter(RunIdFilter())
+
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+        h.close()
+    root.addHandler(queue_handler)
+    root.setLevel(log_cfg.get("level", "INFO"))
+
+    _listener = logging.handlers.QueueListener(q, *handlers)
+    _listener.start()
+
+
+def shutdown_logging():
+    """停止后台写日志线程，队列中剩余的记录会先写完"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for h in _listener.handlers:
+            h.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
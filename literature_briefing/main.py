@@ -3,50 +3,104 @@
 import os
 import sys
 import json
-import socket
+import time
+import threading
+import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-from .config import load_config, save_config, get_env_fallback, SCRIPT_DIR
-from .llm import get_provider
-from .sources.pubmed import PubMedSource
-from .sources.arxiv import ArxivSource
+from .config import load_config, save_config, get_env_fallback, SCRIPT_DIR, CONFIG_PATH
+from .llm import get_router, provider_endpoint, task_config, llm_enabled
+from .sources.base import FetchCache, fetch_all, get_source_class
 from .translator import translate_papers
 from .highlights import generate_highlights
-from .output import generate_markdown
-from .notify import notify_start, notify_done
+from .output import generate_markdown, generate_meta
+from .progress import Progress
+from .pipeline import Stage, run_stages
+from .enrich import EnrichCache, enrich_papers, sort_key as impact_sort_key
+from .logs import setup_logging, new_run_id, end_run
+from . import archive
+
+# 文献源（依赖 requests）与弹窗（依赖 tkinter）均在用到时才导入，加快无界面启动
 
 STATE_FILE = "last_fetch_state.json"
+HTTP_CACHE_DIR = os.path.join(SCRIPT_DIR, "http_cache")
+BACKFILL_FILE = "backfill_shards.json"
+ENRICH_CACHE_FILE = os.path.join(SCRIPT_DIR, "enrich_cache.json")
+EMBED_CACHE_FILE = os.path.join(SCRIPT_DIR, "embed_cache.npz")
 LOG_FILE = os.path.join(SCRIPT_DIR, "briefing.log")
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding="utf-8"),
-        logging.StreamHandler(),
-    ],
-)
 log = logging.getLogger(__name__)
 
 
-def check_internet(timeout=5):
-    try:
-        socket.create_connection(("8.8.8.8", 53), timeout=timeout)
-        return True
-    except OSError:
-        return False
+def configure_http_cache(cfg: dict, mode: str = None):
+    """按配置设置文献源的磁盘 HTTP 缓存（进程级，多配置时以第一个为准）"""
+    from . import net
+    cache_cfg = cfg.get("http_cache", {})
+    net.configure_cache(cache_cfg.get("dir") or HTTP_CACHE_DIR,
+                        mode or cache_cfg.get("mode", "normal"),
+                        cache_cfg.get("ttl"))
+
+
+def _endpoints(cfgs: list) -> dict:
+    """收集所有配置实际会访问的地址：url -> 是否为文献源"""
+    urls = {}
+    for cfg in cfgs:
+        for name, cfg_source in cfg["sources"].items():
+            if cfg_source.get("enabled"):
+                try:
+                    urls[get_source_class(name).ENDPOINT] = True
+                except ValueError:
+                    pass
+        if llm_enabled(cfg["llm"]):
+            for task in [None] + list(cfg["llm"].get("tasks") or {}):
+                try:
+                    cfg_llm = task_config(cfg["llm"], task) if task else cfg["llm"]
+                    urls.setdefault(provider_endpoint(cfg_llm), False)
+                except ValueError:
+                    pass
+    return urls
+
+
+def preflight(urls, timeout=5) -> dict:
+    """并行探测各地址是否可达（遵循系统代理设置），任何 HTTP 响应都视为可达"""
+    import requests
+    from . import net
+
+    def _probe(url):
+        try:
+            net.session().head(url, timeout=timeout, allow_redirects=False)
+            return True
+        except requests.RequestException:
+            return False
+
+    urls = list(urls)
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        return dict(zip(urls, pool.map(_probe, urls)))
 
 
 def _get_state_path(cfg):
     return os.path.join(cfg["output_path"], cfg["output_folder"], STATE_FILE)
 
 
+# 状态文件的内存索引：path -> (mtime, state)，文件未变化时不再重复读取
+_STATE_CACHE = {}
+
+
 def _load_state(cfg):
     path = _get_state_path(cfg)
     if os.path.exists(path):
+        mtime = os.path.getmtime(path)
+        cached = _STATE_CACHE.get(path)
+        if cached and cached[0] == mtime:
+            return json.loads(json.dumps(cached[1]))
         with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+            state = json.load(f)
+        _STATE_CACHE[path] = (mtime, state)
+        return json.loads(json.dumps(state))
     return {"last_fetch": None, "seen_ids": []}
 
 
@@ -54,97 +108,324 @@ def _save_state(cfg, state):
     path = _get_state_path(cfg)
     with open(path, "w", encoding="utf-8") as f:
         json.dump(state, f, ensure_ascii=False, indent=2)
+    _STATE_CACHE[path] = (os.path.getmtime(path), state)
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="literature_briefing", description="文献简报生成器")
+    parser.add_argument("command", nargs="?", choices=["run", "serve", "api"], default="run",
+                        help="run: 运行一次（默认）；serve: 常驻后台按计划运行；api: 仅启动简报只读接口")
+    parser.add_argument("--config", action="append", default=[], metavar="PATH",
+                        help="配置文件路径，可重复指定以在同一进程中运行多个配置")
+    parser.add_argument("--no-notify", action="store_true", help="不显示弹窗")
+    parser.add_argument("--cache-mode", choices=["normal", "record", "replay", "off"],
+                        help="覆盖配置中的 HTTP 缓存模式；replay 可完全离线复现一次运行")
+    parser.add_argument("--backfill", type=int, metavar="DAYS",
+                        help="回填最近 DAYS 天的 PubMed 文献：按日期分片检索全部结果，可中断续跑")
+    parser.add_argument("--plan", action="store_true",
+                        help="只估算本次运行的请求数、token、费用与耗时，不下载摘要、不调用 LLM")
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def _date_range(cfg: dict, state: dict, backfill_days: int = None) -> tuple:
+    """本次检索的 (date_from, date_to)：回填天数 > 上次运行日期 > 默认回溯天数"""
+    if backfill_days:
+        date_from = (datetime.now() - timedelta(days=backfill_days)).strftime("%Y/%m/%d")
+    elif state["last_fetch"]:
+        date_from = state["last_fetch"]
+    else:
+        date_from = (datetime.now() - timedelta(days=cfg["default_lookback_days"])).strftime("%Y/%m/%d")
+    return date_from, datetime.now().strftime("%Y/%m/%d")
 
 
-def main():
-    log.info("=" * 40)
-    log.info("文献简报生成器启动")
-
-    cfg = get_env_fallback(load_config())
-
-    if not check_internet():
-        log.error("无法连接互联网，退出。")
-        sys.exit(1)
-    log.info("网络连接正常")
-
-    # 弹窗确认
-    no_notify = "--no-notify" in sys.argv
-    if not no_notify and not notify_start(cfg["schedule"]):
-        log.info("用户取消了检索。")
-        sys.exit(0)
+def plan(cfg: dict, backfill_days: int = None) -> dict:
+    """--plan：估算本配置下一次运行的规模，不下载摘要、不调用 LLM"""
+    from .planner import plan_profile, format_plan
+    from .sources.pubmed import ShardCheckpoint
 
+    output_dir = os.path.join(cfg["output_path"], cfg["output_folder"])
+    state = _load_state(cfg)
+    date_from, date_to = _date_range(cfg, state, backfill_days)
+    options = {}
+    if backfill_days:
+        checkpoint = ShardCheckpoint(os.path.join(output_dir, BACKFILL_FILE))
+        date_from, date_to = checkpoint.saved_range(backfill_days) or (date_from, date_to)
+        options["pubmed"] = {"backfill": checkpoint}
+    result = plan_profile(cfg, date_from, date_to,
+                          watermarks={} if backfill_days else state.get("watermarks", {}),
+                          options=options)
+    for line in format_plan(result):
+        log.info(line)
+    return result
+
+
+def run_profile(cfg: dict, cache: FetchCache, translations: dict,
+                backfill_days: int = None, progress: Progress = None) -> tuple:
+    """为单个配置检索、翻译并生成简报，返回 (文献数, 简报路径)
+
+    cache / translations 在多配置之间共享，相同文献只下载、翻译一次；
+    seen 状态仍按各配置的输出目录分别保存。
+    backfill_days 非空时进入回填模式，PubMed 不受 max_results 限制。
+    progress 接收各阶段进度事件；取消后在下一个检查点抛出 RunCancelled，
+    不写简报也不更新 seen 状态。
+    每次调用分配新的运行 ID，期间的日志都带上该 ID。
+    """
+    progress = progress or Progress()
+    new_run_id()
+    try:
+        return _run_profile(cfg, cache, translations, backfill_days, progress)
+    finally:
+        end_run()
+
+
+def prefetch(cfgs: list, cache: FetchCache) -> threading.Thread:
+    """弹窗等待期间在后台预先检索各配置，结果只写入 cache
+
+    不保存 seen 状态与水位线（使用副本）；用户取消时直接丢弃，
+    确认开始后 run_profile 以相同参数检索，命中 cache 而不再发请求。
+    """
+    def _run():
+        start = time.perf_counter()
+        for cfg in cfgs:
+            state = _load_state(cfg)
+            seen_ids = set(state.get("seen_ids", []) + state.get("seen_pmids", []))
+            date_from, date_to = _date_range(cfg, state)
+            try:
+                fetch_all(cfg["sources"], date_from, date_to, cfg["max_results"], seen_ids,
+                          cache=cache, watermarks=dict(state.get("watermarks", {})))
+            except Exception as e:
+                log.warning(f"预取失败，将在确认后重新检索: {e}")
+        log.info(f"预取完成，用时 {time.perf_counter() - start:.1f}s，"
+                 f"缓存 {len(cache.papers)} 篇文献")
+
+    t = threading.Thread(target=_run, daemon=True, name="prefetch")
+    t.start()
+    return t
+
+
+def _run_profile(cfg, cache, translations, backfill_days, progress):
     output_dir = os.path.join(cfg["output_path"], cfg["output_folder"])
     os.makedirs(output_dir, exist_ok=True)
 
     state = _load_state(cfg)
     seen_ids = set(state.get("seen_ids", []) + state.get("seen_pmids", []))
 
-    if state["last_fetch"]:
-        date_from = state["last_fetch"]
-    else:
-        date_from = (datetime.now() - timedelta(days=cfg["default_lookback_days"])).strftime("%Y/%m/%d")
-    date_to = datetime.now().strftime("%Y/%m/%d")
+    from .sources.pubmed import ShardCheckpoint
+
+    checkpoint = None
+    date_from, date_to = _date_range(cfg, state, backfill_days)
+    if backfill_days:
+        checkpoint = ShardCheckpoint(os.path.join(output_dir, BACKFILL_FILE))
+        saved = checkpoint.saved_range(backfill_days)
+        if saved:
+            # 沿用最初的日期范围，隔天续跑时分片窗口不变
+            date_from, date_to = saved
+            log.info(f"继续未完成的回填，已完成分片 {len(checkpoint)} 个")
+        else:
+            checkpoint.begin(backfill_days, date_from, date_to)
     log.info(f"检索范围: {date_from} ~ {date_to}")
 
     # 初始化 LLM
     llm = None
-    if cfg["llm"]["api_key"]:
+    if llm_enabled(cfg["llm"]):
         try:
-            llm = get_provider(cfg["llm"])
+            llm = get_router(cfg["llm"])
+            llm.probe()
         except Exception as e:
             log.warning(f"LLM 初始化失败: {e}")
 
-    # 收集所有文献
-    papers_by_source = {}
-    all_papers = []
-    new_ids = []
-
-    # PubMed
-    if cfg["sources"]["pubmed"]["enabled"]:
-        pm = PubMedSource(cfg["sources"]["pubmed"])
-        pm_papers = pm.search(date_from, date_to, cfg["max_results"], seen_ids)
-        core = [p for p in pm_papers if "core" in p.categories]
-        extended = [p for p in pm_papers if "extended" in p.categories]
-        papers_by_source["pubmed"] = {"core": core, "extended": extended}
-        all_papers.extend(pm_papers)
-        new_ids.extend(p.source_id for p in pm_papers)
-
-    # arXiv
-    if cfg["sources"]["arxiv"]["enabled"]:
-        ax = ArxivSource(cfg["sources"]["arxiv"])
-        ax_papers = ax.search(date_from, date_to, cfg["max_results"], seen_ids)
-        papers_by_source["arxiv"] = ax_papers
-        all_papers.extend(ax_papers)
-        new_ids.extend(p.source_id for p in ax_papers)
-
-    total = len(all_papers)
-    log.info(f"共获取 {total} 篇文献")
-
-    # 翻译
-    if llm and cfg["llm"].get("enable_translation", True) and all_papers:
+    # 各文献源的增量水位线；回填时忽略旧值，按指定范围完整检索
+    watermarks = {} if backfill_days else dict(state.get("watermarks", {}))
+    llm_cfg = cfg["llm"]
+
+    def fetch(ctx):
+        progress.stage("fetch", total=sum(1 for c in cfg["sources"].values() if c.get("enabled")))
+        failed = {}
+        results = fetch_all(cfg["sources"], date_from, date_to, cfg["max_results"], seen_ids,
+                            cache=cache, options={"pubmed": {"backfill": checkpoint}},
+                            watermarks=watermarks, failed=failed)
+        if failed:
+            log.warning("未完成的文献源: " + "，".join(f"{k}（{v}）" for k, v in failed.items()))
+        all_papers = []
+        for name, papers in results.items():
+            all_papers.extend(papers)
+            progress.advance(source=name, papers=len(papers))
+        log.info(f"共获取 {len(all_papers)} 篇文献")
+        return {"results": results, "papers": all_papers, "failed": failed}
+
+    def enrich(ctx):
+        # 引用补充（可选）：批量查询，结果用于排序与渲染
+        cfg_enrich = cfg.get("enrich", {})
+        if not (cfg_enrich.get("enabled") and ctx["papers"]):
+            return {"enriched": False}
+        enrich_papers(ctx["papers"], cfg_enrich,
+                      EnrichCache(ENRICH_CACHE_FILE, cfg_enrich.get("ttl_hours", 24) * 3600))
+        if cfg_enrich.get("sort_by_impact"):
+            for papers in ctx["results"].values():
+                papers.sort(key=impact_sort_key)
+        return {"enriched": True}
+
+    def translate(ctx):
+        if not (llm and llm_cfg.get("enable_translation", True) and ctx["papers"]):
+            return {"translated": False}
         log.info("翻译文献...")
-        translate_papers(llm, all_papers)
-
-    # 亮点
-    highlights = ""
-    if llm and cfg["llm"].get("enable_highlights", True) and all_papers:
-        highlights = generate_highlights(llm, all_papers)
+        translate_papers(llm.for_task("abstract"), ctx["papers"], cache=translations,
+                         chunk_chars=llm_cfg.get("abstract_chunk_chars", 1000),
+                         workers=llm_cfg.get("translation_workers", 4),
+                         progress=progress, title_llm=llm.for_task("title"),
+                         languages=llm_cfg.get("target_languages") or ["zh"])
+        return {"translated": True}
+
+    def highlights(ctx):
+        # 只用英文标题与期刊名，与翻译并发执行
+        if not (llm and llm_cfg.get("enable_highlights", True) and ctx["papers"]):
+            return {"highlights": ""}
+        return {"highlights": generate_highlights(llm.for_task("highlights"), ctx["papers"])}
+
+    def cluster(ctx):
+        # 只用英文标题与摘要，与翻译并发执行
+        cfg_cluster = cfg.get("cluster", {})
+        if not cfg_cluster.get("enabled"):
+            return {"topics": None}
+        from .cluster import cluster_papers  # 延迟导入 numpy，未启用时不加载
+        return {"topics": cluster_papers(ctx["papers"], cfg_cluster, llm_cfg, EMBED_CACHE_FILE)}
+
+    def output(ctx):
+        progress.stage("output", total=1)
+        papers_by_source = {name: get_source_class(name).group(papers)
+                            for name, papers in ctx["results"].items()}
+        topics = ctx["topics"]
+        if topics and cfg.get("enrich", {}).get("sort_by_impact") and ctx["enriched"]:
+            topics = [(label, sorted(ps, key=impact_sort_key)) for label, ps in topics]
+        # 每种目标语言一份简报：中文沿用原文件名，其他语言加语言后缀；返回第一种语言的路径
+        stem = os.path.join(output_dir, f"文献简报_{datetime.now().strftime('%Y%m%d_%H%M')}")
+        paths = []
+        for lang in llm_cfg.get("target_languages") or ["zh"]:
+            path = stem + (".md" if lang == "zh" else f".{lang}.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(generate_markdown(papers_by_source, date_from, date_to, ctx["highlights"],
+                                          topics=topics, lang=lang))
+            paths.append(path)
+        filepath = paths[0]
+        archive.dump(stem + ".lbp", ctx["papers"],
+                     generate_meta(date_from, date_to, ctx["highlights"],
+                                   llm.report() if llm else None))
+        log.info(f"简报已保存: {', '.join(paths)}")
+        return {"filepath": filepath}
+
+    ctx = {}
+    timings = run_stages([
+        Stage("fetch", fetch, outputs=("results", "papers", "failed")),
+        Stage("enrich", enrich, inputs=("results", "papers"), outputs=("enriched",),
+              fallback={"enriched": False}),
+        Stage("translate", translate, inputs=("papers",), outputs=("translated",),
+              fallback={"translated": False}),
+        Stage("highlights", highlights, inputs=("papers",), outputs=("highlights",),
+              fallback={"highlights": ""}),
+        Stage("cluster", cluster, inputs=("papers",), outputs=("topics",),
+              fallback={"topics": None}),
+        Stage("output", output,
+              inputs=("results", "papers", "enriched", "translated", "highlights", "topics"),
+              outputs=("filepath",)),
+    ], ctx, check=progress.check)
+    log.info("阶段耗时: " + ", ".join(f"{k} {v:.1f}s" for k, v in timings.items()))
+    all_papers, filepath = ctx["papers"], ctx["filepath"]
+    total = len(all_papers)
 
-    # 生成 Markdown
-    markdown = generate_markdown(papers_by_source, date_from, date_to, highlights)
-    filename = f"文献简报_{datetime.now().strftime('%Y%m%d_%H%M')}.md"
-    filepath = os.path.join(output_dir, filename)
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(markdown)
-    log.info(f"简报已保存: {filepath}")
+    # 回填时 PubMed 失败（fetch_all 只记录日志并跳过）：保留分片进度与上次运行日期，下次续跑
+    backfill_failed = checkpoint is not None and "pubmed" in ctx["failed"]
+    if backfill_failed:
+        log.warning(f"PubMed 回填未完成，已保留进度（{len(checkpoint)} 个分片），可重新运行续跑")
 
     # 更新状态
+    new_ids = [p.source_id for p in all_papers]
     new_seen = list(seen_ids | set(new_ids))[-5000:]
-    _save_state(cfg, {"last_fetch": datetime.now().strftime("%Y/%m/%d"), "seen_ids": new_seen})
+    last_fetch = state["last_fetch"] if backfill_failed else datetime.now().strftime("%Y/%m/%d")
+    _save_state(cfg, {"last_fetch": last_fetch, "seen_ids": new_seen,
+                      "watermarks": dict(state.get("watermarks", {}), **watermarks)})
+    if checkpoint is not None and not backfill_failed:
+        checkpoint.clear()
+    if llm:
+        log.info("LLM 用量:")
+        llm.log_report()
     log.info(f"完成！共 {total} 篇新文献。")
+    progress.finish(papers=total, path=filepath)
+    return total, filepath
+
+
+def main(config_paths: list = None):
+    """运行简报。config_paths 为多个配置文件路径时，共享下载与翻译，各自输出简报"""
+    setup_logging()
+
+    args = _parse_args(sys.argv[1:])
+    config_paths = config_paths or args.config or [None]
+    if args.command == "serve":
+        from .daemon import serve
+        serve(config_paths)
+        return
+    if args.command == "api":
+        from .api import serve_api
+        cfg = get_env_fallback(load_config(config_paths[0]))
+        setup_logging(LOG_FILE, cfg.get("logging"))
+        serve_api(cfg)
+        return
+    cfgs = [get_env_fallback(load_config(p)) for p in config_paths]
+    setup_logging(LOG_FILE, cfgs[0].get("logging"))
+    log.info("=" * 40)
+    log.info("文献简报生成器启动")
+
+    state_paths = [_get_state_path(c) for c in cfgs]
+    if len(set(state_paths)) < len(state_paths):
+        log.warning("多个配置使用了相同的输出目录，seen 状态会相互覆盖")
+
+    configure_http_cache(cfgs[0], args.cache_mode)
+    if args.plan:
+        for cfg in cfgs:
+            plan(cfg, args.backfill)
+        return
+    if args.cache_mode != "replay":
+        endpoints = _endpoints(cfgs)
+        reachable = preflight(endpoints)
+        for url, ok in reachable.items():
+            if not ok:
+                log.warning(f"无法访问: {url}")
+        if any(endpoints.values()) and not any(reachable[u] for u, is_src in endpoints.items() if is_src):
+            log.error("所有文献源均无法访问，退出。")
+            sys.exit(1)
+        log.info("网络连接正常")
+
+    # 弹窗确认；等待期间预取（回填会写断点文件，不预取）
+    no_notify = args.no_notify
+    cache = FetchCache()
+    if not no_notify:
+        from .notify import notify_start, notify_done
+        cfg_schedule = cfgs[0]["schedule"]
+        prefetcher = None
+        if cfg_schedule.get("show_popup", True) and cfg_schedule.get("prefetch", True) \
+                and not args.backfill:
+            prefetcher = prefetch(cfgs, cache)
+        if not notify_start(cfg_schedule):
+            log.info("用户取消了检索。")
+            sys.exit(0)
+        if prefetcher is not None and prefetcher.is_alive():
+            log.info("等待预取完成...")
+            prefetcher.join()
+
+    translations = {}
+    results = []
+    for idx, (path, cfg) in enumerate(zip(config_paths, cfgs)):
+        if len(cfgs) > 1:
+            log.info(f"--- 配置 [{idx + 1}/{len(cfgs)}] {path or CONFIG_PATH} ---")
+        results.append(run_profile(cfg, cache, translations, backfill_days=args.backfill))
+
+    if len(cfgs) > 1:
+        log.info(f"全部完成：{len(cfgs)} 个配置，共下载 {len(cache.papers)} 篇不重复文献，"
+                 f"翻译 {len(translations)} 篇")
 
     if not no_notify:
-        notify_done(total, filepath)
+        for total, filepath in results:
+            notify_done(total, filepath)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,229 @@
+"""共享 HTTP 连接池 + 磁盘响应缓存
+
+所有文献源与 LLM 提供商通过同一个 requests.Session 发请求，
+复用 TCP/TLS 连接；常驻模式下连接在多次运行之间保持。
+
+文献源的请求经 request() 走磁盘缓存：键为规范化后的请求参数（不含 api_key），
+正文 zlib 压缩存储，按请求类别设置 TTL，过期后带 ETag/Last-Modified 重新验证。
+缓存模式：
+  normal  命中且未过期直接使用，否则请求并写入（默认）
+  record  总是请求并写入，用于录制可重放的一次运行
+  replay  只读缓存，缺失即报错，可完全离线复现
+  off     不使用缓存
+normal 模式下，超过最长 TTL 的 PRUNE_FACTOR 倍仍未写入或重新验证的条目视为废弃，
+在 configure_cache 时和常驻模式每次运行后清理，缓存目录不会无限增长。
+"""
+
+import os
+import json
+import time
+import zlib
+import hashlib
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+log = logging.getLogger(__name__)
+
+POOL_SIZE = 16
+
+# 各类请求的默认 TTL（秒）
+DEFAULT_TTL = {
+    "esearch": 3600,
+    "efetch": 7 * 86400,
+    "arxiv": 3600,
+    "icite": 86400,
+    "crossref": 86400,
+}
+# 条目修改时间早于 最长 TTL × PRUNE_FACTOR 时删除（重新验证会刷新修改时间）
+PRUNE_FACTOR = 4
+# 参与缓存键计算时忽略的参数
+_IGNORED_PARAMS = {"api_key"}
+
+_session = None
+_pools = {}  # 单独挂载的连接池：地址前缀 -> 大小
+_lock = threading.Lock()
+_cache = {"dir": "", "mode": "off", "ttl": dict(DEFAULT_TTL)}
+
+
+def session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+class RateLimiter:
+    """线程安全的最小请求间隔控制（NCBI：无 key 3 次/秒，有 key 10 次/秒；arXiv：3 秒 1 次）"""
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def mount_pool(prefix: str, size: int):
+    """为某个地址前缀单独配置连接池大小（如高并发的本地推理服务）"""
+    size = max(size, POOL_SIZE)
+    with _lock:
+        if _pools.get(prefix, 0) >= size:
+            return
+        _pools[prefix] = size
+    session().mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=size))
+
+
+def configure_cache(cache_dir: str, mode: str = "normal", ttl: dict = None):
+    """设置磁盘缓存目录、模式和各类请求的 TTL"""
+    if mode not in ("normal", "record", "replay", "off"):
+        raise ValueError(f"未知的缓存模式: {mode}")
+    _cache["dir"] = cache_dir
+    _cache["mode"] = mode if cache_dir else "off"
+    _cache["ttl"] = dict(DEFAULT_TTL, **(ttl or {}))
+    if _cache["mode"] != "off":
+        os.makedirs(cache_dir, exist_ok=True)
+        log.info(f"HTTP 缓存: {cache_dir}（{mode}）")
+        prune_cache()
+
+
+def prune_cache(factor: float = PRUNE_FACTOR) -> int:
+    """删除长期未更新的缓存条目，返回删除数
+
+    只看文件修改时间，不解压条目；record/replay 模式的条目是录制结果，不清理
+    """
+    ttls = [t for t in _cache["ttl"].values() if t]
+    if _cache["mode"] != "normal" or not ttls or not os.path.isdir(_cache["dir"]):
+        return 0
+    cutoff = time.time() - max(ttls) * factor
+    removed = 0
+    with os.scandir(_cache["dir"]) as shards:
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            with os.scandir(shard.path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.stat().st_mtime < cutoff:
+                            os.remove(entry.path)
+                            removed += 1
+                    except OSError:
+                        pass  # 其他进程同时清理或写入
+    if removed:
+        log.info(f"HTTP 缓存: 清理过期条目 {removed} 个")
+    return removed
+
+
+def _cache_key(method: str, url: str, params: dict) -> str:
+    norm = sorted((k, str(v)) for k, v in (params or {}).items() if k not in _IGNORED_PARAMS)
+    raw = json.dumps([method.upper(), url, norm], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> str:
+    return os.path.join(_cache["dir"], key[:2], key + ".z")
+
+
+def _read_entry(key: str):
+    path = _entry_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            raw = zlib.decompress(f.read())
+        head, body = raw.split(b"\n", 1)
+        return json.loads(head), body
+    except (OSError, ValueError, zlib.error) as e:
+        log.warning(f"缓存条目损坏，忽略: {path} ({e})")
+        return None
+
+
+def _write_entry(key: str, meta: dict, body: bytes):
+    path = _entry_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(zlib.compress(json.dumps(meta).encode("utf-8") + b"\n" + body, 6))
+    os.replace(tmp, path)
+
+
+def _cached_response(url: str, meta: dict, body: bytes) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = url
+    resp._content = body
+    resp.encoding = meta.get("encoding") or "utf-8"
+    resp.headers["Content-Type"] = meta.get("content_type", "")
+    resp.from_cache = True
+    return resp
+
+
+def request(method: str, url: str, params: dict = None, kind: str = "",
+            timeout: int = 30, throttle=None) -> requests.Response:
+    """带磁盘缓存的请求。GET 的 params 放在查询串，POST 放在表单正文
+
+    kind: 请求类别，决定 TTL（见 DEFAULT_TTL）
+    throttle: 真正发起网络请求前调用（如速率限制），缓存命中时不调用
+    """
+    method = method.upper()
+    mode = _cache["mode"]
+    ttl = _cache["ttl"].get(kind)
+
+    def _send(headers=None):
+        if throttle:
+            throttle()
+        if method == "POST":
+            return session().post(url, data=params, headers=headers, timeout=timeout)
+        return session().get(url, params=params, headers=headers, timeout=timeout)
+
+    if mode == "off" or ttl is None:
+        resp = _send()
+        resp.raise_for_status()
+        return resp
+
+    key = _cache_key(method, url, params)
+    entry = _read_entry(key)
+    if mode == "replay":
+        if entry is None:
+            shown = {k: v for k, v in (params or {}).items() if k not in _IGNORED_PARAMS}
+            raise RuntimeError(f"回放模式下缺少缓存: {method} {url} {shown}")
+        return _cached_response(url, *entry)
+
+    headers = {}
+    if entry is not None and mode == "normal":
+        meta, body = entry
+        if time.time() - meta["stored_at"] < ttl:
+            return _cached_response(url, meta, body)
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    resp = _send(headers or None)
+    if resp.status_code == 304 and entry is not None:
+        meta, body = entry
+        meta["stored_at"] = time.time()
+        _write_entry(key, meta, body)
+        return _cached_response(url, meta, body)
+    resp.raise_for_status()
+    _write_entry(key, {
+        "stored_at": time.time(),
+        "etag": resp.headers.get("ETag", ""),
+        "last_modified": resp.headers.get("Last-Modified", ""),
+        "content_type": resp.headers.get("Content-Type", ""),
+        "encoding": resp.encoding,
+    }, resp.content)
+    return resp
@@ -2,7 +2,6 @@
 
 import os
 import logging
-import tkinter as tk
 
 log = logging.getLogger(__name__)
 
@@ -14,6 +13,8 @@ except ImportError:
 
 
 def _make_popup(title_text, body_text, buttons=None, countdown_sec=0):
+    import tkinter as tk  # 延迟导入，无界面运行时不加载 tkinter
+
     result = {"clicked": None}
     root = tk.Tk()
     root.withdraw()
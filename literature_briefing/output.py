@@ -4,13 +4,52 @@ from datetime import datetime
 from typing import List
 from .sources.base import Paper
 
-
-def format_paper(paper: Paper) -> list:
+# 除 PubMed（按核心/扩展分组）外，各文献源在简报中的章节标题
+SECTION_TITLES = {"arxiv": "arXiv 预印本"}
+
+# 各语言简报的固定文字；未列出的语言使用英文
+LABELS = {
+    "zh": {"title": "文献简报", "range": "检索范围", "count": "{n} 篇", "empty": "本次检索未发现新文献。",
+           "highlights": "本期亮点", "core": "核心期刊最新文献", "extended": "关键词相关文献（扩展期刊）",
+           "topics": "主题分组", "topic": "主题 {i}：{label}", "group": "{name}（{count}）",
+           "link": "链接", "cited": "被引",
+           "sources": SECTION_TITLES},
+    "en": {"title": "Literature Briefing", "range": "Date range", "count": "{n} papers",
+           "empty": "No new papers found.", "highlights": "Highlights",
+           "core": "Latest from core journals", "extended": "Keyword matches (extended journals)",
+           "topics": "Topics", "topic": "Topic {i}: {label}", "group": "{name} ({count})",
+           "link": "link", "cited": "Cited by",
+           "sources": {"arxiv": "arXiv preprints"}},
+    "ja": {"title": "文献ブリーフィング", "range": "検索期間", "count": "{n} 件",
+           "empty": "新しい文献は見つかりませんでした。", "highlights": "今号のハイライト",
+           "core": "コアジャーナルの最新文献", "extended": "キーワード関連文献（拡張ジャーナル）",
+           "topics": "トピック別", "topic": "トピック {i}：{label}", "group": "{name}（{count}）",
+           "link": "リンク", "cited": "被引用",
+           "sources": {"arxiv": "arXiv プレプリント"}},
+}
+
+
+def _labels(lang: str) -> dict:
+    return LABELS.get(lang, LABELS["en"])
+
+
+def _translated(paper: Paper, lang: str) -> tuple:
+    """(标题译文, 摘要译文)；英文即原文（中文原文的英文译文见 translations），没有译文时为空"""
+    if lang == "zh":
+        return paper.title_zh, paper.abstract_zh
+    if lang == "en":
+        return tuple(paper.translations.get("en") or (paper.title, paper.abstract))
+    return tuple(paper.translations.get(lang) or ("", ""))
+
+
+def format_paper(paper: Paper, lang: str = "zh") -> list:
     link = paper.url
+    labels = _labels(lang)
+    title_tr, abstract_tr = _translated(paper, lang)
     lines = []
-    if paper.title_zh and paper.title_zh != paper.title:
-        lines.append(f"#### {paper.title_zh}")
-        lines.append(f"*{paper.title}*  [链接]({link})")
+    if title_tr and title_tr != paper.title:
+        lines.append(f"#### {title_tr}")
+        lines.append(f"*{paper.title}*  [{labels['link']}]({link})")
     else:
         lines.append(f"#### [{paper.title}]({link})")
 
@@ -26,10 +65,16 @@ def format_paper(paper: Paper) -> list:
         meta += f"  |  arXiv: {paper.source_id}"
         if paper.categories:
             meta += f"  |  {', '.join(paper.categories[:3])}"
+    else:
+        meta += f"  |  {paper.source}: {paper.source_id}"
+    if paper.citations is not None:
+        meta += f"  |  {labels['cited']}: {paper.citations}"
+        if paper.rcr is not None:
+            meta += f"（RCR {paper.rcr:.2f}）"
     lines.append(meta)
 
-    if paper.abstract_zh:
-        lines.append(f"\n> {paper.abstract_zh}")
+    if abstract_tr:
+        lines.append(f"\n> {abstract_tr}")
     elif paper.abstract:
         trunc = paper.abstract[:600]
         if len(paper.abstract) > 600:
@@ -40,38 +85,53 @@ def format_paper(paper: Paper) -> list:
 
 
 def generate_markdown(papers_by_source: dict, date_from: str, date_to: str,
-                      highlights: str = "") -> str:
+                      highlights: str = "", topics: list = None, lang: str = "zh") -> str:
     """生成完整的 Markdown 简报
 
     papers_by_source: {"pubmed": {"core": [...], "extended": [...]}, "arxiv": [...]}
+    topics: 可选的主题聚类结果 [(主题名, [Paper])]，给出时按主题分章节，不再按来源/期刊分组
+    lang: 简报语言，决定使用哪种译文与固定文字；亮点只有中文，其他语言不输出
     """
+    labels = _labels(lang)
+    if lang != "zh":
+        highlights = ""
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
     total = sum(
         len(ps) if isinstance(ps, list) else sum(len(v) for v in ps.values())
         for ps in papers_by_source.values()
     )
 
-    lines = [f"# 文献简报 {now}", "",
-             f"> 检索范围: {date_from} ~ {date_to}"]
+    lines = [f"# {labels['title']} {now}", "",
+             f"> {labels['range']}: {date_from} ~ {date_to}"]
 
     # 统计行
     stats = []
     for source_name, ps in papers_by_source.items():
         if isinstance(ps, dict):
             for group, group_papers in ps.items():
-                stats.append(f"{source_name}/{group}: {len(group_papers)} 篇")
+                stats.append(f"{source_name}/{group}: {labels['count'].format(n=len(group_papers))}")
         else:
-            stats.append(f"{source_name}: {len(ps)} 篇")
+            stats.append(f"{source_name}: {labels['count'].format(n=len(ps))}")
     lines.append(f"> {' | '.join(stats)}")
     lines.append("")
 
     if total == 0:
-        lines.append("本次检索未发现新文献。")
+        lines.append(labels["empty"])
         return "\n".join(lines)
 
     # 本期亮点
     if highlights:
-        lines += ["---", "## 本期亮点", "", highlights, ""]
+        lines += ["---", f"## {labels['highlights']}", "", highlights, ""]
+
+    if topics:
+        lines += ["---", f"## {labels['topics']}", ""]
+        for i, (label, topic_papers) in enumerate(topics, 1):
+            name = labels["topic"].format(i=i, label=label)
+            lines.append(f"### {_group_title(labels, name, len(topic_papers))}")
+            lines.append("")
+            for p in topic_papers:
+                lines.extend(format_paper(p, lang))
+        return "\n".join(lines)
 
     # PubMed 核心期刊
     pubmed_data = papers_by_source.get("pubmed", {})
@@ -80,32 +140,54 @@ def generate_markdown(papers_by_source: dict, date_from: str, date_to: str,
         extended = pubmed_data.get("extended", [])
 
         if core:
-            lines += ["---", "## 核心期刊最新文献", ""]
-            lines.extend(_group_by_journal(core))
+            lines += ["---", f"## {labels['core']}", ""]
+            lines.extend(_group_by_journal(core, lang))
 
         if extended:
-            lines += ["---", "## 关键词相关文献（扩展期刊）", ""]
-            lines.extend(_group_by_journal(extended))
+            lines += ["---", f"## {labels['extended']}", ""]
+            lines.extend(_group_by_journal(extended, lang))
 
-    # arXiv
-    arxiv_papers = papers_by_source.get("arxiv", [])
-    if arxiv_papers:
-        lines += ["---", "## arXiv 预印本", ""]
-        for p in arxiv_papers:
-            lines.extend(format_paper(p))
+    # arXiv 及其他文献源
+    for source_name, ps in papers_by_source.items():
+        if source_name == "pubmed" or not ps:
+            continue
+        title = labels["sources"].get(source_name, source_name)
+        lines += ["---", f"## {title}", ""]
+        for p in ps:
+            lines.extend(format_paper(p, lang))
 
     return "\n".join(lines)
 
 
-def _group_by_journal(papers: List[Paper]) -> list:
+def _group_title(labels: dict, name: str, n: int) -> str:
+    return labels["group"].format(name=name, count=labels["count"].format(n=n))
+
+
+def _group_by_journal(papers: List[Paper], lang: str = "zh") -> list:
+    labels = _labels(lang)
     by_journal = {}
     for p in papers:
         key = p.journal_abbr or p.journal
         by_journal.setdefault(key, []).append(p)
     lines = []
     for journal, jpapers in by_journal.items():
-        lines.append(f"### {journal}（{len(jpapers)} 篇）")
+        lines.append(f"### {_group_title(labels, journal, len(jpapers))}")
         lines.append("")
         for p in jpapers:
-            lines.extend(format_paper(p))
+            lines.extend(format_paper(p, lang))
     return lines
+
+
+def generate_meta(date_from: str, date_to: str, highlights: str = "",
+                  llm_usage: dict = None) -> dict:
+    """简报存档的元数据（与论文记录一起写入 .lbp 存档，供本地 API 读取）
+
+    llm_usage: LLMRouter.report() 的结果，按任务记录调用次数、延迟、token 与费用。
+    """
+    return {
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "date_from": date_from,
+        "date_to": date_to,
+        "highlights": highlights,
+        "llm_usage": llm_usage or {},
+    }
@@ -0,0 +1,100 @@
+"""简单的阶段 DAG 执行器
+
+每个阶段声明输入与输出（上下文中的键名），所有输入就绪即提交到线程池，
+互不依赖的阶段并发执行（如亮点生成只用英文标题，不必等待翻译）。
+阶段失败时：声明了 fallback 的用 fallback 作为输出继续；否则其下游全部跳过，
+其余分支照常完成，最后抛出该阶段的异常。
+"""
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Callable
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[dict], dict]  # 接收上下文，返回 {输出名: 值}
+    inputs: tuple = ()
+    outputs: tuple = ()
+    fallback: dict = None  # 失败时使用的输出；None 表示失败即中止下游
+
+
+def run_stages(stages: list, context: dict = None, max_workers: int = 4,
+               check: Callable[[], None] = None) -> dict:
+    """执行阶段 DAG，返回 {阶段名: 耗时秒数}；context 原地补充各阶段输出
+
+    check: 每次提交新阶段前调用（如取消检查），抛出的异常在运行中的阶段结束后向上传递
+    """
+    context = {} if context is None else context
+    pending = list(stages)
+    running = {}
+    timings = {}
+    errors = []
+    interrupt = None
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage") as pool:
+        while pending or running:
+            ready = [s for s in pending if all(k in context for k in s.inputs)]
+            if ready and interrupt is None and check is not None:
+                try:
+                    check()
+                except Exception as e:
+                    interrupt = e
+            if interrupt is None:
+                for stage in ready:
+                    pending.remove(stage)
+                    running[pool.submit(_timed, stage, context)] = stage
+            if not running:
+                break  # 剩余阶段的输入永远不会就绪
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    outputs, seconds = future.result()
+                except Exception as e:
+                    seconds = getattr(e, "stage_seconds", 0.0)
+                    if interrupt is None and check is not None:
+                        # 阶段因取消而中断时不走 fallback
+                        try:
+                            check()
+                        except Exception as ce:
+                            interrupt = ce
+                    if interrupt is not None:
+                        timings[stage.name] = seconds
+                        continue
+                    if stage.fallback is None:
+                        log.error(f"阶段 {stage.name} 失败: {e}")
+                        errors.append(e)
+                        continue
+                    log.warning(f"阶段 {stage.name} 失败，使用默认结果继续: {e}")
+                    outputs = stage.fallback
+                timings[stage.name] = seconds
+                missing = set(stage.outputs) - set(outputs)
+                if missing:
+                    errors.append(RuntimeError(f"阶段 {stage.name} 缺少输出: {sorted(missing)}"))
+                    continue
+                context.update(outputs)
+
+    if interrupt is not None:
+        raise interrupt
+    if errors:
+        skipped = [s.name for s in pending]
+        if skipped:
+            log.error(f"因上游失败跳过阶段: {', '.join(skipped)}")
+        raise errors[0]
+    return timings
+
+
+def _timed(stage: Stage, context: dict):
+    start = time.perf_counter()
+    try:
+        outputs = stage.fn(context) or {}
+    except Exception as e:
+        e.stage_seconds = time.perf_counter() - start
+        raise
+    return outputs, time.perf_counter() - start
@@ -0,0 +1,160 @@
+"""--plan：只做计数查询，估算一次运行的请求数、token、费用与耗时
+
+各文献源通过 plan() 做廉价的计数查询（PubMed rettype=count、arXiv totalResults），
+不下载摘要、不调用 LLM。翻译规模按平均标题/摘要长度估算；
+若输出目录中已有带 llm_usage 的简报存档，LLM 延迟取最近一次的实测值。
+"""
+
+import os
+import math
+import glob
+import logging
+
+from . import archive
+from .llm import get_router, llm_enabled, service_key, worker_pools
+from .sources.base import get_source_class
+
+log = logging.getLogger(__name__)
+
+AVG_TITLE_CHARS = 120
+AVG_ABSTRACT_CHARS = 1500
+HIGHLIGHT_LINE_CHARS = 140  # 亮点提示中每篇 "[期刊] 标题" 的长度
+CHARS_PER_TOKEN = 4
+SYSTEM_TOKENS = 40
+HIGHLIGHT_PROMPT_TOKENS = 200
+HIGHLIGHT_OUTPUT_TOKENS = 400
+OUTPUT_RATIO = 1.2  # 中文译文相对英文原文的 token 比例
+# 没有实测数据时假定的单次调用延迟（秒）
+DEFAULT_LATENCY = {"title": 1.5, "abstract": 3.0, "highlights": 10.0}
+
+
+def _measured_latency(output_dir: str) -> dict:
+    """最近一次简报存档中各任务的平均延迟"""
+    paths = sorted(glob.glob(os.path.join(output_dir, "文献简报_*.lbp")))
+    if not paths:
+        return {}
+    try:
+        meta, _ = archive.load(paths[-1])
+    except Exception:
+        return {}
+    return {task: u["avg_latency"] for task, u in meta.get("llm_usage", {}).items()
+            if u.get("calls")}
+
+
+def _plan_llm(cfg: dict, papers: int) -> dict:
+    cfg_llm = cfg["llm"]
+    if not llm_enabled(cfg_llm) or not papers:
+        return {}
+    router = get_router(cfg_llm)
+    latency = dict(DEFAULT_LATENCY, **_measured_latency(
+        os.path.join(cfg["output_path"], cfg["output_folder"])))
+
+    tasks = {}
+    # 多目标语言在同一次调用中输出，只增加输出 token；英文即原文
+    languages = len({lang for lang in cfg_llm.get("target_languages") or ["zh"] if lang != "en"})
+    if cfg_llm.get("enable_translation", True) and languages:
+        chunk_chars = cfg_llm.get("abstract_chunk_chars", 1000)
+        abstract_chars = AVG_ABSTRACT_CHARS if chunk_chars > 0 else min(AVG_ABSTRACT_CHARS, 800)
+        chunks = math.ceil(abstract_chars / chunk_chars) if chunk_chars > 0 else 1
+        tasks["title"] = (papers, papers * AVG_TITLE_CHARS / CHARS_PER_TOKEN)
+        tasks["abstract"] = (papers * chunks, papers * abstract_chars / CHARS_PER_TOKEN)
+    if cfg_llm.get("enable_highlights", True):
+        tasks["highlights"] = (1, papers * HIGHLIGHT_LINE_CHARS / CHARS_PER_TOKEN)
+
+    result = {}
+    for task, (calls, text_tokens) in tasks.items():
+        tcfg = router.cfgs[task]
+        if task == "highlights":
+            tokens_in = text_tokens + HIGHLIGHT_PROMPT_TOKENS
+            tokens_out = HIGHLIGHT_OUTPUT_TOKENS
+        else:
+            tokens_in = text_tokens + calls * SYSTEM_TOKENS
+            tokens_out = text_tokens * OUTPUT_RATIO * languages
+        priced = "price_in" in tcfg or "price_out" in tcfg
+        result[task] = {
+            "model": f"{tcfg['provider']}/{tcfg['model']}",
+            "calls": calls,
+            "tokens_in": int(tokens_in),
+            "tokens_out": int(tokens_out),
+            "cost": (tokens_in * tcfg.get("price_in", 0) + tokens_out * tcfg.get("price_out", 0)) / 1e6
+            if priced else None,
+            "latency": latency[task],
+        }
+
+    # 标题与摘要走不同服务时各有一个线程池并行执行，取较慢的；同一服务时串在一个池里
+    translators = [router.for_task(t) for t in ("title", "abstract")]
+    pools = worker_pools(translators, cfg_llm.get("translation_workers", 4))
+    busy = dict.fromkeys(pools, 0.0)
+    for task, llm in zip(("title", "abstract"), translators):
+        if task in result:
+            busy[service_key(llm)] += result[task]["calls"] * result[task]["latency"]
+    workers = sum(pools.values())
+    seconds = max((busy[key] / size for key, size in pools.items()), default=0.0)
+    if "highlights" in result:
+        # 亮点与翻译并发执行，取两者中较慢的
+        seconds = max(seconds, result["highlights"]["latency"])
+    return {"tasks": result, "workers": workers, "seconds": seconds}
+
+
+def plan_profile(cfg: dict, date_from: str, date_to: str, watermarks: dict = None,
+                 options: dict = None) -> dict:
+    """估算单个配置的一次运行"""
+    watermarks = watermarks or {}
+    options = options or {}
+    sources = {}
+    for name, cfg_source in cfg["sources"].items():
+        if not cfg_source.get("enabled"):
+            continue
+        try:
+            source = get_source_class(name)(cfg_source, **options.get(name, {}))
+            source.watermark = watermarks.get(name)
+            sources[name] = source.plan(date_from, date_to, cfg["max_results"])
+        except Exception as e:
+            log.warning(f"文献源 {name} 估算失败: {e}")
+            sources[name] = {"error": str(e)}
+
+    papers = sum(s.get("papers", 0) for s in sources.values())
+    llm = _plan_llm(cfg, papers)
+    # 各文献源并发检索，耗时取最慢的一个
+    fetch_seconds = max((s.get("seconds", 0) for s in sources.values()), default=0)
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "sources": sources,
+        "papers": papers,
+        "llm": llm,
+        "seconds": fetch_seconds + llm.get("seconds", 0),
+    }
+
+
+def _fmt_seconds(sec: float) -> str:
+    return f"{sec:.0f} 秒" if sec < 90 else f"{sec / 60:.1f} 分钟"
+
+
+def format_plan(plan: dict) -> list:
+    lines = [f"运行估算（{plan['date_from']} ~ {plan['date_to']}）"]
+    for name, s in plan["sources"].items():
+        if "error" in s:
+            lines.append(f"  {name}: 估算失败 - {s['error']}")
+            continue
+        if not s:
+            lines.append(f"  {name}: 不支持估算")
+            continue
+        detail = ", ".join(f"{k} {v}" for k, v in s.get("detail", {}).items())
+        lines.append(f"  {name}: 约 {s['papers']} 篇，{s['requests']} 次请求，"
+                     f"约 {_fmt_seconds(s['seconds'])}（{detail}）")
+    llm = plan["llm"]
+    total_cost, priced = 0.0, False
+    for task, t in llm.get("tasks", {}).items():
+        cost = ""
+        if t["cost"] is not None:
+            cost = f"，约 ${t['cost']:.4f}"
+            total_cost += t["cost"]
+            priced = True
+        lines.append(f"  [{task}] {t['model']}: {t['calls']} 次调用，"
+                     f"token 约 {t['tokens_in']}→{t['tokens_out']}{cost}（单次 {t['latency']:.1f}s）")
+    if llm:
+        lines.append(f"  LLM 并发 {llm['workers']}，约 {_fmt_seconds(llm['seconds'])}"
+                     + (f"，费用约 ${total_cost:.4f}" if priced else ""))
+    lines.append(f"  预计共 {plan['papers']} 篇，总耗时约 {_fmt_seconds(plan['seconds'])}")
+    return lines
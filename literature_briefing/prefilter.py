@@ -0,0 +1,130 @@
+"""翻译前的本地预筛：不需要 LLM 的文本直接给出结果
+
+规则（只跳过确定不需要翻译的文本，拿不准的一律交给 LLM）：
+- 已是中文：CJK 字符占字母类字符的一半以上，原样保留
+- 勘误/更正/撤稿/关注声明：标题为严格的通知格式（"Erratum: ..."、"Correction to: ..."）时
+  只翻译固定前缀；出版类型确认是通知时，摘要（通常是一行引用说明）保留原文
+- 标题只是基因/蛋白/化合物符号（如 "TP53"、"BRCA1/2"、"IL-6R"）：原样保留
+- 摘要与标题相同：直接复用标题译文
+"""
+
+import re
+import threading
+from typing import Optional, Tuple
+
+from .sources.base import Paper
+from .planner import CHARS_PER_TOKEN, OUTPUT_RATIO, SYSTEM_TOKENS
+
+_CJK_RE = re.compile(r"[㐀-鿿豈-﫿]")
+# 通知类标题前缀 -> 中文；较长的写在前面。
+# 多词前缀本身就是通知用语，后面可以直接接 "to" 和原文标题；单词前缀（Correction、
+# Retraction 等）也常见于研究论文标题（"Correction of scoliosis..."），必须带冒号
+NOTICE_PREFIXES = [
+    ("Publisher Correction", "出版方更正"),
+    ("Author Correction", "作者更正"),
+    ("Notice of Retraction", "撤稿声明"),
+    ("Retraction Note", "撤稿声明"),
+    ("Editorial Expression of Concern", "编辑部关注声明"),
+    ("Expression of Concern", "关注声明"),
+    ("Retraction", "撤稿声明"),
+    ("Corrigendum", "勘误"),
+    ("Erratum", "勘误"),
+    ("Correction", "更正"),
+]
+_UNAMBIGUOUS = ("Publisher Correction", "Author Correction", "Notice of Retraction", "Retraction Note")
+
+
+def _alternation(prefixes) -> str:
+    return "|".join(re.escape(p) for p in prefixes)
+
+
+_NOTICE_RE = re.compile(
+    r"^\s*(?:"
+    r"(" + _alternation(_UNAMBIGUOUS) + r")(?:\s+(?:to|for))?\s*[:：]?"
+    r"|(" + _alternation(en for en, _ in NOTICE_PREFIXES if en not in _UNAMBIGUOUS) + r")"
+    r"(?:\s+(?:to|for))?\s*[:：]"
+    r")\s*(.*)$",
+    re.IGNORECASE | re.DOTALL,
+)
+_NOTICE_ZH = {en.lower(): zh for en, zh in NOTICE_PREFIXES}
+# PubMed 出版类型中的通知；"Retracted Publication" 是被撤稿的原文，仍需翻译
+NOTICE_TYPES = {"Published Erratum", "Retraction of Publication", "Expression of Concern"}
+# 符号：字母数字开头，只含字母、数字、连字符、斜杠等
+_SYMBOL_RE = re.compile(r"^[A-Za-z0-9α-ωΑ-Ω][A-Za-z0-9α-ωΑ-Ω\-+/:.,()]*$")
+_NORM_RE = re.compile(r"[\W_]+")
+
+
+def is_chinese(text: str) -> bool:
+    letters = sum(1 for ch in text if ch.isalpha())
+    return letters > 0 and len(_CJK_RE.findall(text)) * 2 >= letters
+
+
+def is_notice(paper: Paper) -> bool:
+    """出版类型确认的通知；只凭标题不能判断（研究论文也可能以 Correction 开头）"""
+    return bool(NOTICE_TYPES.intersection(paper.pub_types))
+
+
+def is_symbol_title(title: str) -> bool:
+    """1~3 个符号，每个都含数字或至少两个大写字母（排除 "Cisplatin" 这类普通词）"""
+    tokens = title.strip().rstrip(".").split()
+    if not 1 <= len(tokens) <= 3:
+        return False
+    return all(_SYMBOL_RE.match(t) and (any(ch.isdigit() for ch in t)
+                                        or sum(ch.isupper() for ch in t) >= 2)
+               for t in tokens)
+
+
+def _norm(text: str) -> str:
+    return _NORM_RE.sub("", text).lower()
+
+
+def title_translation(paper: Paper) -> Tuple[Optional[str], str]:
+    """(译文, 原因)；译文为 None 表示需要调用 LLM"""
+    title = paper.title
+    if is_chinese(title):
+        return title, "已是中文"
+    m = _NOTICE_RE.match(title)
+    if m:
+        zh = _NOTICE_ZH[(m.group(1) or m.group(2)).lower()]
+        rest = m.group(3).strip()
+        return (f"{zh}：{rest}" if rest else zh), "勘误/撤稿通知"
+    if is_symbol_title(title):
+        return title, "符号标题"
+    return None, ""
+
+
+def abstract_translation(paper: Paper) -> Tuple[Optional[str], str]:
+    """(译文, 原因)；译文为 None 表示需要调用 LLM，"=title" 表示复用标题译文"""
+    abstract = paper.abstract
+    if not abstract.strip():
+        return None, ""
+    if is_chinese(abstract):
+        return abstract, "已是中文"
+    if is_notice(paper):
+        return abstract, "勘误/撤稿通知"
+    if _norm(abstract) == _norm(paper.title):
+        return "=title", "摘要同标题"
+    return None, ""
+
+
+class SkipStats:
+    """本次运行跳过的 LLM 调用次数（按原因）与估算节省的 token"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = {}
+        self.tokens = 0
+
+    def add(self, reason: str, text: str):
+        tokens = len(text) / CHARS_PER_TOKEN
+        with self._lock:
+            self.calls[reason] = self.calls.get(reason, 0) + 1
+            self.tokens += int(tokens * (1 + OUTPUT_RATIO) + SYSTEM_TOKENS)
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    def summary(self) -> str:
+        detail = "，".join(f"{reason} {n}" for reason, n in self.calls.items())
+        return f"跳过 {self.total} 次 LLM 调用（{detail}），约节省 {self.tokens} token"
@@ -0,0 +1,77 @@
+"""运行进度事件与取消
+
+run_profile 在各阶段调用 Progress，GUI 等调用方通过 callback 接收事件：
+    {"stage": "translate", "done": 12, "total": 40, "rate": 2.3, "eta": 12.2}
+rate 为每秒完成数，eta 为预计剩余秒数（未知时为 None）。
+"""
+
+import time
+import threading
+
+STAGES = {
+    "fetch": "检索文献",
+    "translate": "翻译",
+    "output": "写出简报",
+    "done": "完成",
+}
+
+
+class RunCancelled(Exception):
+    """运行被用户取消"""
+
+
+class Progress:
+    """把阶段与计数变化转成事件回调，并在检查点响应取消"""
+
+    def __init__(self, callback=None, cancel_event: threading.Event = None):
+        self.callback = callback
+        self.cancel_event = cancel_event or threading.Event()
+        self.stage_name = ""
+        self.total = 0
+        self.done = 0
+        self._started = 0.0
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, total: int = 0, **info):
+        self.check()
+        with self._lock:
+            self.stage_name = name
+            self.total = total
+            self.done = 0
+            self._started = time.monotonic()
+        self._emit(**info)
+
+    def advance(self, n: int = 1, **info):
+        with self._lock:
+            self.done += n
+        self._emit(**info)
+
+    def finish(self, **info):
+        """进入 done 阶段；此时结果已写出，不再响应取消"""
+        with self._lock:
+            self.stage_name = "done"
+            self.total = self.done = info.get("papers", 0)
+        self._emit(**info)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def check(self):
+        if self.cancel_event.is_set():
+            raise RunCancelled("已取消")
+
+    def _emit(self, **info):
+        if self.callback is None:
+            return
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            rate = self.done / elapsed if self.done and elapsed > 0 else 0.0
+            eta = (self.total - self.done) / rate if rate and self.total else None
+            event = {"stage": self.stage_name, "done": self.done, "total": self.total,
+                     "rate": rate, "eta": eta}
+        event.update(info)
+        self.callback(event)
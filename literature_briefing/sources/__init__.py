@@ -1 +1 @@
-from .base import Paper, LiteratureSource
+from .base import Paper, LiteratureSource, FetchCache, register, get_source_class, fetch_all
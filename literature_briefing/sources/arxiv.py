@@ -1,22 +1,55 @@
-"""arXiv 文献源"""
+"""arXiv 文献源
 
+harvest_mode:
+    search  通过检索 API 按分类+关键词分页查询（默认）
+    oai     通过 OAI-PMH 按分类所属的 set 批量拉取新提交（from/until + resumptionToken），
+            分类与关键词在本地过滤；每页约 1000 条，宽泛分类下请求数远少于检索 API
+两种方式共用一个限速器，请求间隔不小于 arXiv 要求的 3 秒。
+"""
+
+import math
 import time
 import logging
 import requests
+from datetime import datetime, timedelta
+from .. import net
 import xml.etree.ElementTree as ET
 from typing import List
-from .base import Paper, LiteratureSource
+from .base import Paper, LiteratureSource, FetchCache, register
 
 log = logging.getLogger(__name__)
 ARXIV_API = "http://export.arxiv.org/api/query"
+ARXIV_OAI = "https://oaipmh.arxiv.org/oai"
 NS = {"atom": "http://www.w3.org/2005/Atom",
-      "arxiv": "http://arxiv.org/schemas/atom"}
+      "arxiv": "http://arxiv.org/schemas/atom",
+      "opensearch": "http://a9.com/-/spec/opensearch/1.1/",
+      "oai": "http://www.openarchives.org/OAI/2.0/",
+      "meta": "http://arxiv.org/OAI/arXiv/"}
+PAGE_SIZE = 100
+REQUEST_INTERVAL = 3.0  # arXiv API 使用规范：连续请求间隔不小于 3 秒
+# 估算耗时用的单页请求往返时间（秒）
+REQUEST_LATENCY = 2.0
+# OAI-PMH 流量控制（503 + Retry-After）的最大重试次数与等待上限
+OAI_RETRIES = 3
+OAI_MAX_WAIT = 60
+# 新提交从提交到出现在 OAI 中的最长间隔（天），超过的视为旧文献的版本更新
+CREATED_LAG_DAYS = 7
+# 物理学下的 archive 在 OAI 中的 set 为 "physics:<archive>"
+PHYSICS_ARCHIVES = {"astro-ph", "cond-mat", "gr-qc", "hep-ex", "hep-lat", "hep-ph", "hep-th",
+                    "math-ph", "nlin", "nucl-ex", "nucl-th", "physics", "quant-ph"}
+
+_limiter = net.RateLimiter(1 / REQUEST_INTERVAL)
 
 
+@register("arxiv")
 class ArxivSource(LiteratureSource):
-    def __init__(self, cfg_arxiv: dict):
+    ENDPOINT = ARXIV_API
+
+    def __init__(self, cfg_arxiv: dict, cache: FetchCache = None):
+        self.cache = cache
         self.categories = cfg_arxiv.get("categories", [])
         self.keywords = cfg_arxiv.get("keywords", [])
+        self.harvest_mode = cfg_arxiv.get("harvest_mode", "search")
 
     @property
     def name(self) -> str:
@@ -24,48 +57,229 @@ class ArxivSource(LiteratureSource):
 
     def search(self, date_from: str, date_to: str, max_results: int,
                seen_ids: set) -> List[Paper]:
+        if self.harvest_mode == "oai":
+            return self._harvest(date_from, date_to, max_results, seen_ids)
         query = self._build_query()
         if not query:
             return []
+        # 增量运行：只检索上次最新提交时间之后的条目（分钟精度，边界由 seen_ids 去重）
+        latest = self.watermark or ""
+        if self.watermark:
+            query = f"({query}) AND submittedDate:[{self._compact_ts(self.watermark)} TO 299912312359]"
+            date_from = self.watermark[:10].replace("-", "/")
 
         log.info("检索 arXiv...")
         papers = []
         start = 0
-        batch_size = min(max_results, 100)
+        batch_size = min(max_results, PAGE_SIZE)
 
         while start < max_results:
-            resp = requests.get(
-                ARXIV_API,
-                params={
-                    "search_query": query,
-                    "start": start,
-                    "max_results": batch_size,
-                    "sortBy": "submittedDate",
-                    "sortOrder": "descending",
-                },
-                timeout=30,
-            )
-            resp.raise_for_status()
-            root = ET.fromstring(resp.text)
-            entries = root.findall("atom:entry", NS)
-            if not entries:
+            page, page_latest = self._fetch_page(query, start, batch_size)
+            if not page:
                 break
+            latest = max(latest, page_latest)
 
-            for entry in entries:
-                paper = self._parse_entry(entry)
-                if paper and paper.source_id not in seen_ids:
+            for paper in page:
+                if paper.source_id not in seen_ids:
                     # 按日期过滤
                     if self._in_date_range(paper.date, date_from, date_to):
                         papers.append(paper)
 
             start += batch_size
-            if len(entries) < batch_size:
+            if len(page) < batch_size:
                 break
-            time.sleep(0.5)
 
         log.info(f"  arXiv 新文献: {len(papers)} 篇")
+        self.watermark = latest or self.watermark
         return papers
 
+    def plan(self, date_from: str, date_to: str, max_results: int) -> dict:
+        """用 max_results=0 的查询读取 totalResults，估算分页请求数"""
+        query = self._build_query()
+        if not query or self.harvest_mode == "oai":
+            return {}  # OAI-PMH 没有廉价的计数查询
+        if self.watermark:
+            lo = self._compact_ts(self.watermark)
+        else:
+            lo = date_from.replace("/", "") + "0000"
+        query = f"({query}) AND submittedDate:[{lo} TO {date_to.replace('/', '')}2359]"
+        resp = net.request("GET", ARXIV_API, params={"search_query": query, "start": 0, "max_results": 0},
+                           kind="arxiv", timeout=30, throttle=_limiter.wait)
+        total = int(ET.fromstring(resp.text).findtext("opensearch:totalResults", "0", NS))
+        papers = min(total, max_results)
+        pages = max(1, math.ceil(papers / PAGE_SIZE))
+        return {"papers": papers, "requests": pages,
+                "seconds": pages * REQUEST_LATENCY + (pages - 1) * REQUEST_INTERVAL,
+                "detail": {"total": total}}
+
+    @staticmethod
+    def _compact_ts(iso: str) -> str:
+        """2026-10-01T17:59:59Z -> 202610011759（arXiv submittedDate 格式）"""
+        return "".join(ch for ch in iso if ch.isdigit())[:12].ljust(12, "0")
+
+    def _fetch_page(self, query: str, start: int, batch_size: int):
+        """获取一页结果，返回 (Paper 列表, 本页最新提交时间)"""
+        key = ("arxiv", query, start, batch_size)
+        if self.cache is not None and key in self.cache.searches:
+            ids, page_latest = self.cache.searches[key]
+            return [self.cache.get_paper(self.name, i) for i in ids], page_latest
+
+        resp = net.request(
+            "GET", ARXIV_API,
+            params={
+                "search_query": query,
+                "start": start,
+                "max_results": batch_size,
+                "sortBy": "submittedDate",
+                "sortOrder": "descending",
+            },
+            kind="arxiv", timeout=30, throttle=_limiter.wait,
+        )
+        root = ET.fromstring(resp.text)
+        page = []
+        page_latest = ""
+        for entry in root.findall("atom:entry", NS):
+            paper = self._parse_entry(entry)
+            if paper:
+                page.append(paper)
+                page_latest = max(page_latest, entry.findtext("atom:published", "", NS))
+
+        if self.cache is not None:
+            for paper in page:
+                self.cache.put_paper(paper)
+            self.cache.searches[key] = ([p.source_id for p in page], page_latest)
+        return page, page_latest
+
+    # ---------- OAI-PMH ----------
+
+    @staticmethod
+    def _oai_set(category: str) -> str:
+        """q-bio.NC -> q-bio，hep-th -> physics:hep-th"""
+        archive = category.split(".")[0]
+        return f"physics:{archive}" if archive in PHYSICS_ARCHIVES else archive
+
+    def _harvest(self, date_from: str, date_to: str, max_results: int,
+                 seen_ids: set) -> List[Paper]:
+        if not self.categories:
+            log.warning("arXiv OAI-PMH 模式需要至少一个分类，已跳过")
+            return []
+        # 增量运行：从上次最新的记录日期开始（日粒度，边界由 seen_ids 去重）
+        if self.watermark:
+            date_from = self.watermark[:10].replace("-", "/")
+        lo, hi = date_from.replace("/", "-"), date_to.replace("/", "-")
+        # datestamp 是公布日期，首版提交日期（created）要早 1~3 天（周末更久），
+        # 所以新文献的判断以 from 减去 CREATED_LAG_DAYS 为下限
+        created_from = (datetime.strptime(lo, "%Y-%m-%d")
+                        - timedelta(days=CREATED_LAG_DAYS)).strftime("%Y/%m/%d")
+        log.info("检索 arXiv（OAI-PMH）...")
+
+        cats = set(self.categories)
+        keywords = [k.lower() for k in self.keywords]
+        papers, picked, latest, requests_sent = [], set(), self.watermark or "", 0
+        for set_spec in sorted({self._oai_set(c) for c in self.categories}):
+            records, set_latest, sent = self._list_records(set_spec, lo, hi)
+            requests_sent += sent
+            latest = max(latest, set_latest)
+            for paper in records:
+                # 跨分类的文献会出现在多个 set 中
+                if paper.source_id in seen_ids or paper.source_id in picked:
+                    continue
+                # 只要新提交，过滤掉旧文献的版本更新
+                if not self._in_date_range(paper.date, created_from, date_to):
+                    continue
+                if not cats.intersection(paper.categories):
+                    continue
+                text = f"{paper.title} {paper.abstract}".lower()
+                if keywords and not any(k in text for k in keywords):
+                    continue
+                papers.append(paper)
+                picked.add(paper.source_id)
+
+        papers.sort(key=lambda p: p.date, reverse=True)
+        log.info(f"  arXiv 新文献: {len(papers[:max_results])} 篇（OAI-PMH 请求 {requests_sent} 次）")
+        self.watermark = latest or self.watermark
+        return papers[:max_results]
+
+    def _list_records(self, set_spec: str, date_from: str, date_to: str):
+        """拉取一个 set 在 [from, until] 内的全部记录，返回 (Paper 列表, 最新记录日期, 请求次数)"""
+        key = ("arxiv-oai", set_spec, date_from, date_to)
+        if self.cache is not None and key in self.cache.searches:
+            ids, latest = self.cache.searches[key]
+            return [self.cache.get_paper(self.name, i) for i in ids], latest, 0
+
+        params = {"verb": "ListRecords", "metadataPrefix": "arXiv", "set": set_spec,
+                  "from": date_from, "until": date_to}
+        records, latest, sent = [], "", 0
+        while True:
+            root = ET.fromstring(self._oai_request(params).text)
+            sent += 1
+            error = root.find("oai:error", NS)
+            if error is not None:
+                if error.get("code") != "noRecordsMatch":
+                    raise RuntimeError(f"OAI-PMH 错误 {error.get('code')}: {error.text}")
+                break
+            for record in root.iterfind("oai:ListRecords/oai:record", NS):
+                header = record.find("oai:header", NS)
+                if header is None or header.get("status") == "deleted":
+                    continue
+                latest = max(latest, header.findtext("oai:datestamp", "", NS))
+                paper = self._parse_record(record)
+                if paper:
+                    records.append(paper)
+            token = root.findtext("oai:ListRecords/oai:resumptionToken", "", NS).strip()
+            if not token:
+                break
+            params = {"verb": "ListRecords", "resumptionToken": token}
+
+        if self.cache is not None:
+            for paper in records:
+                self.cache.put_paper(paper)
+            self.cache.searches[key] = ([p.source_id for p in records], latest)
+        return records, latest, sent
+
+    def _oai_request(self, params: dict):
+        """经限速器发起请求；服务端流量控制（503 + Retry-After）时按要求等待后重试"""
+        for attempt in range(OAI_RETRIES + 1):
+            try:
+                return net.request("GET", ARXIV_OAI, params, kind="arxiv", timeout=60,
+                                   throttle=_limiter.wait)
+            except requests.HTTPError as e:
+                resp = e.response
+                if resp is None or resp.status_code != 503 or attempt == OAI_RETRIES:
+                    raise
+                try:
+                    wait = min(float(resp.headers.get("Retry-After", REQUEST_INTERVAL)), OAI_MAX_WAIT)
+                except ValueError:
+                    wait = REQUEST_INTERVAL
+                log.info(f"  arXiv OAI-PMH 要求等待 {wait:.0f} 秒")
+                time.sleep(wait)
+
+    def _parse_record(self, record) -> Paper | None:
+        meta = record.find("oai:metadata/meta:arXiv", NS)
+        if meta is None:
+            return None
+        try:
+            arxiv_id = meta.findtext("meta:id", "", NS).strip()
+            authors = []
+            for author in meta.iterfind("meta:authors/meta:author", NS):
+                name = " ".join(filter(None, (author.findtext("meta:forenames", "", NS).strip(),
+                                              author.findtext("meta:keyname", "", NS).strip())))
+                if name:
+                    authors.append(name)
+            return Paper(
+                source="arxiv", source_id=arxiv_id,
+                title=" ".join(meta.findtext("meta:title", "", NS).split()),
+                abstract=" ".join(meta.findtext("meta:abstract", "", NS).split()),
+                authors=authors, journal="arXiv", journal_abbr="arXiv",
+                date=meta.findtext("meta:created", "", NS).strip(),
+                doi=meta.findtext("meta:doi", "", NS).strip(),
+                url=f"https://arxiv.org/abs/{arxiv_id}",
+                categories=meta.findtext("meta:categories", "", NS).split(),
+            )
+        except Exception as e:
+            log.warning(f"解析 arXiv OAI 记录失败: {e}")
+            return None
+
     def _build_query(self) -> str:
         parts = []
         if self.categories:
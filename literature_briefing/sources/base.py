@@ -1,11 +1,29 @@
-"""文献源抽象基类 + Paper 数据类"""
+"""文献源抽象基类 + 注册表 + Paper 数据类 + 共享检索缓存"""
 
-from dataclasses import dataclass, field
+import sys
+import time
+import logging
+import pkgutil
+import importlib
+import threading
+from dataclasses import dataclass, field, replace
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
+log = logging.getLogger(__name__)
 
-@dataclass
+_REGISTRY = {}
+DEFAULT_TIMEOUT = 600  # 秒，单个文献源的检索超时
+
+
+def register(name):
+    def decorator(cls):
+        _REGISTRY[name] = cls
+        return cls
+    return decorator
+
+
+@dataclass(slots=True)
 class Paper:
     source: str  # "pubmed" / "arxiv"
     source_id: str  # PMID / arXiv ID
@@ -18,12 +36,51 @@ class Paper:
     doi: str = ""
     url: str = ""
     categories: List[str] = field(default_factory=list)
+    # PubMed 标引信息（MeSH 主题词、作者关键词、文献类型），用于本地过滤
+    mesh: List[str] = field(default_factory=list)
+    keywords: List[str] = field(default_factory=list)
+    pub_types: List[str] = field(default_factory=list)
     # 翻译后填充
     title_zh: str = ""
     abstract_zh: str = ""
+    # 中文以外的目标语言：语言代码 -> [标题译文, 摘要译文]
+    translations: dict = field(default_factory=dict)
+    # 引用补充（enrich）后填充；None 表示没有数据
+    citations: Optional[int] = None
+    rcr: Optional[float] = None
+
+    def __post_init__(self):
+        # 大量重复的来源/期刊名只保留一份
+        self.source = sys.intern(self.source)
+        self.journal = sys.intern(self.journal)
+        self.journal_abbr = sys.intern(self.journal_abbr)
+
+
+@dataclass
+class FetchCache:
+    """同一进程内多个配置共享的检索缓存
+
+    searches: 查询键 -> 检索结果（ID 列表或 Paper 列表）
+    papers: (source, source_id) -> Paper，每篇文献只下载一次
+    """
+    searches: dict = field(default_factory=dict)
+    papers: dict = field(default_factory=dict)
+
+    def get_paper(self, source: str, source_id: str) -> "Paper | None":
+        p = self.papers.get((source, source_id))
+        # 返回副本，避免不同配置修改同一对象（如 categories）
+        return replace(p) if p is not None else None
+
+    def put_paper(self, paper: Paper):
+        self.papers[(paper.source, paper.source_id)] = replace(paper)
 
 
 class LiteratureSource(ABC):
+    # 启动前连通性检查使用的地址
+    ENDPOINT = ""
+    # 增量水位线：运行前由调用方设置为上次保存的值，search 成功后更新为新值
+    watermark = None
+
     @abstractmethod
     def search(self, date_from: str, date_to: str, max_results: int,
                seen_ids: set) -> List[Paper]:
@@ -34,3 +91,92 @@ class LiteratureSource(ABC):
     @abstractmethod
     def name(self) -> str:
         ...
+
+    @classmethod
+    def group(cls, papers: List[Paper]):
+        """简报中的分组方式：返回列表，或 {分组名: 列表}"""
+        return papers
+
+    def plan(self, date_from: str, date_to: str, max_results: int) -> dict:
+        """只做计数类的廉价查询，估算本次检索规模（--plan）
+
+        返回 {"papers": 预计文献数, "requests": 预计请求数, "seconds": 预计耗时, "detail": {...}}；
+        不支持估算的文献源返回空字典。
+        """
+        return {}
+
+
+def _discover():
+    """导入 sources 包下的全部模块以触发 @register；新增文献源只需放一个模块"""
+    package = __name__.rpartition(".")[0]
+    for info in pkgutil.iter_modules(sys.modules[package].__path__):
+        if info.name != "base":
+            importlib.import_module(f"{package}.{info.name}")
+
+
+def get_source_class(name: str):
+    if name not in _REGISTRY:
+        _discover()
+    if name not in _REGISTRY:
+        raise ValueError(f"未知的文献源: {name}，可选: {list(_REGISTRY.keys())}")
+    return _REGISTRY[name]
+
+
+def fetch_all(cfg_sources: dict, date_from: str, date_to: str, max_results: int,
+              seen_ids: set, cache: FetchCache = None, options: dict = None,
+              watermarks: dict = None, failed: dict = None) -> dict:
+    """并发检索所有启用的文献源，返回 {name: [Paper]}
+
+    每个源在独立的守护线程中运行，超过 timeout_sec（默认 DEFAULT_TIMEOUT）
+    或抛出异常时只记录日志并跳过该源，不影响其他源；总耗时取决于最慢的源。
+    回填（options 中带 backfill）不设超时：分片检索可能远超默认时限，
+    超时后线程仍会继续写进度，调用方无法判断回填是否完成。
+    options: {name: 额外构造参数}，如 {"pubmed": {"backfill": checkpoint}}
+    watermarks: {name: 水位线}，传入上次保存的值，成功检索的源会被原地更新
+    failed: 可选的字典，原地写入未完成的源 {name: 原因}（初始化失败、检索失败或超时）
+    """
+    options = options or {}
+    failed = failed if failed is not None else {}
+    results, errors, threads = {}, {}, []
+
+    def _run(name, source):
+        try:
+            results[name] = source.search(date_from, date_to, max_results, seen_ids)
+        except Exception as e:
+            log.error(f"文献源 {name} 检索失败: {e}")
+            errors[name] = f"检索失败: {e}"
+
+    for name, cfg_source in cfg_sources.items():
+        if not cfg_source.get("enabled"):
+            continue
+        try:
+            cls = get_source_class(name)
+            source = cls(cfg_source, cache=cache, **options.get(name, {}))
+            if watermarks is not None:
+                source.watermark = watermarks.get(name)
+        except Exception as e:
+            log.error(f"文献源 {name} 初始化失败: {e}")
+            failed[name] = f"初始化失败: {e}"
+            continue
+        t = threading.Thread(target=_run, args=(name, source), daemon=True,
+                             name=f"source-{name}")
+        t.start()
+        if options.get(name, {}).get("backfill") is not None:
+            deadline = None
+        else:
+            deadline = time.monotonic() + cfg_source.get("timeout_sec", DEFAULT_TIMEOUT)
+        threads.append((name, source, t, deadline))
+
+    papers = {}
+    for name, source, t, deadline in threads:
+        t.join(None if deadline is None else max(0, deadline - time.monotonic()))
+        if t.is_alive():
+            log.error(f"文献源 {name} 检索超时，已跳过")
+            failed[name] = "超时"
+        elif name in results:
+            papers[name] = results[name]
+            if watermarks is not None and source.watermark:
+                watermarks[name] = source.watermark
+        else:
+            failed[name] = errors.get(name, "检索失败")
+    return papers
@@ -1,23 +1,304 @@
 """PubMed 文献源"""
 
-import time
+import os
+import re
+import json
+import math
 import logging
-import requests
-import xml.etree.ElementTree as ET
+import threading
+from .. import net
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List
-from .base import Paper, LiteratureSource
+from urllib.parse import urlencode
+from .base import Paper, LiteratureSource, FetchCache, register
+
+try:  # 安装了 lxml 时使用更快的解析后端，接口与 ElementTree 兼容
+    from lxml.etree import fromstring as _fromstring
+    XML_BACKEND = "lxml"
+except ImportError:
+    from xml.etree.ElementTree import fromstring as _fromstring
+    XML_BACKEND = "etree"
 
 log = logging.getLogger(__name__)
 PUBMED_BASE = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
+# 单个 term 的字符上限，超过则把 OR 列表拆成多个子查询
+MAX_TERM_CHARS = 2000
+# 编码后参数超过此长度时改用 POST，避免 URL 过长
+POST_THRESHOLD = 1800
+# 并行子查询数（仍受下方速率限制约束）
+MAX_WORKERS = 3
+# 回填模式下单个日期分片的结果上限，超过则二分日期窗口（esearch 本身上限 9999）
+SHARD_THRESHOLD = 5000
+ESEARCH_MAX = 9999
+# 本地过滤模式下候选集的上限
+LOCAL_MAX_CANDIDATES = 2000
+EFETCH_BATCH = 50
+# 估算耗时用的单次请求往返时间（秒）
+REQUEST_LATENCY = 0.8
+
+
+class ShardCheckpoint:
+    """回填分片进度：记录已完成的 (查询, 日期类型, 日期窗口) -> PMID 列表，中断后可续跑
+
+    需要继续二分的窗口记为 SPLIT，续跑时无需重新查询命中数。
+    同时保存回填的原始日期范围：次日续跑时沿用该范围，二分出的窗口才能与已完成分片对上。
+    """
+
+    SPLIT = "split"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done = {}
+        self._meta = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # 旧格式（只有分片、没有日期范围）无法确定原始范围，重新开始
+            if "shards" in data:
+                self._done = data["shards"]
+                self._meta = {"days": data.get("days"), "range": data.get("range")}
+
+    def saved_range(self, days: int):
+        """同样天数的未完成回填的原始 (date_from, date_to)，没有则返回 None"""
+        if self._meta.get("days") == days and self._meta.get("range"):
+            return tuple(self._meta["range"])
+        return None
+
+    def begin(self, days: int, date_from: str, date_to: str):
+        """开始新的回填：记录日期范围，丢弃其他范围的进度"""
+        with self._lock:
+            self._meta = {"days": days, "range": [date_from, date_to]}
+            self._done = {}
+            self._save()
+
+    @staticmethod
+    def _key(term: str, date_type: str, date_from: str, date_to: str) -> str:
+        # 改了 date_type 后同一窗口的命中完全不同，不能复用旧进度
+        return f"{date_type}|{date_from}|{date_to}|{term}"
+
+    def get(self, term: str, date_type: str, date_from: str, date_to: str):
+        return self._done.get(self._key(term, date_type, date_from, date_to))
+
+    def put(self, term: str, date_type: str, date_from: str, date_to: str, ids):
+        with self._lock:
+            self._done[self._key(term, date_type, date_from, date_to)] = ids
+            self._save()
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(dict(self._meta, shards=self._done), f)
+        os.replace(tmp, self.path)
+
+    def __len__(self):
+        return sum(1 for v in self._done.values() if v != self.SPLIT)
+
+    def clear(self):
+        """整个回填完成后删除进度文件"""
+        self._done = {}
+        self._meta = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _split_window(date_from: str, date_to: str):
+    """把 YYYY/MM/DD 日期窗口二分；单日窗口无法再分时返回 None"""
+    d0 = datetime.strptime(date_from, "%Y/%m/%d")
+    d1 = datetime.strptime(date_to, "%Y/%m/%d")
+    if d1 <= d0:
+        return None
+    mid = d0 + (d1 - d0) / 2
+    mid = datetime(mid.year, mid.month, mid.day)
+    fmt = "%Y/%m/%d"
+    return ((date_from, mid.strftime(fmt)),
+            ((mid + timedelta(days=1)).strftime(fmt), date_to))
+
+
+def _chunk_or(items: tuple, fmt: str, budget: int) -> List[str]:
+    """把 items 按 fmt 格式化后用 OR 连接，按字符预算贪心切分为多组"""
+    groups, current, size = [], [], 0
+    for item in items:
+        term = fmt.format(item)
+        extra = len(term) + (4 if current else 0)  # " OR "
+        if current and size + extra > budget:
+            groups.append(" OR ".join(current))
+            current, size = [], 0
+            extra = len(term)
+        current.append(term)
+        size += extra
+    if current:
+        groups.append(" OR ".join(current))
+    return groups
+
+
+@lru_cache(maxsize=64)
+def compile_core_terms(journals: tuple, max_chars: int = MAX_TERM_CHARS) -> tuple:
+    """核心期刊子查询（不含日期条件），按配置缓存"""
+    return tuple(f"({g})" for g in _chunk_or(journals, '"{}"[Journal]', max_chars))
+
+
+@lru_cache(maxsize=64)
+def compile_keyword_terms(keywords: tuple, journals: tuple, species: tuple,
+                          max_chars: int = MAX_TERM_CHARS) -> tuple:
+    """关键词 × 扩展期刊子查询（不含日期条件），按配置缓存
+
+    关键词与期刊列表各占一半预算，超长时分别拆分后做笛卡尔积。
+    """
+    species_term = f" AND ({' OR '.join(species)})" if species else ""
+    budget = max(100, (max_chars - len(species_term)) // 2)
+    kw_groups = _chunk_or(keywords, '"{}"[Title/Abstract]', budget)
+    j_groups = _chunk_or(journals, '"{}"[Journal]', budget)
+    return tuple(f"({k}) AND ({j}){species_term}" for k in kw_groups for j in j_groups)
+
+
+def _norm_journal(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", name.lower()).strip()
+
+
+_FIELD_TAG_RE = re.compile(r"\s*\[[^\]]+\]\s*$")
+
+
+class LocalFilter:
+    """本地过滤：期刊名、关键词（标题/摘要/作者关键词）、物种 MeSH、文献类型
+
+    关键词支持 PubMed 风格的 * 截词；物种条目中的 [MeSH] 等字段标记会被去掉，
+    与 MeSH 主题词按不区分大小写的整词比较。
+    """
+
+    def __init__(self, core: tuple, extended: tuple, keywords: tuple, species: tuple,
+                 exclude_types: tuple):
+        self.core = {_norm_journal(j) for j in core}
+        self.extended = {_norm_journal(j) for j in extended}
+        parts = [re.escape(k).replace(r"\*", r"\w*") for k in keywords if k.strip()]
+        self.keyword_re = re.compile(r"\b(?:" + "|".join(parts) + r")\b", re.I) if parts else None
+        self.species = {_FIELD_TAG_RE.sub("", s).strip().lower() for s in species}
+        self.exclude_types = {t.lower() for t in exclude_types}
+
+    def _journal_in(self, paper: Paper, journals: set) -> bool:
+        return _norm_journal(paper.journal_abbr) in journals or _norm_journal(paper.journal) in journals
+
+    def excluded(self, paper: Paper) -> bool:
+        return any(t.lower() in self.exclude_types for t in paper.pub_types)
+
+    def classify(self, paper: Paper):
+        """返回 "core" / "extended" / None（不保留）"""
+        if self.excluded(paper):
+            return None
+        if self._journal_in(paper, self.core):
+            return "core"
+        if self.keyword_re is None or not self._journal_in(paper, self.extended):
+            return None
+        if self.species and not self.species & {m.lower() for m in paper.mesh}:
+            return None
+        text = " ".join([paper.title, paper.abstract] + paper.keywords)
+        return "extended" if self.keyword_re.search(text) else None
+
+
+@lru_cache(maxsize=64)
+def compile_local_filter(core: tuple, extended: tuple, keywords: tuple, species: tuple,
+                         exclude_types: tuple) -> LocalFilter:
+    return LocalFilter(core, extended, keywords, species, exclude_types)
+
+
+def _text(el) -> str:
+    """元素及其子元素的全部文本（保留 <i>/<sup> 等行内标记中的文字）"""
+    return "".join(el.itertext()).strip() if el is not None else ""
+
+
+def parse_article(article) -> Paper | None:
+    """解析单个 PubmedArticle，只使用直接子路径，避免 .// 全树扫描"""
+    try:
+        medline = article.find("MedlineCitation")
+        pmid = medline.findtext("PMID")
+        art = medline.find("Article")
+        title = _text(art.find("ArticleTitle"))
+
+        abstract_parts = []
+        for at in art.iterfind("Abstract/AbstractText"):
+            label = at.get("Label", "")
+            txt = _text(at)
+            abstract_parts.append(f"**{label}**: {txt}" if label else txt)
+        abstract = " ".join(abstract_parts)
+
+        journal_el = art.find("Journal")
+        journal = journal_el.findtext("Title", "")
+        journal_abbr = journal_el.findtext("ISOAbbreviation", "")
+
+        pub_date = journal_el.find("JournalIssue/PubDate")
+        date_str = ""
+        if pub_date is not None:
+            y = pub_date.findtext("Year", "")
+            m = pub_date.findtext("Month", "")
+            d = pub_date.findtext("Day", "")
+            date_str = f"{y} {m} {d}".strip()
+
+        doi = ""
+        for eid in article.iterfind("PubmedData/ArticleIdList/ArticleId"):
+            if eid.get("IdType") == "doi":
+                doi = eid.text or ""
+                break
 
+        authors = []
+        for au in art.iterfind("AuthorList/Author"):
+            last = au.findtext("LastName", "")
+            first = au.findtext("ForeName", "")
+            if last:
+                authors.append(f"{last} {first}".strip())
+
+        url = f"https://doi.org/{doi}" if doi else f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+
+        mesh = [d.text for d in medline.iterfind("MeshHeadingList/MeshHeading/DescriptorName") if d.text]
+        keywords = [_text(k) for k in medline.iterfind("KeywordList/Keyword")]
+        pub_types = [t.text for t in art.iterfind("PublicationTypeList/PublicationType") if t.text]
+
+        return Paper(
+            source="pubmed", source_id=pmid, title=title, abstract=abstract,
+            authors=authors, journal=journal, journal_abbr=journal_abbr,
+            date=date_str, doi=doi, url=url,
+            mesh=mesh, keywords=[k for k in keywords if k], pub_types=pub_types,
+        )
+    except Exception as e:
+        log.warning(f"解析文献失败: {e}")
+        return None
+
+
+def parse_efetch_xml(payload: bytes) -> List[Paper]:
+    """解析 efetch 返回的 PubmedArticleSet（模块级函数，可在子进程中调用）"""
+    root = _fromstring(payload)
+    papers = []
+    for article in root.iterfind("PubmedArticle"):
+        paper = parse_article(article)
+        if paper:
+            papers.append(paper)
+    return papers
+
+
+@register("pubmed")
 class PubMedSource(LiteratureSource):
-    def __init__(self, cfg_pubmed: dict):
+    ENDPOINT = f"{PUBMED_BASE}/einfo.fcgi"
+
+    def __init__(self, cfg_pubmed: dict, cache: FetchCache = None,
+                 backfill: ShardCheckpoint = None):
+        self.cache = cache
+        # 非空时进入回填模式：按日期分片检索全部结果，忽略 max_results
+        self.backfill = backfill
         self.api_key = cfg_pubmed.get("api_key", "")
         self.core_journals = cfg_pubmed.get("core_journals", [])
         self.extended_journals = cfg_pubmed.get("extended_journals", [])
         self.keywords = cfg_pubmed.get("keywords", [])
         self.species_filter = cfg_pubmed.get("species_filter", [])
+        # >0 时用多进程解析 efetch 结果，适合数千篇的回填
+        self.parse_processes = cfg_pubmed.get("parse_processes", 0)
+        # 日期类型：edat（入库日期，默认）/ mhda（MeSH 标引日期）/ pdat（出版日期）
+        self.date_type = cfg_pubmed.get("date_type", "edat")
+        # server：关键词/物种条件交给 esearch；local：按期刊取一次候选集，在本地过滤
+        self.filter_mode = cfg_pubmed.get("filter_mode", "server")
+        self.exclude_types = cfg_pubmed.get("exclude_types", [])
+        self._limiter = net.RateLimiter(10 if self.api_key else 3)
 
     @property
     def name(self) -> str:
@@ -25,36 +306,133 @@ class PubMedSource(LiteratureSource):
 
     def search(self, date_from: str, date_to: str, max_results: int,
                seen_ids: set) -> List[Paper]:
+        # 增量运行：从上次的水位线开始，只检索真正新增的部分
+        if self.watermark and self.backfill is None:
+            date_from = self.watermark
+        log.info(f"  PubMed [{self.date_type.upper()}] {date_from} ~ {date_to}")
+        if self.filter_mode == "local":
+            core_papers, kw_papers = self._search_local(date_from, date_to, max_results, seen_ids)
+        else:
+            core_papers, kw_papers = self._search_server(date_from, date_to, max_results, seen_ids)
+
+        # 标记搜索类型
+        for p in core_papers:
+            p.categories = ["core"]
+        for p in kw_papers:
+            p.categories = ["extended"]
+
+        # E-utilities 日期参数精度为天，下一次从今天开始（当天重复部分由 seen_ids 去重）
+        self.watermark = date_to
+        return core_papers + kw_papers
+
+    def _search_server(self, date_from: str, date_to: str, max_results: int, seen_ids: set):
         core_papers = []
         kw_papers = []
 
         # 核心期刊搜索
         if self.core_journals:
             log.info("检索核心期刊...")
-            core_query = self._build_core_query(date_from, date_to)
-            core_pmids = self._esearch(core_query, max_results)
+            core_terms = compile_core_terms(tuple(self.core_journals))
+            core_pmids = self._find_ids(core_terms, date_from, date_to, max_results)
             core_pmids = [p for p in core_pmids if p not in seen_ids]
             log.info(f"  核心期刊新文献: {len(core_pmids)} 篇")
-            time.sleep(0.15)
             core_papers = self._efetch(core_pmids)
 
         # 关键词扩展搜索
         if self.keywords and self.extended_journals:
             log.info("检索关键词扩展期刊...")
-            kw_query = self._build_keyword_query(date_from, date_to)
-            kw_pmids = self._esearch(kw_query, max_results)
+            kw_terms = compile_keyword_terms(tuple(self.keywords), tuple(self.extended_journals),
+                                             tuple(self.species_filter))
+            kw_pmids = self._find_ids(kw_terms, date_from, date_to, max_results)
             core_ids = {p.source_id for p in core_papers}
             kw_pmids = [p for p in kw_pmids if p not in seen_ids and p not in core_ids]
             log.info(f"  扩展期刊新文献: {len(kw_pmids)} 篇")
             kw_papers = self._efetch(kw_pmids)
+        return core_papers, kw_papers
 
-        # 标记搜索类型
-        for p in core_papers:
-            p.categories = ["core"]
-        for p in kw_papers:
-            p.categories = ["extended"]
+    def _search_local(self, date_from: str, date_to: str, max_results: int, seen_ids: set):
+        """按核心+扩展期刊检索一次候选集，下载后在本地分类过滤
 
-        return core_papers + kw_papers
+        候选检索只依赖期刊列表，修改关键词/物种/类型条件后重跑可直接命中缓存。
+        """
+        journals = tuple(dict.fromkeys(self.core_journals + self.extended_journals))
+        if not journals:
+            return [], []
+        log.info("检索候选文献（本地过滤模式）...")
+        terms = compile_core_terms(journals)
+        limit = max(max_results, LOCAL_MAX_CANDIDATES)  # 回填模式下不受此限
+        pmids = [p for p in self._find_ids(terms, date_from, date_to, limit) if p not in seen_ids]
+        candidates = self._efetch(pmids)
+        matcher = compile_local_filter(tuple(self.core_journals), tuple(self.extended_journals),
+                                       tuple(self.keywords), tuple(self.species_filter),
+                                       tuple(self.exclude_types))
+        groups = {"core": [], "extended": []}
+        dropped = 0
+        for p in candidates:
+            kind = matcher.classify(p)
+            if kind:
+                groups[kind].append(p)
+            elif matcher.excluded(p):
+                dropped += 1
+        if self.backfill is None:
+            groups = {k: v[:max_results] for k, v in groups.items()}
+        log.info(f"  候选 {len(candidates)} 篇 → 核心 {len(groups['core'])} 篇，"
+                 f"扩展 {len(groups['extended'])} 篇（排除类型 {dropped} 篇）")
+        return groups["core"], groups["extended"]
+
+    def plan(self, date_from: str, date_to: str, max_results: int) -> dict:
+        """用 rettype=count 查询各组命中数，估算下载批次与耗时，不下载文献
+
+        拆分的子查询之间可能重叠，命中数按上限计；不扣除已推送过的文献。
+        """
+        if self.watermark and self.backfill is None:
+            date_from = self.watermark
+        groups = {}
+        if self.filter_mode == "local":
+            journals = tuple(dict.fromkeys(self.core_journals + self.extended_journals))
+            if journals:
+                groups["candidates"] = (compile_core_terms(journals),
+                                        max(max_results, LOCAL_MAX_CANDIDATES))
+        else:
+            if self.core_journals:
+                groups["core"] = (compile_core_terms(tuple(self.core_journals)), max_results)
+            if self.keywords and self.extended_journals:
+                groups["extended"] = (compile_keyword_terms(
+                    tuple(self.keywords), tuple(self.extended_journals),
+                    tuple(self.species_filter)), max_results)
+
+        detail, papers, searches = {}, 0, 0
+        for name, (terms, cap) in groups.items():
+            count = sum(self._count(t, date_from, date_to) for t in terms)
+            detail[name] = count
+            if self.backfill is not None:
+                # 回填不受 max_results 限制，命中数多的窗口要分片：
+                # 每个分片先查命中数，不再二分的分片再取一次 PMID
+                papers += count
+                leaves = max(1, math.ceil(count / SHARD_THRESHOLD))
+                searches += len(terms) * (3 * leaves - 1)
+            else:
+                papers += min(count, cap)
+                searches += len(terms)
+        fetches = math.ceil(papers / EFETCH_BATCH)
+        requests = searches + fetches
+        seconds = requests * max(self._limiter.interval, REQUEST_LATENCY / MAX_WORKERS)
+        return {"papers": papers, "requests": requests, "seconds": seconds,
+                "detail": dict(detail, esearch=searches, efetch=fetches)}
+
+    def _count(self, query: str, date_from: str, date_to: str) -> int:
+        resp = self._request(
+            "esearch.fcgi",
+            self._params({"term": query, "rettype": "count", "datetype": self.date_type,
+                          "mindate": date_from, "maxdate": date_to}),
+            timeout=30,
+        )
+        return int(resp.json().get("esearchresult", {}).get("count", 0))
+
+    @classmethod
+    def group(cls, papers: List[Paper]):
+        return {"core": [p for p in papers if "core" in p.categories],
+                "extended": [p for p in papers if "extended" in p.categories]}
 
     # --- PubMed API ---
 
@@ -66,94 +444,131 @@ class PubMedSource(LiteratureSource):
             params.update(extra)
         return params
 
-    def _esearch(self, query: str, retmax: int) -> List[str]:
-        resp = requests.get(
-            f"{PUBMED_BASE}/esearch.fcgi",
-            params=self._params({"term": query, "retmax": retmax, "sort": "pub_date"}),
+    def _request(self, endpoint: str, params: dict, timeout: int):
+        """发起 E-utilities 请求：经磁盘缓存，受速率限制，参数过长时自动改用 POST"""
+        method = "POST" if len(urlencode(params)) > POST_THRESHOLD else "GET"
+        return net.request(method, f"{PUBMED_BASE}/{endpoint}", params,
+                           kind=endpoint.split(".")[0], timeout=timeout,
+                           throttle=self._limiter.wait)
+
+    def _esearch(self, query: str, retmax: int, date_from: str, date_to: str) -> List[str]:
+        return self._esearch_count(query, retmax, date_from, date_to)[0]
+
+    def _esearch_count(self, query: str, retmax: int, date_from: str, date_to: str):
+        """返回 (PMID 列表, 总命中数)；日期范围通过 datetype/mindate/maxdate 参数指定"""
+        key = ("pubmed", query, retmax, self.date_type, date_from, date_to)
+        if self.cache is not None and key in self.cache.searches:
+            ids, count = self.cache.searches[key]
+            return list(ids), count
+        resp = self._request(
+            "esearch.fcgi",
+            self._params({"term": query, "retmax": retmax, "sort": "pub_date",
+                          "datetype": self.date_type, "mindate": date_from, "maxdate": date_to}),
             timeout=30,
         )
-        resp.raise_for_status()
-        return resp.json().get("esearchresult", {}).get("idlist", [])
+        result = resp.json().get("esearchresult", {})
+        ids = result.get("idlist", [])
+        count = int(result.get("count", len(ids)))
+        if self.cache is not None:
+            self.cache.searches[key] = (list(ids), count)
+        return ids, count
+
+    def _find_ids(self, terms, date_from: str, date_to: str, max_results: int) -> List[str]:
+        if self.backfill is not None:
+            return self._esearch_sharded(terms, date_from, date_to)
+        return self._esearch_many(list(terms), max_results, date_from, date_to)
+
+    def _esearch_sharded(self, terms, date_from: str, date_to: str) -> List[str]:
+        """回填模式：按日期窗口分片检索，命中数超过阈值的窗口继续二分
+
+        同一层的分片并行执行（受速率限制），已完成分片写入 checkpoint。
+        """
+        pending = [(t, date_from, date_to) for t in terms]
+        merged = set()
+        shards = 0
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            while pending:
+                results = list(pool.map(lambda job: self._search_shard(*job), pending))
+                next_pending = []
+                for (term, d0, d1), ids in zip(pending, results):
+                    if ids is None:
+                        halves = _split_window(d0, d1)
+                        next_pending.extend((term, a, b) for a, b in halves)
+                    else:
+                        merged.update(ids)
+                        shards += 1
+                pending = next_pending
+        log.info(f"  回填分片 {shards} 个，共 {len(merged)} 篇")
+        return sorted(merged, key=int, reverse=True)
+
+    def _search_shard(self, term: str, date_from: str, date_to: str):
+        """检索单个分片；命中数超过阈值且可再分时返回 None
+
+        先用 rettype=count 只取命中数，要二分的窗口不必下载数千个 PMID
+        """
+        done = self.backfill.get(term, self.date_type, date_from, date_to)
+        if done == ShardCheckpoint.SPLIT:
+            return None
+        if done is not None:
+            return done
+        count = self._count(term, date_from, date_to)
+        retmax = SHARD_THRESHOLD
+        if count > SHARD_THRESHOLD:
+            if _split_window(date_from, date_to) is not None:
+                self.backfill.put(term, self.date_type, date_from, date_to, ShardCheckpoint.SPLIT)
+                return None
+            log.warning(f"  单日 {date_from} 命中 {count} 篇，超过 esearch 上限将被截断")
+            retmax = ESEARCH_MAX
+        ids = self._esearch(term, retmax, date_from, date_to) if count else []
+        self.backfill.put(term, self.date_type, date_from, date_to, ids)
+        return ids
+
+    def _esearch_many(self, queries: List[str], retmax: int, date_from: str,
+                      date_to: str) -> List[str]:
+        """并行执行拆分后的子查询，合并去重后按 PMID 倒序（近似入库时间）截断"""
+        if len(queries) == 1:
+            return self._esearch(queries[0], retmax, date_from, date_to)
+        log.info(f"  查询过长，拆分为 {len(queries)} 个子查询")
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            results = list(pool.map(lambda q: self._esearch(q, retmax, date_from, date_to),
+                                    queries))
+        merged = {pmid for ids in results for pmid in ids}
+        return sorted(merged, key=int, reverse=True)[:retmax]
 
     def _efetch(self, pmids: List[str]) -> List[Paper]:
         if not pmids:
             return []
-        papers = []
-        for i in range(0, len(pmids), 50):
-            batch = pmids[i:i + 50]
-            params = {"db": "pubmed", "id": ",".join(batch), "retmode": "xml"}
-            if self.api_key:
-                params["api_key"] = self.api_key
-            resp = requests.get(f"{PUBMED_BASE}/efetch.fcgi", params=params, timeout=60)
-            resp.raise_for_status()
-            root = ET.fromstring(resp.text)
-            for article in root.findall(".//PubmedArticle"):
-                paper = self._parse_article(article)
-                if paper:
-                    papers.append(paper)
-            time.sleep(0.15)
-        return papers
-
-    def _parse_article(self, article) -> Paper | None:
-        try:
-            medline = article.find(".//MedlineCitation")
-            pmid = medline.findtext(".//PMID")
-            art = medline.find(".//Article")
-            title = art.findtext(".//ArticleTitle", "")
-
-            abstract_parts = []
-            for at in art.findall(".//Abstract/AbstractText"):
-                label = at.get("Label", "")
-                txt = ET.tostring(at, encoding="unicode", method="text").strip()
-                abstract_parts.append(f"**{label}**: {txt}" if label else txt)
-            abstract = " ".join(abstract_parts)
-
-            journal = art.findtext(".//Journal/Title", "")
-            journal_abbr = art.findtext(".//Journal/ISOAbbreviation", "")
-
-            pub_date = art.find(".//Journal/JournalIssue/PubDate")
-            date_str = ""
-            if pub_date is not None:
-                y = pub_date.findtext("Year", "")
-                m = pub_date.findtext("Month", "")
-                d = pub_date.findtext("Day", "")
-                date_str = f"{y} {m} {d}".strip()
-
-            doi = ""
-            for eid in article.findall(".//ArticleIdList/ArticleId"):
-                if eid.get("IdType") == "doi":
-                    doi = eid.text or ""
-                    break
-
-            authors = []
-            for au in art.findall(".//AuthorList/Author"):
-                last = au.findtext("LastName", "")
-                first = au.findtext("ForeName", "")
-                if last:
-                    authors.append(f"{last} {first}".strip())
-
-            url = f"https://doi.org/{doi}" if doi else f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
-
-            return Paper(
-                source="pubmed", source_id=pmid, title=title, abstract=abstract,
-                authors=authors, journal=journal, journal_abbr=journal_abbr,
-                date=date_str, doi=doi, url=url,
-            )
-        except Exception as e:
-            log.warning(f"解析文献失败: {e}")
-            return None
+        if self.cache is None:
+            return self._efetch_remote(pmids)
+        # 只下载缓存中没有的 PMID，其余直接复用
+        missing = [p for p in pmids if (self.name, p) not in self.cache.papers]
+        if len(missing) < len(pmids):
+            log.info(f"  复用已下载文献 {len(pmids) - len(missing)} 篇")
+        for paper in self._efetch_remote(missing):
+            self.cache.put_paper(paper)
+        papers = (self.cache.get_paper(self.name, p) for p in pmids)
+        return [p for p in papers if p is not None]
 
-    # --- 查询构建 ---
-
-    def _build_core_query(self, date_from, date_to):
-        journals = " OR ".join(f'"{j}"[Journal]' for j in self.core_journals)
-        return f'({journals}) AND ("{date_from}"[PDAT] : "{date_to}"[PDAT])'
+    def _efetch_remote(self, pmids: List[str]) -> List[Paper]:
+        if not pmids:
+            return []
+        batches = [pmids[i:i + EFETCH_BATCH] for i in range(0, len(pmids), EFETCH_BATCH)]
+        if len(batches) == 1:
+            return parse_efetch_xml(self._efetch_batch(batches[0]))
+        # 多批次并行下载，速率仍由 _request 统一限制
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            payloads = list(pool.map(self._efetch_batch, batches))
+        if self.parse_processes > 0:
+            # 大批量回填时在多进程中解析 XML
+            with ProcessPoolExecutor(max_workers=self.parse_processes) as pool:
+                results = list(pool.map(parse_efetch_xml, payloads))
+        else:
+            results = [parse_efetch_xml(x) for x in payloads]
+        return [p for batch in results for p in batch]
 
-    def _build_keyword_query(self, date_from, date_to):
-        journals = " OR ".join(f'"{j}"[Journal]' for j in self.extended_journals)
-        keywords = " OR ".join(f'"{k}"[Title/Abstract]' for k in self.keywords)
-        query = f'({keywords}) AND ({journals}) AND ("{date_from}"[PDAT] : "{date_to}"[PDAT])'
-        if self.species_filter:
-            species = " OR ".join(self.species_filter)
-            query += f" AND ({species})"
-        return query
+    def _efetch_batch(self, batch: List[str]) -> bytes:
+        params = {"db": "pubmed", "id": ",".join(batch), "retmode": "xml"}
+        if self.api_key:
+            params["api_key"] = self.api_key
+        resp = self._request("efetch.fcgi", params, timeout=60)
+        return resp.content
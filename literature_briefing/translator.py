@@ -1,14 +1,51 @@
 """翻译逻辑"""
 
-import time
+import re
+import json
 import logging
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor, Future
 from typing import List
 from .sources.base import Paper
-from .llm.base import LLMProvider
+from .llm.base import LLMProvider, service_key, worker_pools
+from .prefilter import SkipStats, title_translation, abstract_translation, is_chinese
 
 log = logging.getLogger(__name__)
 
 SYSTEM_PROMPT = "你是专业的学术翻译。将以下英文学术文本翻译成中文，保持术语准确。只输出译文，不要添加任何解释或前缀。"
+# 多目标语言：一次调用输出所有语言，增加语言只增加输出 token
+MULTI_SYSTEM_PROMPT = ("你是专业的学术翻译。将以下学术文本分别翻译成：{names}，保持术语准确。"
+                       "只输出一个 JSON 对象，键为语言代码（{codes}），值为对应译文，不要添加任何解释。")
+LANGUAGE_NAMES = {"zh": "简体中文", "en": "English", "ja": "日本語", "ko": "한국어",
+                  "de": "Deutsch", "fr": "Français", "es": "Español"}
+SOURCE_LANGUAGE = "en"  # 文献源的原文语言，作为目标语言时直接使用原文
+
+# 结构化摘要的 "**LABEL**: " 分段（见 PubMed parse_article）
+_SECTION_RE = re.compile(r"(?=\*\*[^*]+\*\*: )")
+# 句末标点 + 空白 + 大写/数字/括号开头视为句子边界
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9(\[])")
+
+
+def split_abstract(text: str, max_chars: int) -> List[str]:
+    """按结构化分段、再按句子把摘要切成不超过 max_chars 的块（单句超长时保留整句）"""
+    pieces = []
+    for section in _SECTION_RE.split(text):
+        section = section.strip()
+        if not section:
+            continue
+        if len(section) <= max_chars:
+            pieces.append(section)
+        else:
+            pieces.extend(s for s in _SENTENCE_RE.split(section) if s.strip())
+
+    # 相邻的短块合并，减少调用次数
+    chunks = []
+    for piece in pieces:
+        if chunks and len(chunks[-1]) + 1 + len(piece) <= max_chars:
+            chunks[-1] += " " + piece
+        else:
+            chunks.append(piece)
+    return chunks
 
 
 def translate_text(llm: LLMProvider, text: str) -> str:
@@ -21,14 +58,168 @@ def translate_text(llm: LLMProvider, text: str) -> str:
         return text
 
 
-def translate_papers(llm: LLMProvider, papers: List[Paper]):
+def translate_multi(llm: LLMProvider, text: str, langs: List[str]) -> dict:
+    """一次调用翻译成多种语言，返回 {语言: 译文}；失败或缺失的语言保留原文"""
+    if not text or not text.strip():
+        return {lang: text for lang in langs}
+    system = MULTI_SYSTEM_PROMPT.format(
+        names="、".join(f"{LANGUAGE_NAMES.get(lang, lang)}（{lang}）" for lang in langs),
+        codes=", ".join(langs))
+    try:
+        reply = llm.call(text, system=system)
+        # 部分模型会把 JSON 包在 ```json 代码块里
+        data = json.loads(reply[reply.find("{"):reply.rfind("}") + 1])
+    except Exception as e:
+        log.warning(f"翻译失败，保留原文: {e}")
+        return {lang: text for lang in langs}
+    missing = [lang for lang in langs if not isinstance(data.get(lang), str)]
+    if missing:
+        log.warning(f"译文缺少语言 {missing}，保留原文")
+    return {lang: data[lang].strip() if lang not in missing else text for lang in langs}
+
+
+def _translate_unit(llm: LLMProvider, text: str, langs: List[str]) -> dict:
+    if langs == ["zh"]:  # 只有中文时沿用纯文本提示，不付 JSON 的开销
+        return {"zh": translate_text(llm, text)}
+    return translate_multi(llm, text, langs)
+
+
+def _done(value) -> Future:
+    f = Future()
+    f.set_result(value)
+    return f
+
+
+class _Merged:
+    """在另一个 Future 的结果上补充固定译文（预筛给出的中文）"""
+
+    def __init__(self, future: Future, fixed: dict):
+        self.future = future
+        self.fixed = fixed
+
+    def result(self) -> dict:
+        return dict(self.future.result(), **self.fixed)
+
+
+def translate_papers(llm: LLMProvider, papers: List[Paper], cache: dict = None,
+                     chunk_chars: int = 1000, workers: int = 4, progress=None,
+                     title_llm: LLMProvider = None, languages: List[str] = None) -> SkipStats:
+    """并发翻译标题和摘要，返回预筛跳过的调用统计
+
+    cache: 可选的 (source, source_id) -> {语言: (标题译文, 摘要译文)} 字典，
+    多配置运行时共享，同一篇文献的同一语言只翻译一次。
+    chunk_chars: 摘要按段落/句子切块的长度上限，各块并发翻译后按顺序拼接；
+    为 0 时沿用旧行为，只翻译前 800 字符。
+    workers: 未设置 concurrency 的提供商的并发数；标题与摘要走不同服务时各用一个线程池
+    （见 worker_pools），走同一服务时共用。
+    progress: 可选的 Progress，每完成一篇推进一次；取消时放弃尚未开始的请求。
+    title_llm: 标题翻译所用的模型，默认与摘要相同。
+    languages: 目标语言代码列表，默认 ["zh"]；每个标题/摘要块一次调用得到所有语言。
+    中文写入 title_zh / abstract_zh，其他语言写入 translations；英文即原文，不调用 LLM
+    （原文是中文时例外：英文译文写入 translations["en"]）。
+    不需要 LLM 的文本（见 prefilter）只对中文直接给出结果，其他目标语言仍需翻译；
+    本次运行中相同的文本只翻译一次。
+    """
+    title_llm = title_llm or llm
+    targets = list(dict.fromkeys(languages or ["zh"]))
+    langs = [lang for lang in targets if lang != SOURCE_LANGUAGE]
     total = len(papers)
-    for idx, p in enumerate(papers):
-        log.info(f"  翻译 [{idx + 1}/{total}] {p.source_id}")
-        p.title_zh = translate_text(llm, p.title)
-        time.sleep(0.2)
-        abstract_raw = p.abstract
-        if len(abstract_raw) > 800:
-            abstract_raw = abstract_raw[:800] + "..."
-        p.abstract_zh = translate_text(llm, abstract_raw)
-        time.sleep(0.3)
+    jobs = []
+    skipped = SkipStats()
+    submitted = {}  # (模型, 原文, 语言) -> Future
+
+    def submit(model, text, unit_langs=None):
+        unit_langs = langs if unit_langs is None else unit_langs
+        if not text.strip() or not unit_langs:
+            return _done({lang: text for lang in unit_langs})
+        key = (id(model), text, tuple(unit_langs))
+        if key in submitted:
+            skipped.add("重复文本", text)
+        else:
+            submitted[key] = pools[service_key(model)].submit(_translate_unit, model, text, unit_langs)
+        return submitted[key]
+
+    def skip(model, reason, text, zh):
+        """预筛结论只用于中文（如通知前缀、已是中文）；其他目标语言照常翻译，
+        原文是中文时英文也要翻译"""
+        others = [lang for lang in (targets if is_chinese(text) else langs) if lang != "zh"]
+        fixed = {"zh": zh} if "zh" in langs else {}
+        if not others:
+            skipped.add(reason, text)
+            return _done(fixed)
+        return _Merged(submit(model, text, others), fixed)
+
+    def cached(p):
+        entry = cache.get((p.source, p.source_id)) if cache is not None else None
+        return entry if entry is not None and all(lang in entry for lang in langs) else None
+
+    if not langs and SOURCE_LANGUAGE not in targets:
+        return skipped
+    if progress is not None:
+        progress.stage("translate", total=sum(1 for p in papers if cached(p) is None))
+    with ExitStack() as stack:
+        pools = {key: stack.enter_context(ThreadPoolExecutor(max_workers=max(1, size)))
+                 for key, size in worker_pools((llm, title_llm), workers).items()}
+        for p in papers:
+            entry = cached(p)
+            if entry is not None:
+                _apply(p, {lang: v for lang, v in entry.items() if lang in targets})
+                continue
+            title_zh, reason = title_translation(p)
+            if title_zh is None:
+                title_future = submit(title_llm, p.title)
+            else:
+                title_future = skip(title_llm, reason, p.title, title_zh)
+
+            abstract_zh, reason = abstract_translation(p)
+            if abstract_zh == "=title":
+                skipped.add(reason, p.abstract)
+                chunk_futures = [title_future]
+            elif abstract_zh is not None:
+                chunk_futures = [skip(llm, reason, p.abstract, abstract_zh)]
+            else:
+                if chunk_chars > 0:
+                    chunks = split_abstract(p.abstract, chunk_chars)
+                else:
+                    abstract_raw = p.abstract
+                    if len(abstract_raw) > 800:
+                        abstract_raw = abstract_raw[:800] + "..."
+                    chunks = [abstract_raw]
+                chunk_futures = [submit(llm, c) for c in chunks]
+            jobs.append((p, title_future, chunk_futures))
+
+        for idx, (p, title_future, chunk_futures) in enumerate(jobs):
+            if progress is not None and progress.cancelled:
+                for pool in pools.values():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                progress.check()
+            titles = title_future.result()
+            chunks = [f.result() for f in chunk_futures]
+            result = {lang: (titles[lang], " ".join(c[lang] for c in chunks)) for lang in langs}
+            # 只有中文原文才有英文译文；英文原文的块不带 "en"
+            if SOURCE_LANGUAGE in targets:
+                en = (titles.get("en", p.title),
+                      " ".join(c["en"] for c in chunks) if all("en" in c for c in chunks) else p.abstract)
+                if en != (p.title, p.abstract):
+                    result["en"] = en
+            _apply(p, result)
+            log.info(f"  翻译 [{idx + 1}/{len(jobs)}] {p.source_id}（摘要 {len(chunk_futures)} 段）")
+            # 翻译失败不缓存
+            if cache is not None and any(t != p.title for t, _ in result.values()):
+                cache[(p.source, p.source_id)] = dict(cache.get((p.source, p.source_id)) or {}, **result)
+            if progress is not None:
+                progress.advance(source_id=p.source_id)
+    if len(jobs) < total:
+        log.info(f"  复用已有翻译 {total - len(jobs)} 篇")
+    if skipped.total:
+        log.info(f"  {skipped.summary()}")
+    return skipped
+
+
+def _apply(paper: Paper, result: dict):
+    """{语言: (标题, 摘要)} 写入 Paper；translations 整体替换，不修改共享的旧字典"""
+    if "zh" in result:
+        paper.title_zh, paper.abstract_zh = result["zh"]
+    others = {lang: list(v) for lang, v in result.items() if lang != "zh"}
+    if others:
+        paper.translations = dict(paper.translations, **others)
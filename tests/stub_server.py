@@ -0,0 +1,68 @@
+"""测试用的本地替身 HTTP 服务
+
+处理函数接收 StubRequest，返回 (状态码, 响应头, 正文)；正文为 dict/list 时按 JSON 发送。
+所有请求按顺序记录在 server.requests 中，便于断言请求次数与参数。
+"""
+
+import json
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+@dataclass
+class StubRequest:
+    method: str
+    path: str
+    query: dict  # 参数名 -> 值（只取第一个）
+    headers: dict
+    body: bytes
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class StubServer:
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                req = StubRequest(self.command, parts.path,
+                                  {k: v[0] for k, v in parse_qs(parts.query).items()},
+                                  dict(self.headers), self.rfile.read(length))
+                stub.requests.append(req)
+                status, headers, body = stub.handler(req)
+                if isinstance(body, (dict, list)):
+                    body = json.dumps(body).encode("utf-8")
+                    headers = dict({"Content-Type": "application/json"}, **headers)
+                elif isinstance(body, str):
+                    body = body.encode("utf-8")
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_HEAD = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
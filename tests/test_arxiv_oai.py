@@ -0,0 +1,129 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from literature_briefing import net
+from literature_briefing.sources import arxiv
+from literature_briefing.sources.arxiv import ArxivSource
+from literature_briefing.sources.base import FetchCache
+from tests.stub_server import StubServer
+
+RECORD = """<record><header><identifier>oai:arXiv.org:{id}</identifier>
+<datestamp>{stamp}</datestamp></header><metadata>
+<arXiv xmlns="http://arxiv.org/OAI/arXiv/"><id>{id}</id><created>{created}</created>
+<authors><author><keyname>Doe</keyname><forenames>Jane</forenames></author></authors>
+<title>Paper {id}</title><categories>{cats}</categories><abstract>Neural {id}</abstract>
+</arXiv></metadata></record>"""
+
+
+def page(records, token=""):
+    body = "".join(RECORD.format(**r) for r in records)
+    return ('<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/"><ListRecords>'
+            f"{body}<resumptionToken>{token}</resumptionToken></ListRecords></OAI-PMH>")
+
+
+def rec(arxiv_id, created, stamp="2026-10-13", cats="q-bio.NC"):
+    return {"id": arxiv_id, "created": created, "stamp": stamp, "cats": cats}
+
+
+# 第一页带 resumptionToken，第二页结束
+PAGES = {
+    None: page([rec("2610.00001", "2026-10-12"),  # 周末提交，公布日在 from 之后
+                rec("2610.00002", "2026-10-13", cats="q-bio.GN")], token="tok-1"),
+    "tok-1": page([rec("2610.00003", "2026-10-13", stamp="2026-10-14"),
+                   rec("2401.00009", "2024-01-05")]),  # 旧文献的版本更新
+}
+
+
+def paging_handler(req):
+    return 200, {"Content-Type": "text/xml"}, PAGES[req.query.get("resumptionToken")]
+
+
+def source(cache=None):
+    return ArxivSource({"categories": ["q-bio.NC"], "harvest_mode": "oai"}, cache)
+
+
+class ArxivOAITest(unittest.TestCase):
+    def setUp(self):
+        net.configure_cache("", "off")
+        self.addCleanup(net.configure_cache, "", "off")
+        for name, value in (("_limiter", net.RateLimiter(1000)), ("OAI_MAX_WAIT", 5)):
+            patcher = mock.patch.object(arxiv, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def serve(self, handler):
+        server = StubServer(handler).__enter__()
+        self.addCleanup(server.__exit__)
+        patcher = mock.patch.object(arxiv, "ARXIV_OAI", server.url + "/oai")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return server
+
+    def test_resumption_token_paging(self):
+        srv = self.serve(paging_handler)
+        src = source()
+        papers = src.search("2026/10/13", "2026/10/14", 100, set())
+
+        first, second = srv.requests
+        self.assertEqual(first.query, {"verb": "ListRecords", "metadataPrefix": "arXiv",
+                                       "set": "q-bio", "from": "2026-10-13", "until": "2026-10-14"})
+        # 续页只带 verb 与 resumptionToken
+        self.assertEqual(second.query, {"verb": "ListRecords", "resumptionToken": "tok-1"})
+        # 分类不符与旧文献版本更新被过滤；created 早于 from 的新提交保留
+        self.assertEqual([p.source_id for p in papers], ["2610.00003", "2610.00001"])
+        self.assertEqual(papers[0].authors, ["Jane Doe"])
+        self.assertEqual(src.watermark, "2026-10-14")
+
+    def test_retry_after_on_503(self):
+        calls = []
+
+        def handler(req):
+            calls.append(req)
+            if len(calls) == 1:
+                return 503, {"Retry-After": "30"}, "busy"
+            return 200, {"Content-Type": "text/xml"}, page([rec("2610.00001", "2026-10-13")])
+
+        self.serve(handler)
+        with mock.patch.object(arxiv, "time") as fake_time:
+            papers = source().search("2026/10/13", "2026/10/14", 100, set())
+        fake_time.sleep.assert_called_once_with(5)  # 按 OAI_MAX_WAIT 截断
+        self.assertEqual(len(calls), 2)
+        self.assertEqual([p.source_id for p in papers], ["2610.00001"])
+
+    def test_gives_up_after_retries(self):
+        srv = self.serve(lambda req: (503, {"Retry-After": "1"}, "busy"))
+        with mock.patch.object(arxiv, "time"):
+            with self.assertRaises(arxiv.requests.HTTPError):
+                source().search("2026/10/13", "2026/10/14", 100, set())
+        self.assertEqual(len(srv.requests), arxiv.OAI_RETRIES + 1)
+
+    def test_record_then_replay(self):
+        srv = self.serve(paging_handler)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            net.configure_cache(cache_dir, "record")
+            recorded = source().search("2026/10/13", "2026/10/14", 100, set())
+            sent = len(srv.requests)
+
+            net.configure_cache(cache_dir, "replay")
+            replayed = source().search("2026/10/13", "2026/10/14", 100, set())
+            self.assertEqual(len(srv.requests), sent)  # 回放不发请求
+            self.assertEqual([p.source_id for p in replayed], [p.source_id for p in recorded])
+
+            # 回放缺少的请求直接报错，不会退回网络
+            with self.assertRaises(RuntimeError):
+                source().search("2026/10/20", "2026/10/21", 100, set())
+        self.assertEqual(len(srv.requests), sent)
+
+    def test_fetch_cache_shared_between_runs(self):
+        srv = self.serve(paging_handler)
+        cache = FetchCache()
+        source(cache).search("2026/10/13", "2026/10/14", 100, set())
+        sent = len(srv.requests)
+        papers = source(cache).search("2026/10/13", "2026/10/14", 100, {"2610.00003"})
+        self.assertEqual(len(srv.requests), sent)
+        self.assertEqual([p.source_id for p in papers], ["2610.00001"])
+
+
+if __name__ == "__main__":
+    unittest.main()
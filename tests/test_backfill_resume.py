@@ -0,0 +1,82 @@
+import os
+import copy
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from literature_briefing import main, net
+from literature_briefing.config import DEFAULT_CONFIG
+from literature_briefing.sources.base import FetchCache
+from literature_briefing.sources.pubmed import PubMedSource
+
+
+class BackfillResumeTest(unittest.TestCase):
+    def setUp(self):
+        net.configure_cache("", "off")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        cfg = copy.deepcopy(DEFAULT_CONFIG)
+        cfg.update(output_path=self.tmp.name, output_folder="out")
+        cfg["llm"]["api_key"] = ""
+        cfg["sources"]["pubmed"]["enabled"] = True
+        cfg["sources"]["arxiv"]["enabled"] = False
+        self.cfg = cfg
+        self.dir = os.path.join(self.tmp.name, "out")
+        self.checkpoint = os.path.join(self.dir, main.BACKFILL_FILE)
+
+    def run_backfill(self, search):
+        with mock.patch.object(PubMedSource, "search", search):
+            return main.run_profile(self.cfg, FetchCache(), {}, backfill_days=30)
+
+    def state(self):
+        with open(os.path.join(self.dir, main.STATE_FILE), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_failed_backfill_keeps_progress(self):
+        def fail(source, *args):
+            source.backfill.put("x", source.date_type, "2026/09/19", "2026/10/19", ["1"])
+            raise RuntimeError("esearch 503")
+
+        total, _ = self.run_backfill(fail)
+        self.assertEqual(total, 0)
+        self.assertTrue(os.path.exists(self.checkpoint))
+        self.assertIsNone(self.state()["last_fetch"])
+
+    def test_completed_backfill_clears_progress(self):
+        def ok(source, *args):
+            source.backfill.put("x", source.date_type, "2026/09/19", "2026/10/19", [])
+            return []
+
+        self.run_backfill(ok)
+        self.assertFalse(os.path.exists(self.checkpoint))
+        self.assertIsNotNone(self.state()["last_fetch"])
+
+    def test_resumed_next_day_keeps_original_range(self):
+        ranges = []
+
+        def fail(source, date_from, date_to, *args):
+            ranges.append((date_from, date_to))
+            raise RuntimeError("esearch 503")
+
+        self.run_backfill(fail)
+
+        class Tomorrow(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.now(tz) + timedelta(days=1)
+
+        with mock.patch.object(main, "datetime", Tomorrow):
+            self.run_backfill(fail)
+        self.assertEqual(ranges[0], ranges[1])
+
+        # 换了回填天数则按新范围重新开始
+        with mock.patch.object(main, "datetime", Tomorrow):
+            with mock.patch.object(PubMedSource, "search", fail):
+                main.run_profile(self.cfg, FetchCache(), {}, backfill_days=60)
+        self.assertNotEqual(ranges[2][0], ranges[0][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
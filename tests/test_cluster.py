@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+
+from literature_briefing import cluster
+from literature_briefing.cluster import EmbeddingCache, LocalEmbedder, cluster_papers, embed_papers, kmeans
+from literature_briefing.sources.base import Paper
+
+np = cluster.np
+
+# 三个词汇互不重叠的主题
+TOPICS = {
+    "sleep": "sleep circadian melatonin insomnia rhythm nocturnal",
+    "cancer": "tumor oncogene metastasis chemotherapy carcinoma malignant",
+    "plant": "photosynthesis chloroplast arabidopsis leaf root seedling",
+}
+
+
+def topic_papers(per_topic=12):
+    papers = []
+    for topic, vocab in TOPICS.items():
+        words = vocab.split()
+        for i in range(per_topic):
+            # 每篇取主题词表的不同轮换，文本各不相同
+            text = " ".join(words[i % len(words):] + words[:i % len(words)])
+            papers.append(Paper(source="pubmed", source_id=f"{topic}-{i}",
+                                title=f"{words[i % len(words)]} study {i}", abstract=text,
+                                categories=[topic]))
+    return papers
+
+
+class CountingEmbedder(LocalEmbedder):
+    """本地向量 + 调用计数，代替付费的 embedding 接口"""
+
+    def __init__(self, model=LocalEmbedder.model):
+        self.model = model
+        self.calls = 0
+
+    def embed(self, texts):
+        self.calls += 1
+        return super().embed(texts)
+
+
+@unittest.skipIf(np is None, "未安装 numpy")
+class ClusterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_path = os.path.join(self.tmp.name, "embed.npz")
+
+    def test_separable_topics(self):
+        papers = topic_papers()
+        topics = cluster_papers(papers, {"embedder": "local", "clusters": 3, "min_papers": 10},
+                                {}, self.cache_path)
+        self.assertEqual(len(topics), 3)
+        for _, members in topics:
+            self.assertEqual(len({p.categories[0] for p in members}), 1)
+        self.assertEqual(sorted(len(m) for _, m in topics), [12, 12, 12])
+
+    def test_too_few_papers(self):
+        self.assertIsNone(cluster_papers(topic_papers(2), {"embedder": "local"}, {}, self.cache_path))
+
+    def test_cache_hit_skips_embedder(self):
+        papers = topic_papers(4)
+        first = CountingEmbedder()
+        x1 = embed_papers(papers, first, EmbeddingCache(self.cache_path, first.model))
+        self.assertEqual(first.calls, 1)
+
+        # 新实例从 .npz 读取：全部命中，不再调用
+        second = CountingEmbedder()
+        x2 = embed_papers(papers, second, EmbeddingCache(self.cache_path, second.model))
+        self.assertEqual(second.calls, 0)
+        np.testing.assert_allclose(x1, x2, rtol=1e-6)
+
+    def test_model_change_invalidates_cache(self):
+        papers = topic_papers(4)
+        old = CountingEmbedder("model-a")
+        embed_papers(papers, old, EmbeddingCache(self.cache_path, old.model))
+
+        new = CountingEmbedder("model-b")
+        cache = EmbeddingCache(self.cache_path, new.model)
+        self.assertIsNone(cache.get(cache.key(cluster.paper_text(papers[0]))))
+        embed_papers(papers, new, cache)
+        self.assertEqual(new.calls, 1)
+
+    def test_kmeans_returns_k_labels(self):
+        # 5 个正交方向附近各 10 个点
+        rng = np.random.default_rng(1)
+        x = np.repeat(np.eye(5, 8, dtype=np.float32), 10, axis=0)
+        x += rng.normal(scale=0.05, size=x.shape).astype(np.float32)
+        x /= np.linalg.norm(x, axis=1, keepdims=True)
+        labels, centers = kmeans(x, 5)
+        self.assertEqual(labels.shape, (50,))
+        self.assertEqual(centers.shape, (5, 8))
+        self.assertEqual(len(set(labels.tolist())), 5)
+        # 同一方向的点分在同一簇
+        self.assertTrue(all(len(set(labels[i:i + 10].tolist())) == 1 for i in range(0, 50, 10)))
+
+
+if __name__ == "__main__":
+    unittest.main()
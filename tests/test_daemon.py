@@ -0,0 +1,47 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+from literature_briefing import daemon, main
+from literature_briefing.daemon import BriefingDaemon
+
+
+class ConfigLoadTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "config.json")
+        for target, name in ((daemon, "setup_logging"), (main, "configure_http_cache")):
+            patcher = mock.patch.object(target, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def write(self, cron, mtime):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"config_version": 2, "schedule": {"cron": cron}}, f)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_first_load_failure_raises(self):
+        self.write("not a cron", 1000)
+        with self.assertRaises(ValueError):
+            BriefingDaemon([self.path])
+
+    def test_serve_exits_on_first_load_failure(self):
+        self.write("not a cron", 1000)
+        with self.assertRaises(SystemExit), self.assertLogs(daemon.log, "ERROR"):
+            daemon.serve([self.path])
+
+    def test_later_reload_failure_keeps_old_config(self):
+        self.write("0 8 * * *", 1000)
+        d = BriefingDaemon([self.path])
+        self.write("not a cron", 2000)
+        with self.assertLogs(daemon.log, "ERROR"):
+            self.assertFalse(d._reload())
+        self.assertEqual(d.schedule.expr, "0 8 * * *")
+        self.assertEqual(d.cfgs[0]["schedule"]["cron"], "0 8 * * *")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from literature_briefing import enrich, net
+from literature_briefing.enrich import EnrichCache, enrich_papers
+from literature_briefing.sources.base import Paper
+from tests.stub_server import StubServer
+
+# 替身服务知道的引用数据；其余文献视为尚未收录
+ICITE = {"1": (10, 2.5), "2": (0, 0.0), "4": (3, 1.1)}
+CROSSREF = {"10.1/a": 7}
+
+
+def handler(req):
+    if req.path == "/icite":
+        pmids = req.query["pmids"].split(",")
+        return 200, {}, {"data": [{"pmid": int(p), "citation_count": ICITE[p][0],
+                                   "relative_citation_ratio": ICITE[p][1]}
+                                  for p in pmids if p in ICITE]}
+    if req.path == "/crossref":
+        dois = [f.split(":", 1)[1] for f in req.query["filter"].split(",")]
+        return 200, {}, {"message": {"items": [{"DOI": d.upper(), "is-referenced-by-count": CROSSREF[d]}
+                                               for d in dois if d in CROSSREF]}}
+    return 404, {}, {}
+
+
+def pubmed(pmid):
+    return Paper(source="pubmed", source_id=pmid, title="t", abstract="a")
+
+
+def preprint(doi):
+    return Paper(source="arxiv", source_id=doi, title="t", abstract="a", doi=doi)
+
+
+class EnrichTest(unittest.TestCase):
+    def setUp(self):
+        net.configure_cache("", "off")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp.name, "enrich.json")
+        self.server = StubServer(handler).__enter__()
+        for name, value in (("ICITE_URL", self.server.url + "/icite"),
+                            ("CROSSREF_URL", self.server.url + "/crossref"),
+                            ("ICITE_BATCH", 2), ("CROSSREF_BATCH", 2)):
+            patcher = mock.patch.object(enrich, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.__exit__()
+        self.tmp.cleanup()
+
+    def cache(self):
+        return EnrichCache(self.cache_path, ttl=3600)
+
+    def test_batches_and_fills_fields(self):
+        papers = [pubmed(p) for p in "12345"] + [preprint("10.1/a"), preprint("10.1/b")]
+        sent = enrich_papers(papers, {}, self.cache())
+        # 5 个 PMID 按 2 个一批 -> 3 次 iCite；2 个 DOI -> 1 次 Crossref
+        self.assertEqual(sent, 4)
+        self.assertEqual([r.path for r in self.server.requests].count("/icite"), 3)
+        self.assertEqual(self.server.requests[0].query["pmids"], "1,2")
+        self.assertEqual((papers[0].citations, papers[0].rcr), (10, 2.5))
+        self.assertEqual((papers[2].citations, papers[2].rcr), (None, None))
+        self.assertEqual((papers[5].citations, papers[5].rcr), (7, None))
+
+    def test_max_requests_cap(self):
+        papers = [pubmed(p) for p in "12345"]
+        sent = enrich_papers(papers, {"max_requests": 2}, self.cache())
+        self.assertEqual(sent, 2)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(papers[3].citations, 3)  # 第二批
+        self.assertIsNone(papers[4].citations)  # 超出上限，未查询
+
+    def test_empty_results_are_cached(self):
+        papers = [pubmed("3"), pubmed("5"), preprint("10.1/b")]
+        enrich_papers(papers, {}, self.cache())
+        first = len(self.server.requests)
+        self.assertEqual(first, 2)
+
+        # 新的缓存实例从文件读取：未收录的文献也在 TTL 内不再查询
+        self.assertEqual(enrich_papers(papers, {}, self.cache()), 0)
+        self.assertEqual(len(self.server.requests), first)
+        self.assertEqual(self.cache().get("pmid:3"), (None, None))
+        self.assertEqual(self.cache().get("doi:10.1/b"), (None, None))
+
+    def test_sources_can_be_disabled(self):
+        papers = [pubmed("1"), preprint("10.1/a")]
+        enrich_papers(papers, {"crossref": False}, self.cache())
+        self.assertEqual([r.path for r in self.server.requests], ["/icite"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import time
+import tempfile
+import unittest
+
+from literature_briefing import net
+
+TTL = dict({kind: 100 for kind in net.DEFAULT_TTL}, efetch=1000)
+
+
+def write(key, age):
+    net._write_entry(key, {"stored_at": time.time() - age}, b"body")
+    path = net._entry_path(key)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+class PruneCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(net.configure_cache, "", "off")
+        net.configure_cache(self.tmp.name, "normal", TTL)
+
+    def test_prunes_entries_past_max_ttl_times_factor(self):
+        limit = 1000 * net.PRUNE_FACTOR
+        fresh = write("aa" + "0" * 62, 2000)  # 已过期但仍可用于重新验证
+        stale = write("ab" + "0" * 62, limit + 60)
+        self.assertEqual(net.prune_cache(), 1)
+        self.assertTrue(os.path.exists(fresh))
+        self.assertFalse(os.path.exists(stale))
+
+    def test_configure_cache_prunes(self):
+        stale = write("ac" + "0" * 62, 1000 * net.PRUNE_FACTOR + 60)
+        net.configure_cache(self.tmp.name, "normal", TTL)
+        self.assertFalse(os.path.exists(stale))
+
+    def test_recordings_are_kept(self):
+        stale = write("ad" + "0" * 62, 1000 * net.PRUNE_FACTOR + 60)
+        for mode in ("record", "replay"):
+            net.configure_cache(self.tmp.name, mode, TTL)
+            self.assertEqual(net.prune_cache(), 0)
+        self.assertTrue(os.path.exists(stale))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from literature_briefing.llm import get_provider
+from tests.stub_server import StubServer
+
+
+def chat_handler(req):
+    if req.path == "/v1/models":
+        return 200, {}, {"data": [{"id": "served-a"}, {"id": "served-b"}]}
+    if req.path == "/v1/chat/completions":
+        model = req.json()["model"]
+        return 200, {}, {"choices": [{"message": {"content": f" reply from {model} "}}],
+                         "usage": {"prompt_tokens": 11, "completion_tokens": 5}}
+    return 404, {}, {"error": "not found"}
+
+
+def provider(url, api_key="", model="", **options):
+    return get_provider({"provider": "openai_compatible", "api_key": api_key, "model": model,
+                         "openai_compatible": dict(options, base_url=url + "/v1")})
+
+
+class OpenAICompatibleTest(unittest.TestCase):
+    def test_auth_header(self):
+        with StubServer(chat_handler) as srv:
+            provider(srv.url, api_key="sek", model="m").call("hi")
+            provider(srv.url, api_key="sek", model="m",
+                     auth_header="X-Api-Key", auth_scheme="").call("hi")
+            provider(srv.url, model="m").call("hi")
+        default, custom, anonymous = srv.requests
+        self.assertEqual(default.headers.get("Authorization"), "Bearer sek")
+        self.assertEqual(custom.headers.get("X-Api-Key"), "sek")
+        self.assertNotIn("Authorization", custom.headers)
+        self.assertNotIn("Authorization", anonymous.headers)
+
+    def test_model_rotation(self):
+        with StubServer(chat_handler) as srv:
+            llm = provider(srv.url, models=["a", "b"])
+            replies = [llm.call("hi") for _ in range(4)]
+        self.assertEqual(replies, ["reply from a", "reply from b"] * 2)
+        self.assertEqual(llm.stats.calls, 4)
+        self.assertEqual((llm.stats.tokens_in, llm.stats.tokens_out), (44, 20))
+
+    def test_model_falls_back_to_first_served_model(self):
+        with StubServer(chat_handler) as srv:
+            self.assertEqual(provider(srv.url).call("hi"), "reply from served-a")
+        self.assertEqual([r.path for r in srv.requests], ["/v1/models", "/v1/chat/completions"])
+
+    def test_probe(self):
+        with StubServer(chat_handler) as srv:
+            llm = provider(srv.url)
+            result = llm.probe()
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["models"], ["served-a", "served-b"])
+        self.assertGreaterEqual(result["latency"], 0)
+
+        down = llm.probe(timeout=1)  # 服务已关闭
+        self.assertFalse(down["ok"])
+        self.assertTrue(down["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
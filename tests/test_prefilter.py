@@ -0,0 +1,61 @@
+import unittest
+
+from literature_briefing.prefilter import (
+    abstract_translation, is_notice, is_symbol_title, title_translation,
+)
+from literature_briefing.sources.base import Paper
+
+ABSTRACT = "We report a cohort of 120 patients treated between 2010 and 2020."
+
+
+def paper(title, abstract=ABSTRACT, pub_types=()):
+    return Paper(source="pubmed", source_id="1", title=title, abstract=abstract,
+                 pub_types=list(pub_types))
+
+
+class NoticeTest(unittest.TestCase):
+    def test_research_titles_are_not_notices(self):
+        for title in ("Correction of adolescent idiopathic scoliosis with pedicle screws",
+                      "Retraction of the tongue during swallowing in healthy adults",
+                      "Expression of concern for patient safety among nurses",
+                      "Erratum in dosing tables: a systematic review"):
+            p = paper(title)
+            self.assertEqual(title_translation(p), (None, ""), title)
+            self.assertEqual(abstract_translation(p), (None, ""), title)
+            self.assertFalse(is_notice(p))
+
+    def test_strict_notice_titles(self):
+        cases = {
+            "Erratum: Deep learning for cells": "勘误：Deep learning for cells",
+            "Correction to: A big study": "更正：A big study",
+            "Retraction Note to: Gene X in mice": "撤稿声明：Gene X in mice",
+            "Retraction Note to Gene X in mice": "撤稿声明：Gene X in mice",
+            "Publisher Correction: Cortex maps": "出版方更正：Cortex maps",
+            "Expression of Concern: Tumour growth": "关注声明：Tumour growth",
+        }
+        for title, expected in cases.items():
+            self.assertEqual(title_translation(paper(title))[0], expected, title)
+
+    def test_abstract_skipped_only_when_pub_type_confirms(self):
+        note = "[This corrects the article DOI: 10.1/x.]"
+        self.assertEqual(abstract_translation(paper("Erratum: X", note)), (None, ""))
+        self.assertEqual(abstract_translation(paper("Erratum: X", note, ["Published Erratum"]))[0], note)
+        # 被撤稿的原文仍需翻译
+        self.assertEqual(abstract_translation(paper("Title", pub_types=["Retracted Publication"])),
+                         (None, ""))
+
+
+class OtherRulesTest(unittest.TestCase):
+    def test_symbol_titles(self):
+        self.assertTrue(is_symbol_title("TP53"))
+        self.assertTrue(is_symbol_title("IL-6"))
+        self.assertFalse(is_symbol_title("Cisplatin"))
+        self.assertFalse(is_symbol_title("mTORC1 signaling"))
+
+    def test_chinese_and_duplicate_abstract(self):
+        self.assertEqual(title_translation(paper("单细胞测序的新方法"))[0], "单细胞测序的新方法")
+        self.assertEqual(abstract_translation(paper("A study of mice", "A study of mice."))[0], "=title")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from literature_briefing import net
+from literature_briefing.sources import pubmed
+from literature_briefing.sources.pubmed import PubMedSource, ShardCheckpoint
+from tests.stub_server import StubServer
+
+PER_DAY = 1000  # 替身 esearch 每天的命中数
+
+
+def _days(d0, d1):
+    d0, d1 = datetime.strptime(d0, "%Y/%m/%d"), datetime.strptime(d1, "%Y/%m/%d")
+    return [d0 + timedelta(days=i) for i in range((d1 - d0).days + 1)]
+
+
+def esearch(req):
+    days = _days(req.query["mindate"], req.query["maxdate"])
+    count = PER_DAY * len(days)
+    result = {"count": str(count)}
+    if req.query.get("rettype") != "count":
+        ids = [f"{d:%Y%m%d}{i:04d}" for d in days for i in range(PER_DAY)]
+        result["idlist"] = ids[:int(req.query["retmax"])]
+    return 200, {}, {"esearchresult": result}
+
+
+class ShardedBackfillTest(unittest.TestCase):
+    def setUp(self):
+        net.configure_cache("", "off")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.server = StubServer(esearch).__enter__()
+        self.addCleanup(self.server.__exit__)
+        for name, value in (("PUBMED_BASE", self.server.url), ("SHARD_THRESHOLD", 2500)):
+            patcher = mock.patch.object(pubmed, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def source(self, date_type="edat"):
+        checkpoint = ShardCheckpoint(os.path.join(self.tmp.name, "backfill.json"))
+        src = PubMedSource({"date_type": date_type}, backfill=checkpoint)
+        src._limiter = net.RateLimiter(1000)
+        return src
+
+    def test_counts_before_fetching_ids(self):
+        ids = self.source()._esearch_sharded(["x"], "2026/10/01", "2026/10/08")
+        self.assertEqual(len(ids), 8 * PER_DAY)
+        fetched = [r.query for r in self.server.requests if r.query.get("rettype") != "count"]
+        # 只有不再二分的分片（2 天，2000 篇）才下载 PMID
+        self.assertEqual(sorted((q["mindate"], q["maxdate"]) for q in fetched),
+                         [("2026/10/01", "2026/10/02"), ("2026/10/03", "2026/10/04"),
+                          ("2026/10/05", "2026/10/06"), ("2026/10/07", "2026/10/08")])
+
+    def test_checkpoint_is_keyed_by_date_type(self):
+        self.source("edat")._esearch_sharded(["x"], "2026/10/01", "2026/10/02")
+        sent = len(self.server.requests)
+        self.source("edat")._esearch_sharded(["x"], "2026/10/01", "2026/10/02")
+        self.assertEqual(len(self.server.requests), sent)  # 续跑直接用进度
+        self.source("pdat")._esearch_sharded(["x"], "2026/10/01", "2026/10/02")
+        self.assertGreater(len(self.server.requests), sent)
+        self.assertEqual({r.query["datetype"] for r in self.server.requests[sent:]}, {"pdat"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import time
+import unittest
+
+from literature_briefing.sources import get_source_class, fetch_all, register
+from literature_briefing.sources.base import _REGISTRY, LiteratureSource, Paper
+
+
+@register("test-slow")
+class SlowSource(LiteratureSource):
+    def __init__(self, cfg, cache=None, backfill=None):
+        self.delay = cfg.get("delay", 0)
+        self.error = cfg.get("error")
+
+    @property
+    def name(self):
+        return "test-slow"
+
+    def search(self, date_from, date_to, max_results, seen_ids):
+        time.sleep(self.delay)
+        if self.error:
+            raise RuntimeError(self.error)
+        return [Paper(source="test-slow", source_id="1", title="t", abstract="a")]
+
+
+class SourceRegistryTest(unittest.TestCase):
+    def test_modules_are_discovered(self):
+        self.assertEqual(get_source_class("pubmed").__module__, "literature_briefing.sources.pubmed")
+        self.assertEqual(get_source_class("arxiv").__module__, "literature_briefing.sources.arxiv")
+
+    def test_unknown_source(self):
+        with self.assertRaises(ValueError) as ctx:
+            get_source_class("nope")
+        self.assertIn("pubmed", str(ctx.exception))
+        self.assertNotIn("nope", _REGISTRY)
+
+
+class FetchAllTest(unittest.TestCase):
+    def fetch(self, cfg, options=None):
+        failed = {}
+        papers = fetch_all({"test-slow": dict(cfg, enabled=True)}, "2026/10/01", "2026/10/02",
+                           10, set(), options=options, failed=failed)
+        return papers, failed
+
+    def test_reports_timeout_and_errors(self):
+        papers, failed = self.fetch({"delay": 0.3, "timeout_sec": 0.05})
+        self.assertEqual((papers, failed), ({}, {"test-slow": "超时"}))
+        papers, failed = self.fetch({"error": "boom"})
+        self.assertEqual(papers, {})
+        self.assertIn("boom", failed["test-slow"])
+
+    def test_backfill_has_no_deadline(self):
+        papers, failed = self.fetch({"delay": 0.2, "timeout_sec": 0.05},
+                                    options={"test-slow": {"backfill": object()}})
+        self.assertEqual(failed, {})
+        self.assertEqual(len(papers["test-slow"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""启动耗时守护：import literature_briefing.main 不应加载重量级依赖
+
+requests 在首次发请求时才导入，tkinter 只在弹窗时导入，numpy 只在启用主题聚类时导入。
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("requests", "tkinter", "numpy")
+
+
+def imported_modules(statement: str) -> set:
+    """用 -X importtime 运行语句，返回所有被导入的模块名"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            if name != "package":  # 表头
+                modules.add(name)
+    return modules
+
+
+class StartupImportsTest(unittest.TestCase):
+    def test_main_does_not_import_heavy_dependencies(self):
+        modules = imported_modules("import literature_briefing.main")
+        self.assertIn("literature_briefing.main", modules)
+        for heavy in HEAVY:
+            loaded = sorted(m for m in modules if m == heavy or m.startswith(heavy + "."))
+            self.assertEqual(loaded, [], f"import literature_briefing.main 加载了 {heavy}")
+
+
+if __name__ == "__main__":
+    unittest.main()
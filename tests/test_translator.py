@@ -0,0 +1,102 @@
+import json
+import time
+import threading
+import unittest
+
+from literature_briefing.llm.base import LLMProvider
+from literature_briefing.sources.base import Paper
+from literature_briefing.translator import translate_papers
+
+
+class Gauge:
+    """同时进行的调用数与峰值"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = self.peak = 0
+
+    def __enter__(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.active -= 1
+
+
+class CountingProvider(LLMProvider):
+    def __init__(self, gauge, concurrency=0, base_url=""):
+        super().__init__("key", "m")
+        self.gauge = gauge
+        self.concurrency = concurrency
+        if base_url:
+            self.base_url = base_url
+
+    def _call(self, prompt, system, max_tokens):
+        with self.gauge:
+            time.sleep(0.02)
+        return f"译 {prompt}", (1, 1)
+
+
+def papers(n):
+    return [Paper(source="pubmed", source_id=str(i), title=f"Title number {i}",
+                  abstract=f"Abstract sentence for paper {i}.") for i in range(n)]
+
+
+class TranslatorPoolTest(unittest.TestCase):
+    def test_public_api_not_widened_by_local_title_server(self):
+        public, local = Gauge(), Gauge()
+        items = papers(40)
+        translate_papers(CountingProvider(public), items, workers=2,
+                         title_llm=CountingProvider(local, 16, "http://127.0.0.1:8000/v1"))
+        self.assertEqual(public.peak, 2)
+        self.assertGreater(local.peak, 2)
+        self.assertEqual(items[0].title_zh, "译 Title number 0")
+        self.assertEqual(items[0].abstract_zh, "译 Abstract sentence for paper 0.")
+
+    def test_same_service_shares_one_pool(self):
+        # 标题与摘要是同一服务的两个实例，合计不超过 workers
+        service = Gauge()
+        translate_papers(CountingProvider(service), papers(20), workers=3,
+                         title_llm=CountingProvider(service))
+        self.assertEqual(service.peak, 3)
+
+
+class JSONProvider(LLMProvider):
+    """多语言提示返回 JSON：每种语言为 "<语言>:<原文>"，并记录调用"""
+
+    def __init__(self):
+        super().__init__("key", "m")
+        self.prompts = []
+
+    def _call(self, prompt, system, max_tokens):
+        self.prompts.append(prompt)
+        codes = [c.strip() for c in system.split("（")[-1].split("）")[0].split(",")]
+        return json.dumps({c: f"{c}:{prompt}" for c in codes}, ensure_ascii=False), (1, 1)
+
+
+class ChineseSourceTest(unittest.TestCase):
+    def test_chinese_source_translated_for_other_languages(self):
+        paper = Paper(source="cnki", source_id="1", title="睡眠剥夺对记忆的影响",
+                      abstract="本研究考察了睡眠剥夺对海马记忆巩固的影响。")
+        llm = JSONProvider()
+        translate_papers(llm, [paper], languages=["zh", "ja", "en"])
+        # 中文照原文，其他语言仍送 LLM
+        self.assertEqual(paper.title_zh, paper.title)
+        self.assertEqual(paper.abstract_zh, paper.abstract)
+        self.assertTrue(llm.prompts)
+        self.assertEqual(paper.translations["ja"][0], f"ja:{paper.title}")
+        self.assertEqual(tuple(paper.translations["en"]), (f"en:{paper.title}", f"en:{paper.abstract}"))
+
+    def test_chinese_source_zh_only_skips_llm(self):
+        paper = Paper(source="cnki", source_id="1", title="睡眠剥夺对记忆的影响",
+                      abstract="本研究考察了睡眠剥夺对海马记忆巩固的影响。")
+        llm = JSONProvider()
+        translate_papers(llm, [paper], languages=["zh"])
+        self.assertEqual(llm.prompts, [])
+        self.assertEqual(paper.title_zh, paper.title)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,4 +2,6 @@
 import os, sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from gui.app import main
-main()
+
+if __name__ == "__main__":
+    main()
@@ -2,4 +2,8 @@
 import os, sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from literature_briefing.main import main
-main()
+
+# Windows 上多进程解析（pubmed.parse_processes）以 spawn 启动子进程，会重新导入本文件；
+# 没有这个判断，每个子进程都会再跑一遍简报
+if __name__ == "__main__":
+    main()